@@ -0,0 +1,101 @@
+from argparse import ArgumentParser
+import os
+from pathlib import Path
+import statistics
+import time
+from typing import Any, Dict, List
+
+from minizinc import Instance, Model, Solver
+from robber_baron import campsites
+from run import DEFAULT_CORPUS, load_corpus
+
+
+def check(params: Dict[str, Any], tents: List[List[bool]]):
+    """Check the tent counts and that no two tents touch."""
+    assert [sum(row) for row in tents] == params["num_tents_in_row"]
+    assert [sum(col) for col in zip(*tents)] == params["num_tents_in_col"]
+    cells = {
+        (i, j) for i, row in enumerate(tents) for j, tent in enumerate(row) if tent
+    }
+    for i, j in cells:
+        assert (i + 1, j + 1) not in params["trees"]
+        assert not any(
+            (i + di, j + dj) in cells
+            for di in (-1, 0, 1)
+            for dj in (-1, 0, 1)
+            if di or dj
+        )
+
+
+def measure(
+    solver: Solver, model: campsites.Model, params: Dict[str, Any]
+) -> Dict[str, float]:
+    """Flatten and solve an instance of a model, checking the solution."""
+    instance = Instance(solver, Model(campsites.MODEL_FILES[model]))
+    for k, v in campsites.instance_params(
+        model,
+        params["num_rows"],
+        params["num_cols"],
+        params["num_tents_in_row"],
+        params["num_tents_in_col"],
+        params["tree_rows"],
+        params["tree_cols"],
+    ).items():
+        instance[k] = v
+
+    start = time.perf_counter()
+    with instance.flat() as (fzn, _, _):
+        flatten_seconds = time.perf_counter() - start
+        fzn_bytes = os.path.getsize(fzn.name)
+
+    start = time.perf_counter()
+    result = instance.solve()
+    solve_seconds = time.perf_counter() - start
+
+    check(
+        {**params, "trees": set(zip(params["tree_rows"], params["tree_cols"]))},
+        result["tents"],
+    )
+    return {
+        "flatten_seconds": flatten_seconds,
+        "fzn_bytes": fzn_bytes,
+        "solve_seconds": solve_seconds,
+    }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Compare the grid and pairs Campsites models")
+    parser.add_argument(
+        "--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory"
+    )
+    parser.add_argument(
+        "-s",
+        "--solver",
+        default="gecode",
+        help="MiniZinc solver tag; default 'gecode'",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    solver = Solver.lookup(args.solver)
+    groups: Dict[campsites.Size, List[Dict[str, Any]]] = {}
+    for record in load_corpus(args.corpus, ["campsites"]):
+        size = campsites.Size(record["size"])
+        groups.setdefault(size, []).append(record["instance_params"])
+
+    print(f"{'model':<6} {'size':<13} {'flatten':>10} {'fzn size':>10} {'solve':>10}")
+    for size in campsites.Size:
+        if size not in groups:
+            continue
+        for model in campsites.Model:
+            runs = [measure(solver, model, params) for params in groups[size]]
+            medians = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+            print(
+                f"{str(model):<6} {str(size):<13}"
+                f" {medians['flatten_seconds'] * 1000:8.1f}ms"
+                f" {medians['fzn_bytes'] / 1024:8.1f}KB"
+                f" {medians['solve_seconds'] * 1000:8.1f}ms"
+            )
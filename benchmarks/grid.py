@@ -0,0 +1,124 @@
+from argparse import ArgumentParser
+import random
+import timeit
+from typing import Callable, Dict, List
+
+from robber_baron import campsites, numbergrids, sudoku
+from robber_baron.grid import Grid
+
+
+def campsites_loops(state: str, num_cols: int, tents: List[List[bool]]) -> str:
+    """Parse and encode a Campsites board with loops over the cells."""
+    trees = set()
+    for k, cell in enumerate(state):
+        if cell == "T":
+            trees.add(divmod(k, num_cols))
+    final_state = []
+    for i, row in enumerate(tents):
+        for j, tent in enumerate(row):
+            if (i, j) in trees:
+                final_state.append("T")
+            elif tent:
+                final_state.append("C")
+            else:
+                final_state.append(".")
+    return "".join(final_state)
+
+
+def campsites_grid(state: str, num_cols: int, tents: List[List[bool]]) -> str:
+    """Parse and encode a Campsites board with a grid."""
+    board = Grid.parse(state, num_cols, campsites.ALPHABET)
+    _ = list(board.indices(campsites.TREE))
+    return (board | Grid.from_rows(tents)).encode(campsites.ALPHABET)
+
+
+def numbergrids_loops(grid: List[List[bool]]) -> str:
+    """Encode a Numbergrids board with loops over the cells."""
+    final_state = []
+    for row in grid:
+        for cell in row:
+            final_state.append("O" if cell else "_")
+    return "".join(final_state)
+
+
+def numbergrids_grid(grid: List[List[bool]]) -> str:
+    """Encode a Numbergrids board with a grid."""
+    return Grid.from_rows(grid).encode(numbergrids.ALPHABET)
+
+
+def sudoku_loops(boxes: List[str], puzzle: List[List[int]]) -> Dict[str, str]:
+    """Parse and encode a Sudoku board with loops over the cells."""
+    values = [int(b) if len(b) > 0 else 0 for b in boxes]
+    start = [values[k : k + 9] for k in range(0, 81, 9)]
+    return {
+        f"div#box{(j * 9) + i + 1}": str(puzzle[j][i])
+        for j in range(9)
+        for i in range(9)
+        if start[j][i] == 0
+    }
+
+
+def sudoku_grid(boxes: List[str], puzzle: List[List[int]]) -> Dict[str, str]:
+    """Parse and encode a Sudoku board with a grid."""
+    start = Grid.parse("".join(b.strip() or "0" for b in boxes), 9, sudoku.ALPHABET)
+    _ = start.rows()
+    solution = Grid.from_rows(puzzle).encode(sudoku.ALPHABET)
+    return {f"div#box{k + 1}": solution[k] for k in start.indices(0)}
+
+
+def boards(rng: random.Random) -> Dict[str, List[Callable[[], object]]]:
+    """Return, for each game, calls that parse and encode its largest board."""
+    num_rows, num_cols, _ = campsites.SIZE_DATA[campsites.Size.EXTRA_LARGE]
+    state = "".join(rng.choice("T....") for _ in range(num_rows * num_cols))
+    tents = [
+        [cell != "T" and rng.random() < 0.2 for cell in state[i : i + num_cols]]
+        for i in range(0, len(state), num_cols)
+    ]
+
+    grid_size = max(int(str(size)) for size in numbergrids.Size)
+    grid = [[rng.random() < 0.5 for _ in range(grid_size)] for _ in range(grid_size)]
+
+    puzzle = [[rng.randint(1, 9) for _ in range(9)] for _ in range(9)]
+    boxes = [str(v) if rng.random() < 0.4 else "" for row in puzzle for v in row]
+
+    return {
+        f"campsites {num_rows}x{num_cols}": [
+            lambda: campsites_loops(state, num_cols, tents),
+            lambda: campsites_grid(state, num_cols, tents),
+        ],
+        f"numbergrids {grid_size}x{grid_size}": [
+            lambda: numbergrids_loops(grid),
+            lambda: numbergrids_grid(grid),
+        ],
+        "sudoku 9x9": [
+            lambda: sudoku_loops(boxes, puzzle),
+            lambda: sudoku_grid(boxes, puzzle),
+        ],
+    }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Compare parsing and encoding boards with loops and with grids"
+    )
+    parser.add_argument(
+        "-n", "--number", type=int, default=2000, help="Calls per run; default 2000"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; default 0")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"{'board':<20} {'loops':>10} {'grid':>10} {'speedup':>8}")
+    for name, (loops, grid) in boards(random.Random(args.seed)).items():
+        assert loops() == grid()
+        times = [
+            min(timeit.repeat(f, number=args.number, repeat=5)) / args.number
+            for f in (loops, grid)
+        ]
+        print(
+            f"{name:<20} {times[0] * 1e6:8.1f}us {times[1] * 1e6:8.1f}us"
+            f" {times[0] / times[1]:7.1f}x"
+        )
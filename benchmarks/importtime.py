@@ -0,0 +1,80 @@
+from argparse import ArgumentParser
+import subprocess
+import sys
+from typing import Dict, List
+
+from robber_baron.cli import GAMES
+
+# Modules that must not be imported until they are used
+DEFERRED_MODULES = [
+    "brotli",
+    "minizinc",
+    "requests",
+    "selenium.webdriver",
+    "seleniumwire",
+]
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import a module in a fresh interpreter, timing every module it imports.
+
+    Times are cumulative, in microseconds.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def check(module: str, budget_ms: float, repeat: int) -> List[str]:
+    """Return the problems with the import of a module, printing its import time."""
+    runs = [import_times(module) for _ in range(repeat)]
+    milliseconds = min(run[module] for run in runs) / 1000
+    print(f"{module:<28} {milliseconds:8.2f}ms")
+
+    problems = []
+    if milliseconds > budget_ms:
+        problems.append(f"{module} took {milliseconds:.2f}ms (budget {budget_ms}ms)")
+    for deferred in DEFERRED_MODULES:
+        if deferred in runs[0]:
+            problems.append(f"{module} imported {deferred}")
+    return problems
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Check the import time of each game module")
+    parser.add_argument(
+        "-b",
+        "--budget-ms",
+        type=float,
+        default=100,
+        help="Maximum import time per module; default 100",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="Imports per module, keeping the fastest; default 5",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    problems = []
+    for module in ["robber_baron.cli", *GAMES.values()]:
+        problems.extend(check(module, args.budget_ms, args.repeat))
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
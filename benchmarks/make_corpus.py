@@ -0,0 +1,99 @@
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import random
+from typing import Any, Dict, Iterator, List
+
+from robber_baron import campsites, numbergrids, sudoku
+from robber_baron.generators import campsites_params, numbergrids_params, sudoku_params
+from sudoku_engine import INSANE_GRIDS, parse_grid
+
+# Fraction of cells that hold a tent or tree for each Campsites difficulty
+CAMPSITES_DENSITY = {
+    campsites.Difficulty.EASY: 0.2,
+    campsites.Difficulty.CHALLENGING: 0.3,
+}
+
+# Fraction of filled cells for each Numbergrids difficulty
+NUMBERGRIDS_DENSITY = {
+    numbergrids.Difficulty.VERY_EASY: 0.7,
+    numbergrids.Difficulty.MODERATE: 0.65,
+    numbergrids.Difficulty.CHALLENGING: 0.6,
+    numbergrids.Difficulty.DIFFICULT: 0.55,
+    numbergrids.Difficulty.FIENDISH: 0.5,
+}
+
+# Number of givens for each Sudoku difficulty; Insane uses known hard grids
+SUDOKU_GIVENS = {
+    sudoku.Difficulty.EASY: 36,
+    sudoku.Difficulty.MEDIUM: 30,
+    sudoku.Difficulty.DIFFICULT: 26,
+}
+
+
+def corpus(instances: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    """Yield corpus records for every size and difficulty of every game."""
+    for size in campsites.Size:
+        num_rows, num_cols, _ = campsites.SIZE_DATA[size]
+        for difficulty in campsites.Difficulty:
+            for _ in range(instances):
+                yield {
+                    "model": "campsites.mzn",
+                    "size": str(size),
+                    "difficulty": str(difficulty),
+                    "instance_params": campsites_params(
+                        num_rows, num_cols, CAMPSITES_DENSITY[difficulty], rng
+                    ),
+                }
+
+    for size in numbergrids.Size:
+        for difficulty in numbergrids.Difficulty:
+            for _ in range(instances):
+                yield {
+                    "model": "numbergrids.mzn",
+                    "size": str(size),
+                    "difficulty": str(difficulty),
+                    "instance_params": numbergrids_params(
+                        int(str(size)), NUMBERGRIDS_DENSITY[difficulty], rng
+                    ),
+                }
+
+    for difficulty in sudoku.Difficulty:
+        grids: List[Dict[str, Any]] = (
+            [{"start": parse_grid(g)} for g in INSANE_GRIDS[:instances]]
+            if difficulty == sudoku.Difficulty.INSANE
+            else [
+                sudoku_params(3, SUDOKU_GIVENS[difficulty] / 81, rng)
+                for _ in range(instances)
+            ]
+        )
+        for params in grids:
+            yield {
+                "model": "sudoku.mzn",
+                "difficulty": str(difficulty),
+                "instance_params": params,
+            }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Generate a benchmark corpus")
+    parser.add_argument("output", type=Path, help="Output directory")
+    parser.add_argument(
+        "-n", "--instances", type=int, default=3, help="Instances per configuration"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; default 0")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    args.output.mkdir(parents=True, exist_ok=True)
+    files: Dict[str, Any] = {}
+    for record in corpus(args.instances, random.Random(args.seed)):
+        game = record["model"].replace(".mzn", "")
+        if game not in files:
+            files[game] = open(args.output / f"{game}.jsonl", "w")
+        files[game].write(json.dumps(record) + "\n")
+    for f in files.values():
+        f.close()
@@ -0,0 +1,55 @@
+from argparse import ArgumentParser
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from robber_baron.engines.nonogram import NonogramSolver
+from robber_baron.generators import line_clues
+
+
+def random_puzzle(
+    size: int, density: float, rng: random.Random
+) -> Tuple[List[List[int]], List[List[int]]]:
+    """Return the row and column clues of a random grid."""
+    grid = [[rng.random() < density for _ in range(size)] for _ in range(size)]
+    row_clues = [line_clues(row) for row in grid]
+    col_clues = [line_clues(list(col)) for col in zip(*grid)]
+    return row_clues, col_clues
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Measure how the nonogram engine scales")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[5, 10, 15, 20, 25, 30, 35, 40, 45, 50],
+        help="Grid sizes; default 5 to 50 in steps of 5",
+    )
+    parser.add_argument(
+        "-n", "--instances", type=int, default=5, help="Puzzles per size; default 5"
+    )
+    parser.add_argument(
+        "--density", type=float, default=0.55, help="Fraction of filled cells"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; default 0")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'size':>4}  {'median':>10}  {'max':>10}")
+    for size in args.sizes:
+        times = []
+        for _ in range(args.instances):
+            row_clues, col_clues = random_puzzle(size, args.density, rng)
+            t0 = time.perf_counter()
+            NonogramSolver(row_clues, col_clues).solve()
+            times.append(time.perf_counter() - t0)
+        print(
+            f"{size:>4}  {statistics.median(times) * 1000:8.1f}ms"
+            f"  {max(times) * 1000:8.1f}ms"
+        )
@@ -0,0 +1,84 @@
+from argparse import ArgumentParser
+import os
+from pathlib import Path
+import statistics
+import time
+from typing import Any, Dict, List
+
+from minizinc import Instance, Model, Solver
+from robber_baron import numbergrids
+from robber_baron.generators import line_clues
+from run import DEFAULT_CORPUS, load_corpus
+
+
+def measure(
+    solver: Solver, model: numbergrids.Model, params: Dict[str, Any]
+) -> Dict[str, float]:
+    """Flatten and solve an instance of a model, checking the solution."""
+    instance = Instance(solver, Model(numbergrids.MODEL_FILES[model]))
+    grid_size = params["grid_size"]
+    row_clues = [[c for c in clues if c] or [0] for clues in params["row_clues"]]
+    col_clues = [[c for c in clues if c] or [0] for clues in params["col_clues"]]
+    for k, v in numbergrids.instance_params(
+        model, grid_size, row_clues, col_clues
+    ).items():
+        instance[k] = v
+
+    start = time.perf_counter()
+    with instance.flat() as (fzn, _, _):
+        flatten_seconds = time.perf_counter() - start
+        fzn_bytes = os.path.getsize(fzn.name)
+
+    start = time.perf_counter()
+    result = instance.solve()
+    solve_seconds = time.perf_counter() - start
+
+    grid = result["grid"]
+    assert [line_clues(row) for row in grid] == row_clues
+    assert [line_clues(list(col)) for col in zip(*grid)] == col_clues
+    return {
+        "flatten_seconds": flatten_seconds,
+        "fzn_bytes": fzn_bytes,
+        "solve_seconds": solve_seconds,
+    }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Compare the clues and regular Numbergrids models"
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory"
+    )
+    parser.add_argument(
+        "-s",
+        "--solver",
+        default="chuffed",
+        help="MiniZinc solver tag; default 'chuffed'",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    solver = Solver.lookup(args.solver)
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in load_corpus(args.corpus, ["numbergrids"]):
+        key = (int(record["size"]), record["difficulty"])
+        groups.setdefault(key, []).append(record["instance_params"])
+
+    print(
+        f"{'model':<8} {'size':>4} {'difficulty':<12}"
+        f" {'flatten':>10} {'fzn size':>10} {'solve':>10}"
+    )
+    for (size, difficulty), instances in sorted(groups.items()):
+        for model in numbergrids.Model:
+            runs = [measure(solver, model, params) for params in instances]
+            medians = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+            print(
+                f"{str(model):<8} {size:>4} {difficulty:<12}"
+                f" {medians['flatten_seconds'] * 1000:8.1f}ms"
+                f" {medians['fzn_bytes'] / 1024:8.1f}KB"
+                f" {medians['solve_seconds'] * 1000:8.1f}ms"
+            )
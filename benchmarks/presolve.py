@@ -0,0 +1,106 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from robber_baron import ConstraintSolver
+from robber_baron.presolve import PRESOLVERS
+from run import DEFAULT_CORPUS, load_corpus, MODELS_DIR
+
+# Solver tags that the bots use for each game
+SOLVER_TAGS = {"campsites": "gecode", "numbergrids": "chuffed"}
+
+
+def measure(
+    solver: Optional[ConstraintSolver], model: str, params: Dict[str, Any]
+) -> Dict[str, float]:
+    """Solve an instance with and without presolving it, checking both agree.
+
+    Times are end to end, including presolving, parsing, flattening and searching.
+    Without a solver, only the fraction of fixed cells is measured.
+    """
+    start = time.perf_counter()
+    presolved = PRESOLVERS[model].presolve(params)
+    presolve_seconds = time.perf_counter() - start
+    run = {"fixed": presolved.fixed, "presolve_seconds": presolve_seconds}
+    if solver is None:
+        return run
+
+    start = time.perf_counter()
+    raw = solver.solve(MODELS_DIR / model, params)
+    run["raw_seconds"] = time.perf_counter() - start
+    run["raw_flatten_seconds"] = solver.last_timings["flatten"]
+
+    start = time.perf_counter()
+    result = solver.solve(presolved.model_file, presolved.instance_params)
+    run["presolved_seconds"] = presolve_seconds + time.perf_counter() - start
+    run["presolved_flatten_seconds"] = solver.last_timings["flatten"]
+
+    key = "tents" if model.startswith("campsites") else "grid"
+    assert result[key] == raw[key], "presolving changed the solution"
+    return run
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Measure the cells fixed by presolving, and the speedup it gives"
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory"
+    )
+    parser.add_argument(
+        "--games",
+        nargs="+",
+        default=list(SOLVER_TAGS),
+        choices=list(SOLVER_TAGS),
+        help="Games to measure; default every game with a presolve stage",
+    )
+    parser.add_argument(
+        "-s",
+        "--solver",
+        help="MiniZinc solver tag; default the bot's solver tag for each game",
+    )
+    parser.add_argument(
+        "--no-solve",
+        action="store_true",
+        help="Only measure the fraction of fixed cells, without MiniZinc",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in load_corpus(args.corpus, args.games):
+        game = record["model"].split(".")[0]
+        key = (game, record["model"], record.get("size"), record["difficulty"])
+        groups.setdefault(key, []).append(record["instance_params"])
+
+    solvers: Dict[str, ConstraintSolver] = {}
+    print(
+        f"{'game':<12} {'size':<13} {'difficulty':<12} {'fixed':>6} {'presolve':>10}"
+        + ("" if args.no_solve else f" {'raw':>10} {'presolved':>10} {'speedup':>8}")
+    )
+    for (game, model, size, difficulty), instances in sorted(groups.items()):
+        solver = None
+        if not args.no_solve:
+            tag = args.solver or SOLVER_TAGS[game]
+            solver = solvers.setdefault(tag, ConstraintSolver(tag))
+            # Parse both models once, so that parsing is not counted against either
+            solver.prepare(MODELS_DIR / model)
+            solver.prepare(PRESOLVERS[model].model_file)
+        runs = [measure(solver, model, params) for params in instances]
+        medians = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        line = (
+            f"{game:<12} {size:<13} {difficulty:<12} {medians['fixed']:6.0%}"
+            f" {medians['presolve_seconds'] * 1000:8.2f}ms"
+        )
+        if solver is not None:
+            line += (
+                f" {medians['raw_seconds'] * 1000:8.1f}ms"
+                f" {medians['presolved_seconds'] * 1000:8.1f}ms"
+                f" {medians['raw_seconds'] / medians['presolved_seconds']:7.2f}x"
+            )
+        print(line)
@@ -0,0 +1,148 @@
+from argparse import ArgumentParser
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from robber_baron import cli
+from robber_baron.replay import Replayer
+
+
+def replay(recording: Path, latency_ms: float, extra_args: List[str]) -> Dict[str, Any]:
+    """Replay a recorded game, returning its time, round trips and solve time."""
+    argv = Replayer.load(recording).argv + extra_args
+    if "--no-prompt" not in argv:
+        argv.append("--no-prompt")
+    with tempfile.TemporaryDirectory() as tmp:
+        timing_file = Path(tmp) / "timing.jsonl"
+        os.environ.update(
+            {
+                "PB_REPLAY_FILE": str(recording),
+                "PB_REPLAY_LATENCY_MS": str(latency_ms),
+                "PB_TIMING_FILE": str(timing_file),
+            }
+        )
+        start = time.perf_counter()
+        cli.main(argv)
+        seconds = time.perf_counter() - start
+        events = [json.loads(line) for line in timing_file.read_text().splitlines()]
+
+    round_trips = sum(e["round_trips"] for e in events)
+    solve_seconds = sum(e["seconds"] for e in events if e["phase"] == "solve")
+    return {
+        "seconds": seconds,
+        "round_trips": round_trips,
+        "solve_seconds": solve_seconds,
+        # Time spent in the bot itself, rather than waiting for the driver or solver
+        "python_seconds": seconds - solve_seconds - round_trips * latency_ms / 1000,
+    }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Replay recorded games offline to measure end-to-end bot overhead"
+    )
+    parser.add_argument(
+        "recordings",
+        type=Path,
+        nargs="+",
+        help="JSON lines files written via PB_RECORD_FILE",
+    )
+    parser.add_argument(
+        "-l",
+        "--latency-ms",
+        type=float,
+        nargs="+",
+        default=[0.0],
+        help="Injected latency per WebDriver round trip and HTTP request; default 0",
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=5, help="Replays per recording; default 5"
+    )
+    parser.add_argument(
+        "--args",
+        nargs="+",
+        default=[],
+        help="Extra arguments for the bots, e.g. --native to replay without MiniZinc",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Results written by -o; exit with an error if round trips increased or "
+        "Python time regressed by more than the tolerance",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative Python time regression; default 0.25",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ.setdefault("PB_USERNAME", "replay")
+    os.environ.setdefault("PB_PASSWORD", "replay")
+    results = []
+    print(
+        f"{'recording':<24} {'latency':>8} {'total':>10} {'python':>10}"
+        f" {'solve':>10} {'trips':>6}"
+    )
+    for recording in args.recordings:
+        for latency_ms in args.latency_ms:
+            runs = [
+                replay(recording, latency_ms, args.args) for _ in range(args.repeat)
+            ]
+            result = {
+                "recording": recording.name,
+                "latency_ms": latency_ms,
+                "round_trips": runs[0]["round_trips"],
+                **{
+                    f"median_{k}": statistics.median(r[k] for r in runs)
+                    for k in ("seconds", "python_seconds", "solve_seconds")
+                },
+            }
+            results.append(result)
+            print(
+                f"{recording.name:<24} {latency_ms:6.1f}ms"
+                f" {result['median_seconds'] * 1000:8.1f}ms"
+                f" {result['median_python_seconds'] * 1000:8.1f}ms"
+                f" {result['median_solve_seconds'] * 1000:8.1f}ms"
+                f" {result['round_trips']:>6}"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = {
+            (r["recording"], r["latency_ms"]): r
+            for r in json.loads(args.baseline.read_text())
+        }
+        regressions = []
+        for result in results:
+            before = baseline.get((result["recording"], result["latency_ms"]))
+            if before is None:
+                continue
+            if result["round_trips"] > before["round_trips"]:
+                regressions.append(
+                    f"{result['recording']}: {before['round_trips']} ->"
+                    f" {result['round_trips']} round trips"
+                )
+            allowed = before["median_python_seconds"] * (1 + args.tolerance)
+            if result["median_python_seconds"] > allowed:
+                regressions.append(
+                    f"{result['recording']}: Python time"
+                    f" {before['median_python_seconds'] * 1000:.1f}ms ->"
+                    f" {result['median_python_seconds'] * 1000:.1f}ms"
+                )
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            sys.exit(1)
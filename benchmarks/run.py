@@ -0,0 +1,147 @@
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import platform
+import resource
+import statistics
+import subprocess
+import time
+from typing import Any, Dict, List
+
+from robber_baron import ConstraintSolver, Engine
+from robber_baron.engines import MODEL_ENGINES
+
+BENCHMARKS_DIR = Path(__file__).parent
+MODELS_DIR = BENCHMARKS_DIR.parent / "robber_baron" / "models"
+DEFAULT_CORPUS = BENCHMARKS_DIR / "corpus" / "v2"
+
+
+def load_corpus(corpus_dir: Path, games: List[str]) -> List[Dict[str, Any]]:
+    """Load the corpus records of the given games."""
+    records = []
+    for game in games:
+        with open(corpus_dir / f"{game}.jsonl") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def make_engine(backend: str, model: str) -> Engine:
+    """Return the engine for a backend: 'native' or a MiniZinc solver tag."""
+    if backend == "native":
+        return MODEL_ENGINES[model]()
+    return ConstraintSolver(backend)
+
+
+def peak_rss_kb() -> Dict[str, int]:
+    """Return the peak resident set size of this process and its children.
+
+    The peaks are since each process started, so they cover the whole run rather
+    than any one group of instances.
+    """
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return a nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def benchmark(
+    records: List[Dict[str, Any]], backends: List[str], repeat: int
+) -> List[Dict[str, Any]]:
+    """Time every backend on every record, grouped by model, size and difficulty."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in records:
+        key = (record["model"], record.get("size"), record.get("difficulty"))
+        groups.setdefault(key, []).append(record)
+
+    results = []
+    for backend in backends:
+        engines: Dict[str, Engine] = {}
+        for (model, size, difficulty), group in groups.items():
+            if model not in engines:
+                engines[model] = make_engine(backend, model)
+            times = []
+            for record in group:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    engines[model].solve(MODELS_DIR / model, record["instance_params"])
+                    times.append(time.perf_counter() - start)
+            results.append(
+                {
+                    "backend": backend,
+                    "model": model,
+                    "size": size,
+                    "difficulty": difficulty,
+                    "instances": len(group),
+                    "median_seconds": statistics.median(times),
+                    "p95_seconds": percentile(times, 0.95),
+                }
+            )
+            print(
+                f"{backend:>8}  {model:<16} {size or '-':<13} {difficulty or '-':<12}"
+                f"  median {results[-1]['median_seconds'] * 1000:9.2f}ms"
+                f"  p95 {results[-1]['p95_seconds'] * 1000:9.2f}ms"
+            )
+    return results
+
+
+def git_commit() -> str:
+    """Return the current commit, or an empty string outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Benchmark solvers against a puzzle corpus")
+    parser.add_argument(
+        "--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory"
+    )
+    parser.add_argument(
+        "-g",
+        "--games",
+        nargs="+",
+        default=["campsites", "numbergrids", "sudoku"],
+        help="Games to benchmark; default all",
+    )
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="+",
+        default=["native"],
+        help="'native' and/or MiniZinc solver tags; default 'native'",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Solves per instance; default 3"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write results as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    records = load_corpus(args.corpus, args.games)
+    results = benchmark(records, args.backends, args.repeat)
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "corpus": args.corpus.name,
+            "python": platform.python_version(),
+            "results": results,
+            # Process-wide, so one value for the run rather than one per group
+            "run_peak_rss_kb": peak_rss_kb(),
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
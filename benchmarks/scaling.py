@@ -0,0 +1,178 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+from pathlib import Path
+import random
+import resource
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from robber_baron import generators
+from run import MODELS_DIR, make_engine
+
+# Map each game to its model, default board sizes, default density and a function
+# that generates the parameters of a board of a given size
+GAMES: Dict[str, Dict[str, Any]] = {
+    "campsites": {
+        "model": "campsites.mzn",
+        "sizes": [10, 15, 20, 25, 30],
+        "density": 0.25,
+        "generate": lambda size, density, rng: generators.campsites_params(
+            size, size, density, rng
+        ),
+    },
+    "numbergrids": {
+        "model": "numbergrids.mzn",
+        "sizes": [10, 20, 30, 40, 50],
+        "density": 0.6,
+        "generate": generators.numbergrids_params,
+    },
+    "sudoku": {
+        # The bot's model only takes 9x9 boards
+        "model": "sudoku_sized.mzn",
+        # Sudoku boards are sized by their boxes, e.g. 3 for a 9x9 board
+        "sizes": [2, 3, 4, 5],
+        "density": 0.5,
+        "generate": generators.sudoku_params,
+    },
+}
+
+BAR_WIDTH = 40
+
+
+def solve_all(
+    backend: str, model: str, instances: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Solve every instance in this process, returning solve times and peak memory.
+
+    Run in a fresh process, so that the peak memory is that of these solves alone.
+    """
+    engine = make_engine(backend, model)
+    times = []
+    for params in instances:
+        start = time.perf_counter()
+        engine.solve(MODELS_DIR / model, params)
+        times.append(time.perf_counter() - start)
+    return {
+        "times": times,
+        # Solvers run as child processes, and the engines in this one
+        "peak_rss_kb": max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        ),
+    }
+
+
+def generate(
+    game: str, size: int, density: float, instances: int, seed: int
+) -> List[Dict[str, Any]]:
+    """Generate the boards of a game and size, seeded independently of other sizes."""
+    rng = random.Random(f"{seed}-{game}-{size}-{density}")
+    make: Callable[..., Dict[str, Any]] = GAMES[game]["generate"]
+    return [make(size, density, rng) for _ in range(instances)]
+
+
+def bar(value: float, largest: float) -> str:
+    """Return a bar whose length is proportional to a value."""
+    return "#" * max(1, round(BAR_WIDTH * value / largest)) if largest else ""
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Measure how solve time and memory scale with board size"
+    )
+    parser.add_argument(
+        "-g",
+        "--games",
+        nargs="+",
+        default=list(GAMES),
+        choices=list(GAMES),
+        help="Games to benchmark; default all",
+    )
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="+",
+        default=["native"],
+        help="'native' and/or MiniZinc solver tags; default 'native'",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="Board sizes, or box sizes for Sudoku; default depends on the game",
+    )
+    parser.add_argument(
+        "--density",
+        type=float,
+        help="Fraction of cells filled, or given for Sudoku; default depends on the game",
+    )
+    parser.add_argument(
+        "-n", "--instances", type=int, default=3, help="Boards per size; default 3"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; default 0")
+    parser.add_argument("-o", "--output", type=Path, help="Write results as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Spawn rather than fork, so that children do not inherit the parent's memory
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for game in args.games:
+        config = GAMES[game]
+        density = args.density if args.density is not None else config["density"]
+        for size in args.sizes or config["sizes"]:
+            start = time.perf_counter()
+            instances = generate(game, size, density, args.instances, args.seed)
+            generate_seconds = time.perf_counter() - start
+            for backend in args.backends:
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    run = pool.submit(
+                        solve_all, backend, config["model"], instances
+                    ).result()
+                results.append(
+                    {
+                        "game": game,
+                        "backend": backend,
+                        "size": size,
+                        "density": density,
+                        "instances": len(instances),
+                        "generate_seconds": generate_seconds,
+                        "median_seconds": statistics.median(run["times"]),
+                        "max_seconds": max(run["times"]),
+                        "peak_rss_kb": run["peak_rss_kb"],
+                    }
+                )
+                print(
+                    f"{game:<12} {backend:>8} {size:>4}"
+                    f"  median {results[-1]['median_seconds'] * 1000:9.2f}ms"
+                    f"  peak {run['peak_rss_kb'] / 1024:7.1f}MB",
+                    flush=True,
+                )
+
+    # Plot solve time and memory against board size for each game and backend
+    for key, unit, scale in (
+        ("median_seconds", "ms", 1000),
+        ("peak_rss_kb", "MB", 1 / 1024),
+    ):
+        print(f"\n{key}")
+        for game in args.games:
+            for backend in args.backends:
+                rows = [
+                    r for r in results if r["game"] == game and r["backend"] == backend
+                ]
+                largest = max(r[key] for r in rows)
+                print(f"{game} ({backend})")
+                for r in rows:
+                    print(
+                        f"  {r['size']:>4} {r[key] * scale:10.1f}{unit}"
+                        f" {bar(r[key], largest)}"
+                    )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
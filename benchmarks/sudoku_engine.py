@@ -0,0 +1,70 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import statistics
+import time
+from typing import List
+
+from robber_baron import ConstraintSolver, Engine
+from robber_baron.engines import SudokuEngine
+
+# Insane-grade grids; zero or "." denotes an empty cell
+INSANE_GRIDS = [
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    ".....6....59.....82....8....45........3........6..3.54...325..6..................",
+]
+
+
+def parse_grid(grid: str) -> List[List[int]]:
+    """Parse an 81-character grid string into rows of digits."""
+    cells = [0 if c in ".0" else int(c) for c in grid]
+    return [cells[i : i + 9] for i in range(0, 81, 9)]
+
+
+def benchmark(engine: Engine, repeat: int) -> List[float]:
+    """Return the median solve time of each grid in seconds."""
+    model_file = Path(__file__).parent.parent / "robber_baron" / "models" / "sudoku.mzn"
+    medians = []
+    for grid in INSANE_GRIDS:
+        start = parse_grid(grid)
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            engine.solve(model_file, {"start": start})
+            times.append(time.perf_counter() - t0)
+        medians.append(statistics.median(times))
+    return medians
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Compare the native Sudoku engine to MiniZinc")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Solves per grid; default 5"
+    )
+    parser.add_argument(
+        "--solver-tag",
+        default="gecode",
+        help="MiniZinc solver to compare against; default 'gecode'",
+    )
+    parser.add_argument(
+        "--native-only", action="store_true", help="Skip the MiniZinc solver"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    engines = {"native": SudokuEngine()}
+    if not args.native_only:
+        engines[args.solver_tag] = ConstraintSolver(args.solver_tag)
+
+    results = {name: benchmark(engine, args.repeat) for name, engine in engines.items()}
+    print("grid  " + "  ".join(f"{name:>12}" for name in results))
+    for i in range(len(INSANE_GRIDS)):
+        print(
+            f"{i + 1:<4}  "
+            + "  ".join(f"{r[i] * 1000:10.2f}ms" for r in results.values())
+        )
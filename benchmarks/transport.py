@@ -0,0 +1,189 @@
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import requests
+import statistics
+import threading
+import time
+from typing import Callable, Dict, List
+
+from robber_baron import Browser
+from robber_baron.transport import Page, Transport
+
+PAGES_DIR = Path(__file__).parent / "pages" / "wordtwist"
+
+# Map request paths to hand-written stand-ins for the game's pages, and their content
+# types
+ROUTES = {
+    "/init4.php": ("init4.html", "text/html"),
+    "/play.php": ("play.html", "text/html"),
+    "/boarddata.php": ("boarddata.json", "application/json"),
+    "/results.php": ("results.html", "text/html"),
+}
+
+# Session cookie that the new game page sets
+SESSION_COOKIE = "PHPSESSID=standin"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Keep connections alive, like the real server
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which stalls on delayed ACKs otherwise
+    disable_nagle_algorithm = True
+    # Delay before serving the first request of each connection, in seconds
+    handshake_seconds = 0.0
+    # Whether the board data requires the session cookie that the new game page sets,
+    # like the real server
+    require_session = False
+
+    def setup(self):
+        """Simulate the cost of opening a connection."""
+        super().setup()
+        time.sleep(self.handshake_seconds)
+
+    def do_GET(self):
+        """Serve a stand-in page."""
+        self._serve()
+
+    def do_POST(self):
+        """Serve a stand-in page after reading the submitted form."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._serve()
+
+    def _serve(self):
+        """Serve the stand-in page for the request path."""
+        path = self.path.split("?")[0]
+        route = ROUTES.get(path)
+        if route is None:
+            self.send_error(404)
+            return
+        if (
+            self.require_session
+            and path == "/boarddata.php"
+            and SESSION_COOKIE not in self.headers.get("Cookie", "")
+        ):
+            self.send_error(403)
+            return
+        body = (PAGES_DIR / route[0]).read_bytes()
+        self.send_response(200)
+        if path == "/init4.php":
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}; Path=/")
+        self.send_header("Content-Type", route[1])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Do not log requests."""
+
+
+def http_steps(base_url: str, pooled: bool) -> Dict[str, Callable[[], None]]:
+    """Return the steps of a game over HTTP, with or without a pooled session."""
+    transport = Transport()
+    state: Dict[str, Page] = {}
+
+    def get(url: str) -> Page:
+        if pooled:
+            return transport.get(url)
+        response = requests.get(url)
+        return Page(response.url, response.text)
+
+    def load():
+        board_url = [u for u in get(f"{base_url}/init4.php").links() if "u=" in u][0]
+        state["board"] = get(board_url)
+
+    def fetch():
+        url = f"{base_url}/boarddata.php?uid=4f1c2a9e"
+        data = transport.get_json(url) if pooled else requests.get(url).json()
+        assert data["wordList"]
+
+    def submit():
+        action, fields = state["board"].form("gameover")
+        fields["form_words"] = "||star|1|0"
+        if pooled:
+            page = transport.submit(action, fields)
+        else:
+            response = requests.post(action, data=fields)
+            page = Page(response.url, response.text)
+        assert "solcontainer" in page.text
+
+    return {"load": load, "fetch": fetch, "submit": submit}
+
+
+def chrome_steps(base_url: str, browser: Browser) -> Dict[str, Callable[[], None]]:
+    """Return the steps of a game in Chrome."""
+
+    def load():
+        browser.get(f"{base_url}/init4.php")
+        browser.find_element("div#newgameboard a").click()
+        browser.find_element("a#start")
+
+    def fetch():
+        browser.get(f"{base_url}/boarddata.php?uid=4f1c2a9e")
+        browser.find_element("body")
+
+    def submit():
+        browser.get(f"{base_url}/play.php?u=4f1c2a9e")
+        browser.find_element("form#gameover").submit()
+        browser.find_element("div.solcontainer")
+
+    return {"load": load, "fetch": fetch, "submit": submit}
+
+
+def time_steps(steps: Dict[str, Callable[[], None]], repeat: int) -> Dict[str, float]:
+    """Return the median seconds of each step, running the steps in order."""
+    times: Dict[str, List[float]] = {step: [] for step in steps}
+    for _ in range(repeat):
+        for step, run in steps.items():
+            start = time.perf_counter()
+            run()
+            times[step].append(time.perf_counter() - start)
+    return {step: statistics.median(t) for step, t in times.items()}
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Compare Chrome and HTTP latency against a stand-in server"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=20, help="Games per mode; default 20"
+    )
+    parser.add_argument(
+        "--handshake-ms",
+        type=float,
+        default=0.0,
+        help="Simulated cost of opening a connection; default 0",
+    )
+    parser.add_argument(
+        "--chrome", action="store_true", help="Also time the steps in Chrome"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    StandInHandler.handshake_seconds = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    modes = {
+        "requests": http_steps(base_url, pooled=False),
+        "transport": http_steps(base_url, pooled=True),
+    }
+    browser = Browser() if args.chrome else None
+    if browser is not None:
+        modes["chrome"] = chrome_steps(base_url, browser)
+
+    try:
+        for mode, steps in modes.items():
+            medians = time_steps(steps, args.repeat)
+            print(
+                f"{mode:>10}"
+                + "".join(f"  {s} {m * 1000:8.2f}ms" for s, m in medians.items())
+            )
+    finally:
+        if browser is not None:
+            browser.quit()
+        server.shutdown()
@@ -0,0 +1,143 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+from pathlib import Path
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from robber_baron.engines.wordtwist import (
+    build_dawg,
+    Dawg,
+    read_words,
+    WordTwistSolver,
+)
+
+# Letters weighted by their frequency in English, for synthetic words and boards
+LETTERS = (
+    "eeeeeeeeeeeettttttttttaaaaaaaaooooooooiiiiiiinnnnnnnssssssrrrrrrhhhhhh"
+    "llllddddccccuuummmffppggwwyybbvkxjqz"
+)
+
+
+def synthetic_words(count: int, rng: random.Random) -> Dict[str, int]:
+    """Return random words of 3 to 9 letters with random rarities."""
+    words: Dict[str, int] = {}
+    while len(words) < count:
+        word = "".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9)))
+        words[word] = rng.randint(1, 5)
+    return words
+
+
+def rss_kb() -> int:
+    """Return the current resident set size of this process, on Linux."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def measure(
+    mode: str, path: Path, boards: Dict[int, List[List[str]]]
+) -> Dict[str, Any]:
+    """Load a dictionary and solve boards in this process, timing each step.
+
+    Run in a fresh process, so that the growth in memory is that of this dictionary
+    alone. Pages of a mapped dictionary count once they are read.
+    """
+    baseline_kb = rss_kb()
+    start = time.perf_counter()
+    if mode == "dawg":
+        solver: Optional[WordTwistSolver] = WordTwistSolver(Dawg(path))
+    else:
+        # Baseline: parse the word list into a set, as a loader without a file would
+        words = set(read_words(path))
+        solver = None
+    load_seconds = time.perf_counter() - start
+    load_kb = rss_kb() - baseline_kb
+
+    boards_per_second = {}
+    if solver is not None:
+        for size, size_boards in boards.items():
+            start = time.perf_counter()
+            for board in size_boards:
+                solver.solve(board)
+            boards_per_second[size] = len(size_boards) / (time.perf_counter() - start)
+    else:
+        assert words
+    return {
+        "load_seconds": load_seconds,
+        "load_rss_kb": load_kb,
+        "solve_rss_kb": rss_kb() - baseline_kb,
+        "boards_per_second": boards_per_second,
+    }
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Measure WordTwist dictionary load time, memory and board speed"
+    )
+    parser.add_argument(
+        "--words",
+        type=Path,
+        help="Word list, with a word per line; default a synthetic list",
+    )
+    parser.add_argument(
+        "--num-words",
+        type=int,
+        default=200_000,
+        help="Words in the synthetic list; default 200000",
+    )
+    parser.add_argument(
+        "-n", "--boards", type=int, default=200, help="Boards per size; default 200"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; default 0")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rng = random.Random(args.seed)
+    # Spawn rather than fork, so that children do not inherit the parent's memory
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        words_file = args.words
+        if words_file is None:
+            words_file = Path(tmp) / "words.txt"
+            words_file.write_text(
+                "".join(
+                    f"{w} {r}\n"
+                    for w, r in synthetic_words(args.num_words, rng).items()
+                )
+            )
+        dawg_file = Path(tmp) / "words.dawg"
+        start = time.perf_counter()
+        words = read_words(words_file)
+        build_dawg(words, dawg_file)
+        build_seconds = time.perf_counter() - start
+
+        boards = {
+            size: [
+                [rng.choice(LETTERS) for _ in range(size * size)]
+                for _ in range(args.boards)
+            ]
+            for size in (4, 5)
+        }
+        print(
+            f"{len(words)} words: {words_file.stat().st_size / 1024:.0f}KB as text,"
+            f" {dawg_file.stat().st_size / 1024:.0f}KB as a DAWG,"
+            f" built in {build_seconds:.2f}s"
+        )
+        for mode, path in (("set", words_file), ("dawg", dawg_file)):
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                run = pool.submit(measure, mode, path, boards).result()
+            print(
+                f"{mode:>5}  load {run['load_seconds'] * 1000:8.2f}ms"
+                f"  memory +{run['load_rss_kb'] / 1024:6.1f}MB loaded"
+                f" +{run['solve_rss_kb'] / 1024:6.1f}MB solved"
+                + "".join(
+                    f"  {size}x{size} {bps:7.1f} boards/s"
+                    for size, bps in run["boards_per_second"].items()
+                )
+            )
@@ -1,86 +1,836 @@
-from minizinc import Instance, Model, Solver
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+import json
+import logging
 import os
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.ui import WebDriverWait
+import re
+import sys
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+from robber_baron.cache import SolutionCache
+from robber_baron.encoding import decode_body
+from robber_baron.pagetiming import (
+    network_requests,
+    PAGE_TIMING_SCRIPT,
+    performance_log_options,
+)
+from robber_baron.presolve import Presolver, PRESOLVERS
+from robber_baron.timing import PhaseTimer
+from robber_baron.waits import (
+    Condition,
+    CONDITION_SCRIPTS,
+    is_ready,
+    MAX_POLL_SECONDS,
+    MIN_POLL_SECONDS,
+    OBSERVE_SCRIPT,
+    POLL_SCRIPT,
+    SLOW_WAIT_SECONDS,
+    WaitStats,
+)
+
+# Selenium (apart from its exceptions), MiniZinc and requests are slow to import, so
+# they are imported on first use
+if TYPE_CHECKING:
+    from minizinc import Instance
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from robber_baron.replay import Recorder, Replayer
+    from robber_baron.transport import Transport
+
+logger = logging.getLogger(__name__)
 
 
 class Browser:
-    def __init__(self, driver: Optional[WebDriver] = None):
-        """Create a new browser."""
-        self._driver: WebDriver = driver or webdriver.Chrome()
+    def __init__(
+        self,
+        driver: Optional["WebDriver"] = None,
+        in_page_waits: bool = True,
+        performance_log: bool = False,
+    ):
+        """Create a new browser.
+
+        In-page waits resolve with a MutationObserver instead of polling from Python.
+        If the browser starts Chrome itself, `performance_log` enables Chrome's
+        performance log, from which `page_timings` reads every network request.
+        """
+        if driver is None:
+            from selenium import webdriver
+
+            driver = webdriver.Chrome(
+                options=performance_log_options() if performance_log else None
+            )
+        self._driver: "WebDriver" = driver
+        self._in_page_waits = in_page_waits
+        self._script_timeout = 0.0
+        self.round_trips = 0
+        self.wait_stats = WaitStats()
+        # Responses captured by the selenium-wire proxy, as (URL, response) pairs
+        self._captured: Deque[Tuple[str, Any]] = deque()
+        self._responses = threading.Condition()
+        self._max_body_bytes: Optional[int] = None
+        self._capturing = False
+
+        # Every WebDriver command, including those sent by elements, goes through
+        # `execute`, so counting its calls counts HTTP round trips to the driver
+        execute = self._driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.round_trips += 1
+            return execute(*args, **kwargs)
+
+        self._driver.execute = counted_execute
+
+    @classmethod
+    def attach(
+        cls, executor_url: str, session_id: str, w3c: bool = True, **kwargs
+    ) -> "Browser":
+        """Attach to an existing WebDriver session, e.g. one kept warm by the daemon."""
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        class AttachedDriver(WebDriver):
+            def start_session(self, capabilities, browser_profile=None):
+                """Reuse the existing session instead of creating one."""
+                self.session_id = session_id
+                self.capabilities = {}
+                self.w3c = w3c
+                self.command_executor.w3c = w3c
+
+        return cls(AttachedDriver(command_executor=executor_url), **kwargs)
+
+    def session(self) -> Dict[str, Any]:
+        """Return what another process needs to attach to this browser's session."""
+        return {
+            "executor_url": self._driver.command_executor._url,
+            "session_id": self._driver.session_id,
+            "w3c": self._driver.w3c,
+        }
+
+    def service_pid(self) -> Optional[int]:
+        """Return the process ID of the local driver service, e.g. chromedriver."""
+        service = getattr(self._driver, "service", None)
+        if service is None or service.process is None:
+            return None
+        return service.process.pid
+
+    def is_alive(self) -> bool:
+        """Return whether the browser still responds to commands."""
+        try:
+            return self._driver.execute_script("return true") is True
+        except Exception:
+            return False
+
+    def record(self, recorder: "Recorder"):
+        """Record every interaction with the driver from now on, e.g. to replay it.
+
+        Pages loaded, elements found, scripts executed, requests captured and the
+        results of each are written by the recorder; see `robber_baron.replay`.
+        """
+        self._driver = recorder.driver(self._driver)
 
     def get(self, url: str):
         """Get a page by URL."""
         self._driver.get(url)
 
-    def find_element(self, css_selector: str, timeout_seconds: int = 10) -> WebElement:
-        """Find an element on the page, waiting for the element to become clickable."""
-        return WebDriverWait(self._driver, timeout_seconds).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, css_selector))
+    def page_timings(self) -> Dict[str, Any]:
+        """Return the page and network timings since they were last read.
+
+        Timings include the Navigation Timing of the current document, if it was
+        not read before, e.g. its time to first byte, DOMContentLoaded and load,
+        and the Resource Timing of each resource it loaded since, with the bytes
+        transferred and durations. Times are in seconds. If Chrome's performance
+        log is enabled, every request since, across navigations, is also included
+        under "network"; see `robber_baron.pagetiming.network_requests`.
+
+        Reading timings is not counted as round trips, so that phases count the
+        same whether or not they are read.
+        """
+        round_trips = self.round_trips
+        timings = self._driver.execute_script(PAGE_TIMING_SCRIPT)
+        try:
+            log = self._driver.get_log("performance")
+        except WebDriverException:
+            # The performance log is not enabled
+            log = None
+        self.round_trips = round_trips
+        navigation = timings["navigation"]
+        return {
+            "navigations": [navigation] if navigation is not None else [],
+            "resources": timings["resources"],
+            "network": network_requests(log) if log is not None else None,
+        }
+
+    def find_element(
+        self,
+        css_selector: str,
+        timeout_seconds: float = 10,
+        condition: Condition = Condition.CLICKABLE,
+    ) -> "WebElement":
+        """Find an element on the page, waiting for the element to meet a condition."""
+        return self.wait_until(
+            CONDITION_SCRIPTS[condition],
+            css_selector,
+            timeout_seconds=timeout_seconds,
+            label=css_selector,
         )
 
     def find_invisible_element(
-        self, css_selector: str, max_retries: int = 10, retry_seconds: int = 1
-    ) -> WebElement:
-        """Find an invisible element on the page, retrying if the element cannot be found."""
-        retries = 0
-        while retries < max_retries:
+        self, css_selector: str, timeout_seconds: float = 10
+    ) -> Optional["WebElement"]:
+        """Find an invisible element on the page, or return None if it is not found."""
+        try:
+            return self.find_element(css_selector, timeout_seconds, Condition.PRESENT)
+        except TimeoutException:
+            return None
+
+    def wait_until(
+        self,
+        script: str,
+        *args,
+        timeout_seconds: float = 10,
+        label: Optional[str] = None,
+    ) -> Any:
+        """Wait until a JavaScript function body returns a value other than null or false.
+
+        The wait resolves in the page whenever the DOM changes if in-page waits are
+        enabled, and otherwise polls with a delay that starts at a few milliseconds.
+        If the page navigates away during an in-page wait, it is retried after a delay.
+        Latencies are recorded in `wait_stats` under the label.
+        """
+        label = label or "script"
+        start = time.perf_counter()
+        deadline = start + timeout_seconds
+        delay = MIN_POLL_SECONDS
+        while True:
             try:
-                return self._driver.find_element_by_css_selector(css_selector)
-            except Exception:
-                retries += 1
-                time.sleep(retry_seconds)
-        return None
+                if self._in_page_waits:
+                    value = self._observe(script, args, deadline - time.perf_counter())
+                else:
+                    value = self._driver.execute_script(POLL_SCRIPT % script, *args)
+            except TimeoutException:
+                value = None
+            except (JavascriptException, StaleElementReferenceException):
+                # E.g. the page was unloaded while the script was running; other
+                # errors, e.g. an invalid selector or a dead session, are raised
+                value = None
+
+            now = time.perf_counter()
+            if is_ready(value) or now >= deadline:
+                break
+            time.sleep(min(delay, deadline - now))
+            delay = min(delay * 2, MAX_POLL_SECONDS)
+
+        seconds = time.perf_counter() - start
+        self.wait_stats.record(label, seconds, timed_out=not is_ready(value))
+        if seconds > SLOW_WAIT_SECONDS:
+            logger.info("Slow wait for %s: %.3fs", label, seconds)
+        if not is_ready(value):
+            raise TimeoutException(f"timed out after {timeout_seconds}s: {label}")
+        return value
+
+    def _observe(
+        self, script: str, args: Tuple[Any, ...], timeout_seconds: float
+    ) -> Any:
+        """Wait for a condition in the page, returning None if the wait times out."""
+        if timeout_seconds <= 0:
+            return self._driver.execute_script(POLL_SCRIPT % script, *args)
+        # The driver must not time out before the script does
+        if self._script_timeout < timeout_seconds + 1:
+            self._script_timeout = max(timeout_seconds + 1, 30)
+            self._driver.set_script_timeout(self._script_timeout)
+        return self._driver.execute_async_script(
+            OBSERVE_SCRIPT % script, *args, int(timeout_seconds * 1000)
+        )
 
-    def execute_script(self, script: str, *args):
-        """Execute JavaScript in the context of the page."""
-        self._driver.execute_script(script, *args)
+    def execute_script(self, script: str, *args) -> Any:
+        """Execute JavaScript in the context of the page, returning its result."""
+        return self._driver.execute_script(script, *args)
 
-    def select_by_value(self, element: WebElement, value: str):
+    def read_many(
+        self,
+        css_selectors: List[str],
+        attribute: str = "innerText",
+        timeout_seconds: float = 10,
+    ) -> List[str]:
+        """Read an attribute of many elements in a single script call.
+
+        Waits until every element is present; see `wait_until`.
+        """
+        script = """
+            const values = [];
+            for (const selector of arguments[0]) {
+                const element = document.querySelector(selector);
+                if (element === null) {
+                    return null;
+                }
+                values.push(element[arguments[1]] ?? element.getAttribute(arguments[1]));
+            }
+            return values;
+        """
+        return self.wait_until(
+            script,
+            css_selectors,
+            attribute,
+            timeout_seconds=timeout_seconds,
+            label=",".join(css_selectors),
+        )
+
+    def write_many(self, values: Dict[str, str], attribute: str = "innerText"):
+        """Set an attribute of many elements in a single script call."""
+        self._driver.execute_script(
+            """
+            for (const [selector, value] of Object.entries(arguments[0])) {
+                const element = document.querySelector(selector);
+                if (arguments[1] in element) {
+                    element[arguments[1]] = value;
+                } else {
+                    element.setAttribute(arguments[1], value);
+                }
+            }
+            """,
+            values,
+            attribute,
+        )
+
+    def select_by_value(self, element: "WebElement", value: str):
         """Select an option by value."""
+        from selenium.webdriver.support.select import Select
+
         Select(element).select_by_value(value)
 
+    def cookies(self) -> List[Dict[str, Any]]:
+        """Return the cookies of the current session."""
+        return self._driver.get_cookies()
+
     def request_history(self) -> Any:
         """Return the request history of the browser; requires a selenium-wire driver."""
         return self._driver.requests
 
+    def capture(
+        self,
+        scopes: List[str],
+        max_responses: int = 16,
+        max_body_bytes: Optional[int] = 2**22,
+    ):
+        """Capture only requests whose URLs match one of the regular expressions.
+
+        The scopes are applied by the selenium-wire proxy, which streams every other
+        request through without storing it, and only the most recent matching
+        responses are kept for `wait_for_response`. Responses whose bodies are larger
+        than `max_body_bytes` are dropped. Requires a selenium-wire driver.
+        """
+        self._driver.scopes = scopes
+        del self._driver.requests
+        with self._responses:
+            self._captured = deque(maxlen=max_responses)
+            self._max_body_bytes = max_body_bytes
+        self._driver.response_interceptor = self._on_response
+        self._capturing = True
+
+    def stop_capture(self):
+        """Stop capturing requests, e.g. before another game uses the browser."""
+        if not self._capturing:
+            return
+        self._driver.scopes = []
+        del self._driver.response_interceptor
+        del self._driver.requests
+        with self._responses:
+            self._captured = deque()
+        self._capturing = False
+
+    def _on_response(self, request: Any, response: Any):
+        """Keep a captured response and wake up waits; called by the proxy's thread."""
+        limit = self._max_body_bytes
+        if limit is not None and _body_size(response) > limit:
+            logger.warning("Dropped a response over %d bytes: %s", limit, request.url)
+            # Waits for the URL fail at once instead of timing out
+            response = None
+        with self._responses:
+            self._captured.append((request.url, response))
+            self._responses.notify_all()
+
+    def wait_for_response(
+        self,
+        pattern: str,
+        timeout_seconds: float = 10,
+        max_body_bytes: Optional[int] = 2**22,
+    ) -> bytes:
+        """Wait for a captured response whose URL matches a regular expression.
+
+        Returns as soon as the response arrives, with its Content-Encoding undone. The
+        scopes passed to `capture` must include the URL.
+        """
+        deadline = time.perf_counter() + timeout_seconds
+        with self._responses:
+            while True:
+                found = [r for url, r in self._captured if re.search(pattern, url)]
+                if found:
+                    response = found[0]
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(
+                        f"timed out after {timeout_seconds}s: {pattern}"
+                    )
+                self._responses.wait(remaining)
+        if response is None:
+            raise ValueError(f"captured response was too large: {pattern}")
+        return decode_body(
+            response.body, response.headers.get("Content-Encoding"), max_body_bytes
+        )
+
     def quit(self):
         """Quit the browser."""
         self._driver.quit()
 
 
+class Engine(Protocol):
+    def solve(self, model_file: Path, instance_params: Dict[str, Any]) -> Any:
+        """Solve an instance of a model."""
+
+
 class ConstraintSolver:
-    def __init__(self, solver_tag: str = "gecode"):
-        """Create a new constraint solver."""
+    # Map (model file, solver tag) to (model file mtime, base instance)
+    _instances: Dict[Tuple[Path, str], Tuple[float, "Instance"]] = {}
+
+    def __init__(
+        self,
+        solver_tag: str = "gecode",
+        cache: Optional[SolutionCache] = None,
+        timeout_seconds: Optional[float] = None,
+        model_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        """Create a new constraint solver, optionally backed by a solution cache.
+
+        Solves that exceed their time budget raise `TimeoutError`. The budget is the
+        one given to `solve`, else the one in `model_timeouts` for the model's file
+        name, else `timeout_seconds`; by default, there is none.
+        """
+        from minizinc import Solver
+
         self._solver = Solver.lookup(solver_tag)
+        self._solver_tag = solver_tag
+        self._cache = cache
+        self._timeout_seconds = timeout_seconds
+        self._model_timeouts = model_timeouts or {}
+        # Seconds spent parsing, flattening and searching during the last solve
+        self.last_timings: Dict[str, float] = {}
+        # MiniZinc's statistics for the last solve, e.g. nodes and failures
+        self.last_statistics: Dict[str, Any] = {}
 
-    def solve(self, model_file: Path, instance_params: Dict[str, Any]) -> Any:
-        """Solve an instance of a model."""
-        model = Model(model_file)
-        instance = Instance(self._solver, model)
+    def budget(
+        self, model_file: Path, timeout_seconds: Optional[float] = None
+    ) -> Optional[float]:
+        """Return the time budget for solving a model, in seconds, if there is one."""
+        if timeout_seconds is not None:
+            return timeout_seconds
+        return self._model_timeouts.get(Path(model_file).name, self._timeout_seconds)
+
+    def _base_instance(self, model_file: Path) -> Tuple["Instance", float]:
+        """Return a parsed instance of a model and the seconds spent parsing it.
+
+        Parsed instances are shared between solvers with the same tag, and are
+        rebuilt when the model file is modified.
+        """
+        path = Path(model_file).resolve()
+        mtime = path.stat().st_mtime
+        key = (path, self._solver_tag)
+        cached = ConstraintSolver._instances.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], 0.0
+
+        from minizinc import Instance, Model
+
+        start = time.perf_counter()
+        instance = Instance(self._solver, Model(path))
+        instance.analyse()
+        ConstraintSolver._instances[key] = (mtime, instance)
+        return instance, time.perf_counter() - start
+
+    def solve(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance of a model, within the model's time budget.
+
+        With a solution cache, the solution is returned as a dictionary of output
+        variables, whether or not it was found in the cache.
+        """
+        budget = self.budget(model_file, timeout_seconds)
+        if self._cache is None:
+            return self._solve(model_file, instance_params, budget)
+        self.last_timings = {}
+        self.last_statistics = {}
+        return self._cache.get_or_solve(
+            model_file,
+            self._solver_tag,
+            instance_params,
+            lambda params: solution_dict(self._solve(model_file, params, budget)),
+        )
+
+    def prepare(self, model_file: Path):
+        """Parse a model ahead of time, so that solving it later starts faster."""
+        self._base_instance(model_file)
+
+    def _solve(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        budget: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance of a model with MiniZinc."""
+        base, parse_seconds = self._base_instance(model_file)
+        start = time.perf_counter()
+        result = _branch(base, instance_params).solve(
+            timeout=timedelta(seconds=budget) if budget is not None else None
+        )
+        self._record_timings(result, parse_seconds, time.perf_counter() - start)
+        self._check_budget(result, model_file, budget)
+        return result
+
+    def _check_budget(self, result: Any, model_file: Path, budget: Optional[float]):
+        """Raise `TimeoutError` if a solve ran out of time before finding an answer."""
+        from minizinc import Status
+
+        if budget is not None and result.status == Status.UNKNOWN:
+            raise TimeoutError(
+                f"{self._solver_tag} did not solve {Path(model_file).name}"
+                f" within {budget}s"
+            )
+
+    async def solve_async(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        on_statistics: Optional[Callable[[Dict[str, Any]], None]] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance of a model without blocking the event loop.
+
+        Statistics are passed to `on_statistics` as MiniZinc reports them.
+        """
+        import asyncio
+
+        if self._cache is not None:
+            return await asyncio.to_thread(
+                self.solve, model_file, instance_params, timeout_seconds
+            )
+
+        from minizinc import Result, Status
+
+        budget = self.budget(model_file, timeout_seconds)
+        base, parse_seconds = await asyncio.to_thread(self._base_instance, model_file)
+        start = time.perf_counter()
+        status = Status.UNKNOWN
+        solution = None
+        statistics: Dict[str, Any] = {}
+        async for result in _branch(base, instance_params).solutions(
+            timeout=timedelta(seconds=budget) if budget is not None else None,
+            intermediate_solutions=True,
+        ):
+            status = result.status
+            if result.solution is not None:
+                solution = result.solution
+            if result.statistics:
+                statistics.update(result.statistics)
+                if on_statistics is not None:
+                    on_statistics(result.statistics)
+        result = Result(status, solution, statistics)
+        self._record_timings(result, parse_seconds, time.perf_counter() - start)
+        self._check_budget(result, model_file, budget)
+        return result
+
+    def _record_timings(self, result: Any, parse_seconds: float, solve_seconds: float):
+        """Record the time spent parsing, flattening and searching, and statistics."""
+        self.last_timings = {
+            "parse": parse_seconds,
+            "flatten": _seconds(result.statistics.get("flatTime")),
+            "search": _seconds(result.statistics.get("solveTime")),
+            "total": parse_seconds + solve_seconds,
+        }
+        self.last_statistics = {
+            k: _seconds(v) if isinstance(v, timedelta) else v
+            for k, v in result.statistics.items()
+        }
+
+
+def _body_size(response: Any) -> int:
+    """Return the size of a response body, by its Content-Length where given."""
+    try:
+        return int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return len(response.body)
+
+
+def _branch(base: "Instance", instance_params: Dict[str, Any]) -> "Instance":
+    """Return a child of a parsed instance with the given parameters set.
+
+    The branch holds the base instance's lock only while the parameters are set, and
+    is solved after it is released, so that solves of the same model run
+    concurrently. Base instances are never modified once parsed, so this is safe.
+    """
+    with base.branch() as instance:
         for k, v in instance_params.items():
             instance[k] = v
-        return instance.solve()
+    return instance
+
+
+def solution_dict(result: Any) -> Dict[str, Any]:
+    """Return the output variables of a MiniZinc result as a dictionary."""
+    if result.solution is None:
+        raise ValueError("failed to find solution")
+    return {k: v for k, v in vars(result.solution).items() if not k.startswith("_")}
+
+
+def _format_statistic(value: Any) -> str:
+    """Format a statistic for logging, with fractions rounded to milliseconds."""
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def _seconds(value: Any) -> float:
+    """Convert a MiniZinc timing statistic to seconds."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value or 0.0)
 
 
 class Bot:
+    # MiniZinc solver used by default
+    solver_tag = "gecode"
+
     def __init__(
         self,
         *,
         browser: Optional[Browser] = None,
-        solver: Optional[ConstraintSolver] = None,
+        solver: Optional[Engine] = None,
+        transport: Optional["Transport"] = None,
+        presolve: bool = True,
     ):
-        """Creates a new bot."""
-        self.browser = browser or Browser()
-        self.solver = solver or ConstraintSolver()
+        """Creates a new bot.
+
+        The browser, solver and transport default to being created on first use. A
+        given browser is left running when the bot quits. Unless `presolve` is false,
+        instances of models with a presolve stage are presolved before solving; see
+        `robber_baron.presolve`. If PB_RECORD_FILE is set,
+        the interactions of the browser and transport that the bot creates are
+        recorded to it; if PB_REPLAY_FILE is set, they are replayed from it instead.
+        """
+        self._browser = browser
+        self._owns_browser = browser is None
+        self._solver = solver
+        self._transport = transport
+        self._presolve = presolve
+        self._cache: Optional[SolutionCache] = None
+        self._page_timing = bool(os.getenv("PB_PAGE_TIMING"))
+        # Record or replay the browser and transport that the bot creates, if asked to
+        self._recording: Optional[Union["Recorder", "Replayer"]] = None
+        if os.getenv("PB_RECORD_FILE") or os.getenv("PB_REPLAY_FILE"):
+            from robber_baron.replay import recording_from_env
+
+            self._recording = recording_from_env()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._warm_ups: Dict[Path, Future] = {}
+        self.timer = PhaseTimer(
+            type(self).__name__,
+            lambda: self._browser.round_trips if self._browser is not None else 0,
+        )
+        # Statistics of the last solve; see `solve`
+        self.last_statistics: Dict[str, Any] = {}
+
+    @property
+    def browser(self) -> Browser:
+        """Return the bot's browser, starting it on first use."""
+        if self._browser is None:
+            if self._recording is None:
+                self._browser = self._make_browser()
+            else:
+                self._browser = self._recording.browser(self._make_browser)
+        return self._browser
+
+    def _make_browser(self) -> Browser:
+        """Start a browser for the bot."""
+        return Browser(performance_log=self._page_timing)
+
+    @property
+    def solver(self) -> Engine:
+        """Return the bot's solver, creating a MiniZinc solver on first use."""
+        if self._solver is None:
+            self._solver = self._make_solver()
+        return self._solver
+
+    def _make_solver(self) -> Engine:
+        """Create a solver for the bot.
+
+        If PB_CACHE_FILE is set, the solver is backed by a solution cache persisted to
+        that SQLite database, with Sudoku grids canonicalized under their symmetries.
+        """
+        cache_file = os.getenv("PB_CACHE_FILE")
+        if cache_file:
+            self._cache = SolutionCache(Path(cache_file), canonicalize_sudoku=True)
+        return ConstraintSolver(self.solver_tag, cache=self._cache)
+
+    @property
+    def transport(self) -> "Transport":
+        """Return the bot's HTTP transport, creating it on first use."""
+        if self._transport is None:
+            if self._recording is not None:
+                self._transport = self._recording.transport()
+            else:
+                from robber_baron.transport import Transport
+
+                self._transport = Transport()
+        return self._transport
+
+    @contextmanager
+    def span(self, phase: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time a phase of a game; see `PhaseTimer.span`.
+
+        If PB_PAGE_TIMING is set, the browser's page and network timings are read
+        at the end of the phase and attached to it under "page"; see
+        `Browser.page_timings`.
+        """
+        with self.timer.span(phase, **fields) as event:
+            yield event
+            if self._page_timing and self._browser is not None:
+                try:
+                    event["page"] = self._browser.page_timings()
+                except WebDriverException as e:
+                    logger.debug("Failed to read page timings: %s", e)
+
+    def warm_up(self, model_file: Path):
+        """Prepare the solver for a model in the background, e.g. while a page loads.
+
+        A default solver is also created in the background.
+        """
+        if model_file not in self._warm_ups:
+            presolver = self._presolver(model_file)
+            self._warm_ups[model_file] = self._executor.submit(
+                self._prepare,
+                model_file if presolver is None else presolver.model_file,
+            )
+
+    def _presolver(self, model_file: Path) -> Optional[Presolver]:
+        """Return the presolve stage of a model, if the bot presolves it."""
+        return PRESOLVERS.get(Path(model_file).name) if self._presolve else None
+
+    def _prepare(self, model_file: Path):
+        """Prepare the solver for a model, if it supports that."""
+        prepare = getattr(self.solver, "prepare", None)
+        if prepare is not None:
+            prepare(model_file)
+
+    def solve(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        labels: Optional[Dict[str, str]] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance of a model, streaming solver statistics as they arrive.
+
+        If PB_CAPTURE_FILE is set, the instance is appended to it as a JSON line along
+        with the given labels, e.g. the puzzle size and difficulty. The instance is
+        then presolved, if the model has a presolve stage. A time budget is passed on
+        to solvers that take one.
+
+        The solve's statistics, e.g. MiniZinc's node and failure counts, are logged,
+        attached to the current phase and kept in `last_statistics`. They include
+        whether flattening or search took longer, where the solver reports both, and
+        the fraction of cells that presolving fixed.
+        """
+        capture_file = os.getenv("PB_CAPTURE_FILE")
+        if capture_file:
+            with open(capture_file, "a") as f:
+                record = {
+                    "model": Path(model_file).name,
+                    **(labels or {}),
+                    "instance_params": instance_params,
+                }
+                f.write(json.dumps(record) + "\n")
+
+        warm_up = self._warm_ups.pop(model_file, None)
+        if warm_up is not None:
+            warm_up.result()
+
+        presolver = self._presolver(model_file)
+        presolve: Dict[str, Any] = {}
+        if presolver is not None:
+            start = time.perf_counter()
+            presolved = presolver.presolve(instance_params)
+            model_file, instance_params = (
+                presolved.model_file,
+                presolved.instance_params,
+            )
+            presolve = {
+                "fixed": presolved.fixed,
+                "presolve_seconds": time.perf_counter() - start,
+            }
+
+        budget = {} if timeout_seconds is None else {"timeout_seconds": timeout_seconds}
+        start = time.perf_counter()
+        solve_async = getattr(self.solver, "solve_async", None)
+        if solve_async is None:
+            result = self.solver.solve(model_file, instance_params, **budget)
+        else:
+            import asyncio
+
+            result = asyncio.run(
+                solve_async(
+                    model_file,
+                    instance_params,
+                    on_statistics=lambda s: logger.debug("Solver statistics: %s", s),
+                    **budget,
+                )
+            )
+
+        timings = getattr(self.solver, "last_timings", {})
+        statistics = {
+            "seconds": time.perf_counter() - start,
+            **getattr(self.solver, "last_statistics", {}),
+            **presolve,
+        }
+        if timings.get("flatten") or timings.get("search"):
+            statistics["bound"] = (
+                "flatten" if timings["flatten"] > timings["search"] else "search"
+            )
+        self.last_statistics = statistics
+        logger.info(
+            "Solved %s with %s: %s",
+            Path(model_file).name,
+            type(self.solver).__name__,
+            ", ".join(f"{k}={_format_statistic(v)}" for k, v in statistics.items()),
+        )
+        self.timer.annotate(
+            solver=type(self.solver).__name__,
+            statistics=statistics,
+            timings=timings,
+        )
+        return result
 
     def login(self):
         """Login to a Puzzle Baron account."""
@@ -92,14 +842,33 @@ class Bot:
         if not password:
             raise ValueError("missing password; please set PB_PASSWORD")
 
-        login_url = "https://wordtwist.puzzlebaron.com/"
-        print(f"Loading login url: {login_url} ...")
-        self.browser.get(login_url)
+        with self.span("login"):
+            login_url = "https://wordtwist.puzzlebaron.com/"
+            logger.info("Loading login url: %s ...", login_url)
+            self.browser.get(login_url)
+
+            logger.info("Logging in as: %s ...", username)
+            self.browser.find_element("input#idLoginUserName").send_keys(username)
+            self.browser.find_element("input#idLoginPassword").send_keys(password)
+            self.browser.find_element("input#idLoginBtn").click()
+
+            logger.info("Verifying login ...")
+            _ = self.browser.find_element("a.loggedin_username")
 
-        print(f"Logging in as: {username} ...")
-        self.browser.find_element("input#idLoginUserName").send_keys(username)
-        self.browser.find_element("input#idLoginPassword").send_keys(password)
-        self.browser.find_element("input#idLoginBtn").click()
+    def quit(self, prompt: bool = False):
+        """Quit the browser, if the bot started it, and close the transport.
 
-        print("Verifying login ...")
-        _ = self.browser.find_element("a.loggedin_username")
+        If prompting from a terminal, waits for enter first, e.g. to inspect the page.
+        """
+        if self._browser is not None and self._owns_browser:
+            if prompt and sys.stdin.isatty():
+                input("Press enter to quit: ")
+            self._browser.quit()
+        if self._transport is not None:
+            self._transport.close()
+        if self._recording is not None:
+            self._recording.close()
+        # Stop the warm-up thread, e.g. in a daemon that creates a bot per game
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._cache is not None:
+            self._cache.close()
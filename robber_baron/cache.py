@@ -0,0 +1,198 @@
+from collections import OrderedDict
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Solution = Dict[str, Any]
+
+
+class SudokuSymmetry:
+    def __init__(self, start: List[List[int]]):
+        """Map a Sudoku grid onto a canonical form under the board symmetries.
+
+        Rows, columns, bands and stacks are ordered by invariants of the givens, the
+        grid is transposed if that yields a smaller form, and digits are relabelled in
+        order of first appearance. Equivalent grids whose invariants tie may still map
+        to different forms; every mapping is exact, so solutions always map back.
+        """
+        n = len(start)
+        box = int(round(n**0.5))
+        candidates = []
+        for transpose in (False, True):
+            grid = [list(row) for row in zip(*start)] if transpose else start
+            rows = _order_lines(grid, box)
+            cols = _order_lines([list(col) for col in zip(*grid)], box)
+            digits: Dict[int, int] = {}
+            form = []
+            for r in rows:
+                row = []
+                for c in cols:
+                    value = grid[r][c]
+                    if value and value not in digits:
+                        digits[value] = len(digits) + 1
+                    row.append(digits.get(value, 0))
+                form.append(row)
+            candidates.append((form, transpose, rows, cols, digits))
+
+        self.start, self._transpose, self._rows, self._cols, digits = min(
+            candidates, key=lambda c: c[0]
+        )
+        # Digits absent from the givens are relabelled in numeric order
+        for value in range(1, n + 1):
+            if value not in digits:
+                digits[value] = len(digits) + 1
+        self._labels = {v: k for k, v in digits.items()}
+
+    def restore(self, solution: List[List[int]]) -> List[List[int]]:
+        """Map a solution of the canonical grid back onto the original grid."""
+        n = len(solution)
+        grid = [[0] * n for _ in range(n)]
+        for i, r in enumerate(self._rows):
+            for j, c in enumerate(self._cols):
+                grid[r][c] = self._labels[solution[i][j]]
+        return [list(row) for row in zip(*grid)] if self._transpose else grid
+
+
+def _order_lines(grid: List[List[int]], box: int) -> List[int]:
+    """Order the rows of a grid by band, then within each band, by their givens."""
+
+    def row_key(r: int) -> Tuple[int, ...]:
+        counts = [
+            sum(1 for v in grid[r][s * box : (s + 1) * box] if v) for s in range(box)
+        ]
+        return (sum(counts), *sorted(counts))
+
+    bands = []
+    for b in range(box):
+        rows = sorted(range(b * box, (b + 1) * box), key=row_key, reverse=True)
+        bands.append(([row_key(r) for r in rows], rows))
+    bands.sort(reverse=True)
+    return [r for _, rows in bands for r in rows]
+
+
+class SolutionCache:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = 1024,
+        canonicalize_sudoku: bool = False,
+    ):
+        """Create a solution cache, persisted to an SQLite database if a path is given.
+
+        The cache may be used from any thread, e.g. by `ConstraintSolver.solve_async`,
+        which solves on a worker thread.
+        """
+        self._entries: "OrderedDict[str, Solution]" = OrderedDict()
+        self._max_entries = max_entries
+        self._canonicalize_sudoku = canonicalize_sudoku
+        self._model_digests: Dict[Path, Tuple[float, str]] = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        # Guards both tiers, since the connection is shared between threads
+        self._lock = threading.RLock()
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, solution TEXT)"
+            )
+            self._db.commit()
+
+    def _model_digest(self, model_file: Path) -> str:
+        """Return a digest of a model file's contents, rehashing when it is modified."""
+        path = Path(model_file).resolve()
+        mtime = path.stat().st_mtime
+        cached = self._model_digests.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, hashlib.sha256(path.read_bytes()).hexdigest())
+            self._model_digests[path] = cached
+        return cached[1]
+
+    def _key(self, model_file: Path, solver_tag: str, params: Dict[str, Any]) -> str:
+        """Return the canonical key of an instance."""
+        payload = json.dumps(
+            [self._model_digest(model_file), solver_tag, params],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Solution]:
+        """Look up a solution in memory, then on disk."""
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: str) -> Optional[Solution]:
+        """Look up a solution while holding the lock."""
+        solution = self._entries.get(key)
+        if solution is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return solution
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT solution FROM solutions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                solution = json.loads(row[0])
+                self._remember(key, solution)
+                return solution
+
+        self.stats["misses"] += 1
+        return None
+
+    def _remember(self, key: str, solution: Solution):
+        """Store a solution in memory, evicting the least recently used entries."""
+        self._entries[key] = solution
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _put(self, key: str, solution: Solution):
+        """Store a solution in memory and on disk."""
+        with self._lock:
+            self._remember(key, solution)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solutions (key, solution) VALUES (?, ?)",
+                    (key, json.dumps(solution)),
+                )
+                self._db.commit()
+
+    def get_or_solve(
+        self,
+        model_file: Path,
+        solver_tag: str,
+        instance_params: Dict[str, Any],
+        solve: Callable[[Dict[str, Any]], Solution],
+    ) -> Solution:
+        """Return the cached solution of an instance, solving and storing it on a miss."""
+        symmetry = None
+        params = instance_params
+        if self._canonicalize_sudoku and Path(model_file).name == "sudoku.mzn":
+            symmetry = SudokuSymmetry(instance_params["start"])
+            params = {**instance_params, "start": symmetry.start}
+
+        key = self._key(model_file, solver_tag, params)
+        solution = self._get(key)
+        if solution is None:
+            solution = solve(params)
+            self._put(key, solution)
+
+        if symmetry is not None:
+            solution = {**solution, "puzzle": symmetry.restore(solution["puzzle"])}
+        return solution
+
+    def close(self):
+        """Close the on-disk database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
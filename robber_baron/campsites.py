@@ -1,9 +1,17 @@
 from argparse import ArgumentParser
 from enum import Enum
-from more_itertools import sliced
+from functools import partial
+import logging
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from robber_baron import Bot
+from robber_baron import Bot, Browser, Engine
+from robber_baron.engines import CampsitesEngine
+from robber_baron.grid import Grid
+from robber_baron.portfolio import FallbackSolver, named_backends
+from robber_baron.waits import Condition
+
+logger = logging.getLogger(__name__)
 
 
 class Size(Enum):
@@ -38,97 +46,230 @@ SIZE_DATA = {
 
 DIFFICULTY_IDS = {Difficulty.EASY: 1, Difficulty.CHALLENGING: 3}
 
+# Characters of the cells in the page state and solution; a cell's value is its index
+ALPHABET = ".CT"
+TREE = 2
+
+
+class Model(Enum):
+    GRID = "grid"
+    PAIRS = "pairs"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+MODEL_FILES = {
+    Model.GRID: Path(__file__).parent / "models" / "campsites.mzn",
+    Model.PAIRS: Path(__file__).parent / "models" / "campsites_pairs.mzn",
+}
+
+
+def pairs_params(
+    num_rows: int,
+    num_cols: int,
+    num_tents_in_row: List[int],
+    num_tents_in_col: List[int],
+    tree_rows: List[int],
+    tree_cols: List[int],
+) -> Dict[str, Any]:
+    """Return the parameters of the pairs Campsites model.
+
+    The candidate tent cells are the free cells cardinally adjacent to a tree, and
+    neighbours are the pairs of candidates that touch, diagonals included. Rows and
+    columns are 1-based, as in MiniZinc.
+    """
+    trees = set(zip(tree_rows, tree_cols))
+    candidates: Dict[Tuple[int, int], int] = {}
+    tree_candidates = []
+    for i, j in zip(tree_rows, tree_cols):
+        adjacent = set()
+        for cell in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if (
+                1 <= cell[0] <= num_rows
+                and 1 <= cell[1] <= num_cols
+                and cell not in trees
+            ):
+                adjacent.add(candidates.setdefault(cell, len(candidates) + 1))
+        tree_candidates.append(adjacent)
+
+    neighbours = [
+        (k, candidates[(i + di, j + dj)])
+        for (i, j), k in candidates.items()
+        # Look forwards only, so that each pair is posted once
+        for di, dj in ((0, 1), (1, -1), (1, 0), (1, 1))
+        if (i + di, j + dj) in candidates
+    ]
+    return {
+        "num_rows": num_rows,
+        "num_cols": num_cols,
+        "num_tents_in_row": num_tents_in_row,
+        "num_tents_in_col": num_tents_in_col,
+        "num_trees": len(tree_rows),
+        "num_candidates": len(candidates),
+        "candidate_rows": [i for i, _ in candidates],
+        "candidate_cols": [j for _, j in candidates],
+        "tree_candidates": tree_candidates,
+        "num_neighbours": len(neighbours),
+        "neighbour_a": [a for a, _ in neighbours],
+        "neighbour_b": [b for _, b in neighbours],
+    }
+
+
+def instance_params(
+    model: Model,
+    num_rows: int,
+    num_cols: int,
+    num_tents_in_row: List[int],
+    num_tents_in_col: List[int],
+    tree_rows: List[int],
+    tree_cols: List[int],
+) -> Dict[str, Any]:
+    """Return the parameters of a model for the given trees and tent counts."""
+    if model == Model.PAIRS:
+        return pairs_params(
+            num_rows, num_cols, num_tents_in_row, num_tents_in_col, tree_rows, tree_cols
+        )
+    return {
+        "num_rows": num_rows,
+        "num_cols": num_cols,
+        "num_tents_in_row": num_tents_in_row,
+        "num_tents_in_col": num_tents_in_col,
+        "num_trees": len(tree_rows),
+        "tree_rows": tree_rows,
+        "tree_cols": tree_cols,
+    }
+
+
+def from_grid_params(model: Model, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the parameters of a model for an instance of the grid model."""
+    return instance_params(
+        model,
+        params["num_rows"],
+        params["num_cols"],
+        params["num_tents_in_row"],
+        params["num_tents_in_col"],
+        params["tree_rows"],
+        params["tree_cols"],
+    )
+
+
+def encode_solution(instance_params: Dict[str, Any], solution: Any) -> str:
+    """Encode the tents of a solution with the trees of an instance, as submitted.
+
+    The instance must give its trees, as the parameters of the grid model do.
+    """
+    trees = Grid(instance_params["num_rows"], instance_params["num_cols"])
+    for i, j in zip(instance_params["tree_rows"], instance_params["tree_cols"]):
+        # MiniZinc uses 1-based indexing
+        trees[i - 1, j - 1] = TREE
+    return (trees | Grid.from_rows(solution["tents"])).encode(ALPHABET)
+
 
 class CampsitesBot(Bot):
-    def play(self, size: Size, difficulty: Difficulty):
-        """Play a Campsites game."""
+    def play(self, size: Size, difficulty: Difficulty, model: Model = Model.GRID):
+        """Play a Campsites game.
+
+        Both models give tents of the same shape; the pairs model only places tents
+        next to the trees of the instance and pairs every tree with one of them.
+        """
         num_rows, num_cols, size_id = SIZE_DATA[size]
         difficulty_id = DIFFICULTY_IDS[difficulty]
 
-        new_game_url = "https://campsites.puzzlebaron.com/init.php"
-        print(f"Loading new game URL: {new_game_url} ...")
-        self.browser.get(new_game_url)
+        model_file = MODEL_FILES[model]
+        self.warm_up(model_file)
 
-        print(f"Setting puzzle size to: {str(size)} ...")
-        self.browser.select_by_value(
-            self.browser.find_element('select[name="sg"]'), str(size_id)
-        )
+        with self.span("load"):
+            new_game_url = "https://campsites.puzzlebaron.com/init.php"
+            logger.info("Loading new game URL: %s ...", new_game_url)
+            self.browser.get(new_game_url)
 
-        print(f"Setting puzzle difficulty to: {str(difficulty)} ...")
-        self.browser.select_by_value(
-            self.browser.find_element('select[name="sd"]'),
-            str(difficulty_id),
-        )
+            logger.info("Setting puzzle size to: %s ...", size)
+            self.browser.select_by_value(
+                self.browser.find_element('select[name="sg"]'), str(size_id)
+            )
 
-        print("Starting game ...")
-        self.browser.find_element('input[name="CreatePuzzle"]').click()
-        self.browser.find_element('input[name="submit"]').click()
-
-        initial_state = self.browser.find_invisible_element(
-            "div#savedgridstates"
-        ).get_attribute("innerText")
-        print(f"Extracted initial game state: {initial_state}")
-
-        tree_rows = []
-        tree_cols = []
-        for i, row in enumerate(sliced(initial_state, num_cols)):
-            for j, cell in enumerate(row):
-                if cell == "T":
-                    # MiniZinc uses 1-based indexing
-                    tree_rows.append(i + 1)
-                    tree_cols.append(j + 1)
-        print(f"Parsed state into tree rows: {tree_rows} and tree columns: {tree_cols}")
-
-        num_tents_in_row = [
-            int(self.browser.find_element(f"td#nr{i}").get_attribute("innerText"))
-            for i in range(num_rows)
-        ]
-        print(f"Extracted number of tents in each row: {num_tents_in_row}")
-
-        num_tents_in_col = [
-            int(self.browser.find_element(f"td#nb{j}").get_attribute("innerText"))
-            for j in range(num_cols)
-        ]
-        print(f"Extracted number of tents in each column: {num_tents_in_col}")
-
-        print("Solving problem instance ...")
-        model_file = Path(__file__).parent / "models" / "campsites.mzn"
-        instance_params = {
-            "num_rows": num_rows,
-            "num_cols": num_cols,
-            "num_tents_in_row": num_tents_in_row,
-            "num_tents_in_col": num_tents_in_col,
-            "num_trees": sum(num_tents_in_row),
-            "tree_rows": tree_rows,
-            "tree_cols": tree_cols,
-        }
-        result = self.solver.solve(model_file, instance_params)
-
-        final_state = []
-        for i in range(num_rows):
-            for j in range(num_cols):
-                if result["trees"][i][j]:
-                    final_state.append("T")
-                elif result["tents"][i][j]:
-                    final_state.append("C")
-                else:
-                    final_state.append(".")
-        solution = "".join(final_state)
-        print(f"Formatted solution: {solution}")
-
-        print("Submitting game ...")
-        self.browser.execute_script(
-            "document.getElementById('ans').setAttribute('value', arguments[0])",
-            solution,
-        )
-        self.browser.find_element("form#gameform").submit()
+            logger.info("Setting puzzle difficulty to: %s ...", difficulty)
+            self.browser.select_by_value(
+                self.browser.find_element('select[name="sd"]'),
+                str(difficulty_id),
+            )
+
+            logger.info("Starting game ...")
+            self.browser.find_element('input[name="CreatePuzzle"]').click()
+            self.browser.find_element('input[name="submit"]').click()
 
-        print("Verifying submission ...")
-        congrats = self.browser.find_element("div#container_left > h1.header_font")
-        assert congrats.get_attribute("innerText") == "Congratulations!"
+        with self.span("extract"):
+            saved_states = self.browser.find_invisible_element("div#savedgridstates")
+            if saved_states is None:
+                raise ValueError("failed to find initial game state")
+            initial_state = saved_states.get_attribute("innerText")
+            logger.debug("Extracted initial game state: %s", initial_state)
 
+            state = Grid.parse(initial_state, num_cols, ALPHABET)
+            # MiniZinc uses 1-based indexing
+            trees = [divmod(k, num_cols) for k in state.indices(TREE)]
+            tree_rows = [i + 1 for i, _ in trees]
+            tree_cols = [j + 1 for _, j in trees]
+            logger.debug(
+                "Parsed state into tree rows: %s and tree columns: %s",
+                tree_rows,
+                tree_cols,
+            )
 
-def parse_args():
+            num_tents = self.browser.read_many(
+                [f"td#nr{i}" for i in range(num_rows)]
+                + [f"td#nb{j}" for j in range(num_cols)]
+            )
+
+            num_tents_in_row = [int(n) for n in num_tents[:num_rows]]
+            logger.debug("Extracted number of tents in each row: %s", num_tents_in_row)
+
+            num_tents_in_col = [int(n) for n in num_tents[num_rows:]]
+            logger.debug(
+                "Extracted number of tents in each column: %s", num_tents_in_col
+            )
+
+        with self.span("solve", model=str(model)):
+            logger.info("Solving problem instance ...")
+            result = self.solve(
+                model_file,
+                instance_params(
+                    model,
+                    num_rows,
+                    num_cols,
+                    num_tents_in_row,
+                    num_tents_in_col,
+                    tree_rows,
+                    tree_cols,
+                ),
+                labels={"size": str(size), "difficulty": str(difficulty)},
+            )
+
+        with self.span("encode"):
+            # Tents are 0 or 1, so or-ing them with the trees gives every cell's value
+            solution = (state | Grid.from_rows(result["tents"])).encode(ALPHABET)
+            logger.debug("Formatted solution: %s", solution)
+
+        with self.span("submit"):
+            logger.info("Submitting game ...")
+            self.browser.execute_script(
+                "document.getElementById('ans').setAttribute('value', arguments[0])",
+                solution,
+            )
+            self.browser.find_element(
+                "form#gameform", condition=Condition.PRESENT
+            ).submit()
+
+        with self.span("verify"):
+            logger.info("Verifying submission ...")
+            congrats = self.browser.find_element(
+                "div#container_left > h1.header_font", condition=Condition.VISIBLE
+            )
+            assert congrats.get_attribute("innerText") == "Congratulations!"
+
+
+def parse_args(argv: Optional[List[str]] = None):
     """Parse command-line arguments."""
     parser = ArgumentParser(description="Play a Campsites game")
     parser.add_argument(
@@ -147,18 +288,93 @@ def parse_args():
         choices=list(Difficulty),
         help="Puzzle difficulty; default 'easy'",
     )
+    parser.add_argument(
+        "--model",
+        type=Model,
+        default=Model.GRID,
+        choices=list(Model),
+        help="MiniZinc model; default 'grid'",
+    )
+    parser.add_argument(
+        "--native",
+        action="store_true",
+        help="Solve with the native engine instead of MiniZinc",
+    )
+    parser.add_argument(
+        "--no-presolve",
+        action="store_true",
+        help="Pass the raw clues to MiniZinc without fixing forced cells first",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="SECONDS",
+        help="Give up on a solver after this many seconds",
+    )
+    parser.add_argument(
+        "--fallback",
+        nargs="+",
+        metavar="BACKEND",
+        help="MiniZinc solver tags and/or 'native' to try in turn within the budget",
+    )
     parser.add_argument(
         "--login", action="store_true", help="Login to Puzzle Baron account"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log board data and timings"
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="Quit without waiting for enter after the game",
+    )
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: Optional[List[str]] = None,
+    browser: Optional[Browser] = None,
+    solvers: Optional[Dict[str, Engine]] = None,
+):
+    """Play a Campsites game from the command line.
+
+    Warm MiniZinc solvers may be given by tag, e.g. by the daemon.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+    backends = args.fallback or ["native" if args.native else CampsitesBot.solver_tag]
+    # The native engine takes the parameters of the grid model, so the bot plays with
+    # the grid model if it is a backend, and the other backends convert its parameters
+    model = Model.GRID if "native" in backends else args.model
+    models = {
+        name: (MODEL_FILES[args.model], partial(from_grid_params, args.model))
+        for name in backends
+        if name != "native" and model != args.model
+    }
+    solver: Optional[Engine] = None
+    if args.fallback or args.budget is not None:
+        solver = FallbackSolver(
+            named_backends(backends, CampsitesEngine()), args.budget, models=models
+        )
+    elif args.native:
+        solver = CampsitesEngine()
+    else:
+        solver = (solvers or {}).get(CampsitesBot.solver_tag)
+    bot = CampsitesBot(
+        browser=browser,
+        solver=solver,
+        # The native engine ignores the cells fixed by presolving
+        presolve=not (args.no_presolve or "native" in backends),
+    )
+    try:
+        if args.login:
+            bot.login()
+        bot.play(args.size, args.difficulty, model)
+    finally:
+        bot.quit(prompt=not args.no_prompt)
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    bot = CampsitesBot()
-    if args.login:
-        bot.login()
-    bot.play(args.size, args.difficulty)
-
-    input("Press enter to quit: ")
-    bot.browser.quit()
+    main()
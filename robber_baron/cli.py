@@ -0,0 +1,62 @@
+from argparse import ArgumentParser, REMAINDER
+import importlib
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+# Map game names to the modules that play them; only the chosen module is imported
+GAMES = {
+    "campsites": "robber_baron.campsites",
+    "numbergrids": "robber_baron.numbergrids",
+    "sudoku": "robber_baron.sudoku",
+    "wordsearch": "robber_baron.wordsearch",
+    "wordtwist": "robber_baron.wordtwist",
+}
+
+# Map other commands to their modules
+COMMANDS = {
+    "daemon": "robber_baron.daemon",
+    "solve": "robber_baron.solve",
+}
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command-line arguments."""
+    parser = ArgumentParser(prog="robber-baron", description="Play a Puzzle Baron game")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Play in the browser of a running daemon; see 'robber-baron daemon'",
+    )
+    parser.add_argument("--socket", type=Path, help="Unix socket path of the daemon")
+    parser.add_argument(
+        "command", choices=[*GAMES, *COMMANDS], help="Game to play or command to run"
+    )
+    parser.add_argument(
+        "args", nargs=REMAINDER, help="Arguments for the command; see <command> --help"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Play a game or run a command from the command line."""
+    args = parse_args(argv)
+    if not args.daemon:
+        module = GAMES.get(args.command) or COMMANDS[args.command]
+        importlib.import_module(module).main(args.args)
+        return
+
+    from robber_baron.daemon import DEFAULT_SOCKET, request
+
+    if args.command not in GAMES:
+        raise ValueError(f"only games can be played by the daemon: {args.command}")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    response = request(
+        {"op": "play", "game": args.command, "args": args.args},
+        args.socket or DEFAULT_SOCKET,
+    )
+    logging.info("Played %s in %.2fs", args.command, response["seconds"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+from argparse import ArgumentParser
+import importlib
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from robber_baron import Bot, Browser, ConstraintSolver, Engine
+from robber_baron.cli import GAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / f"robber-baron-{os.getuid()}.sock"
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Games whose bots solve with MiniZinc, which take the daemon's warm solvers
+SOLVER_GAMES = {"campsites", "numbergrids", "sudoku"}
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """Return the resident memory of a process and its descendants, in megabytes.
+
+    Returns 0 where /proc is not available.
+    """
+    children: Dict[int, List[int]] = {}
+    for entry in Path("/proc").glob("[0-9]*"):
+        try:
+            # The command name may contain spaces, so split after its closing bracket
+            fields = (entry / "stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+
+    pages = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            pages += int(
+                (Path("/proc") / str(current) / "statm").read_text().split()[1]
+            )
+        except (OSError, IndexError):
+            continue
+        stack.extend(children.get(current, []))
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class WarmDriver:
+    def __init__(
+        self,
+        login: bool = False,
+        intercept: bool = False,
+        max_rss_mb: float = 2048,
+    ):
+        """Keep a browser running between games, restarting it when it crashes or grows.
+
+        With interception, the browser uses selenium-wire, as Word Search requires,
+        keeping captured requests in memory up to the same bound as Word Search.
+        """
+        self._login = login
+        self._intercept = intercept
+        self._max_rss_mb = max_rss_mb
+        self._browser: Optional[Browser] = None
+        self.restarts = 0
+
+    def _start(self) -> Browser:
+        """Start a browser, logging in if configured."""
+        start = time.perf_counter()
+        if self._intercept:
+            from seleniumwire import webdriver as wire_webdriver
+
+            from robber_baron.wordsearch import SELENIUMWIRE_OPTIONS
+
+            driver = wire_webdriver.Chrome(seleniumwire_options=SELENIUMWIRE_OPTIONS)
+        else:
+            from selenium import webdriver
+
+            driver = webdriver.Chrome()
+        browser = Browser(driver=driver)
+        if self._login:
+            Bot(browser=browser).login()
+        logger.info("Started browser in %.2fs", time.perf_counter() - start)
+        return browser
+
+    def rss_mb(self) -> float:
+        """Return the resident memory of the driver and browser processes."""
+        pid = self._browser.service_pid() if self._browser is not None else None
+        return process_tree_rss_mb(pid) if pid is not None else 0.0
+
+    def browser(self) -> Browser:
+        """Return a healthy browser, restarting it if it crashed or uses too much memory."""
+        if self._browser is not None:
+            if not self._browser.is_alive():
+                logger.warning("Browser stopped responding; restarting it ...")
+                self.restart()
+            elif self.rss_mb() > self._max_rss_mb:
+                logger.warning(
+                    "Browser exceeded %.0fMB; restarting it ...", self._max_rss_mb
+                )
+                self.restart()
+        if self._browser is None:
+            self._browser = self._start()
+        return self._browser
+
+    def restart(self):
+        """Quit the browser, so that the next game starts a new one."""
+        self.quit()
+        self.restarts += 1
+
+    def quit(self):
+        """Quit the browser, ignoring errors from a crashed driver."""
+        if self._browser is not None:
+            try:
+                self._browser.quit()
+            except Exception:
+                pass
+            self._browser = None
+
+
+def warm_up_solvers(solver_tags: List[str]) -> Dict[str, Engine]:
+    """Look up MiniZinc solvers and parse every model, so that games solve sooner.
+
+    Returns the solvers that were warmed up, by tag.
+    """
+    solvers: Dict[str, Engine] = {}
+    for tag in solver_tags:
+        try:
+            solver = ConstraintSolver(tag)
+            for model_file in sorted(MODELS_DIR.glob("*.mzn")):
+                solver.prepare(model_file)
+        except Exception as e:
+            logger.warning("Failed to warm up solver %s: %s", tag, e)
+            continue
+        solvers[tag] = solver
+    return solvers
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        """Answer a request, sent as a JSON line, with a JSON line."""
+        try:
+            response = self.server.answer(json.loads(self.rfile.readline()))
+        except Exception as e:
+            logger.exception("Failed to answer request")
+            response = {"ok": False, "error": repr(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class Daemon(socketserver.UnixStreamServer):
+    def __init__(
+        self,
+        socket_path: Path,
+        driver: WarmDriver,
+        solvers: Optional[Dict[str, Engine]] = None,
+    ):
+        """Create a daemon that plays games in a warm browser, one request at a time.
+
+        Games that solve with MiniZinc are given the warm solvers, by tag. Raises
+        `RuntimeError` if another daemon is listening on the socket.
+        """
+        if socket_path.exists():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                try:
+                    client.connect(str(socket_path))
+                except OSError:
+                    # Left behind by a daemon that did not stop cleanly
+                    socket_path.unlink()
+                else:
+                    raise RuntimeError(f"a daemon is already running on {socket_path}")
+        super().__init__(str(socket_path), _Handler)
+        self.socket_path = socket_path
+        self.driver = driver
+        self.solvers = solvers or {}
+
+    def answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a request.
+
+        Operations are 'ping', 'session' (to attach with `Browser.attach`), 'play'
+        (with a game and its command-line arguments), 'restart' and 'stop'.
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "rss_mb": self.driver.rss_mb()}
+        if op == "session":
+            return {"ok": True, **self.driver.browser().session()}
+        if op == "play":
+            game = request["game"]
+            if game not in GAMES:
+                raise ValueError(f"unknown game: {game}")
+            start = time.perf_counter()
+            browser = self.driver.browser()
+            kwargs: Dict[str, Any] = {"browser": browser}
+            if game in SOLVER_GAMES:
+                kwargs["solvers"] = self.solvers
+            try:
+                importlib.import_module(GAMES[game]).main(
+                    [*request.get("args", []), "--no-prompt"], **kwargs
+                )
+            finally:
+                # E.g. Word Search's scopes must not apply to the next game
+                browser.stop_capture()
+            return {"ok": True, "seconds": time.perf_counter() - start}
+        if op == "restart":
+            self.driver.restart()
+            self.driver.browser()
+            return {"ok": True, "restarts": self.driver.restarts}
+        if op == "stop":
+            # shutdown() waits for this request to finish, so it must not block it
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        raise ValueError(f"unknown operation: {op}")
+
+    def server_close(self):
+        """Quit the browser and remove the socket."""
+        super().server_close()
+        self.driver.quit()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def request(payload: Dict[str, Any], socket_path: Path = DEFAULT_SOCKET) -> Any:
+    """Send a request to the daemon, raising an error if it fails."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with client.makefile("r", encoding="utf-8") as f:
+            response = json.loads(f.readline())
+    if not response.pop("ok"):
+        raise RuntimeError(f"daemon request failed: {response['error']}")
+    return response
+
+
+def attach(socket_path: Path = DEFAULT_SOCKET) -> Browser:
+    """Attach to the daemon's browser session."""
+    return Browser.attach(**request({"op": "session"}, socket_path))
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Keep a warm browser and solvers for games")
+    parser.add_argument(
+        "--socket", type=Path, default=DEFAULT_SOCKET, help="Unix socket path"
+    )
+    parser.add_argument(
+        "--solvers",
+        nargs="*",
+        default=["gecode", "chuffed"],
+        help="MiniZinc solver tags to warm up; default 'gecode chuffed'",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=2048,
+        help="Restart the browser when it uses more memory; default 2048",
+    )
+    parser.add_argument(
+        "--intercept",
+        action="store_true",
+        help="Intercept requests with selenium-wire, as Word Search requires",
+    )
+    parser.add_argument(
+        "--login", action="store_true", help="Login to Puzzle Baron account"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the daemon from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    driver = WarmDriver(args.login, args.intercept, args.max_rss_mb)
+    solvers = warm_up_solvers(args.solvers)
+    driver.browser()
+
+    with Daemon(args.socket, driver, solvers) as daemon:
+        logger.info("Listening on: %s", args.socket)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Tuple
+
+# DFA inputs, numbered as MiniZinc's `regular` expects
+EMPTY = 1
+FILLED = 2
+
+
+def line_dfa(clues: List[int]) -> Tuple[List[List[int]], List[int]]:
+    """Build a DFA that accepts the lines of cells matching the clues of a line.
+
+    Returns the transitions, where transitions[q - 1][s - 1] is the state reached from
+    state q on input s and 0 is the failure state, and the accepting states. The start
+    state is 1. Zero clues, used for padding, are ignored.
+    """
+    clues = [c for c in clues if c]
+    # State 1 skips the empty cells before the first line
+    transitions = [[1, 0]]
+    for k, length in enumerate(clues):
+        # One state per filled cell, each entered from the previous state
+        for _ in range(length):
+            transitions.append([0, 0])
+            transitions[-2][FILLED - 1] = len(transitions)
+        # One state that skips the empty cells after the line; only the last line
+        # may end the row or column without a gap
+        transitions.append([0, 0])
+        transitions[-2][EMPTY - 1] = len(transitions)
+        transitions[-1][EMPTY - 1] = len(transitions)
+        if k == len(clues) - 1:
+            return transitions, [len(transitions) - 1, len(transitions)]
+    return transitions, [1]
+
+
+def regular_params(
+    grid_size: int, row_clues: List[List[int]], col_clues: List[List[int]]
+) -> Dict[str, Any]:
+    """Return the parameters of the `regular` Numbergrids model.
+
+    Lines 1 to grid_size are the rows and the rest are the columns. Every DFA is padded
+    to the same number of states with failing states, which are never reached.
+    """
+    dfas = [line_dfa(clues) for clues in row_clues + col_clues]
+    num_states = max(len(transitions) for transitions, _ in dfas)
+    return {
+        "grid_size": grid_size,
+        "num_states": num_states,
+        "transitions": [
+            transitions + [[0, 0]] * (num_states - len(transitions))
+            for transitions, _ in dfas
+        ],
+        # Every DFA accepts in one or two states; 0 pads the second
+        "accepting": [accepting + [0] * (2 - len(accepting)) for _, accepting in dfas],
+    }
@@ -0,0 +1,93 @@
+from typing import Iterator, List, Optional
+import zlib
+
+# Size of the compressed chunks fed to decompressors, in bytes
+CHUNK_BYTES = 64 * 1024
+
+# Size of the chunks fed to Brotli bindings that cannot bound their output, in bytes
+UNBOUNDED_CHUNK_BYTES = 1024
+
+
+def _chunks(body: bytes, size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Split a body into chunks."""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def _inflate(body: bytes, wbits: int, max_bytes: Optional[int]) -> bytes:
+    """Decompress a zlib, gzip or raw deflate stream, stopping past the size cap."""
+    decompressor = zlib.decompressobj(wbits)
+    output: List[bytes] = []
+    size = 0
+    for chunk in _chunks(body):
+        while chunk:
+            # Never inflate more than one byte past the cap
+            limit = 0 if max_bytes is None else max_bytes - size + 1
+            data = decompressor.decompress(chunk, limit)
+            output.append(data)
+            size += len(data)
+            if max_bytes is not None and size > max_bytes:
+                raise ValueError(f"decoded body exceeds {max_bytes} bytes")
+            chunk = decompressor.unconsumed_tail
+    output.append(decompressor.flush())
+    return b"".join(output)
+
+
+def _unbrotli(body: bytes, max_bytes: Optional[int]) -> bytes:
+    """Decompress a Brotli stream, stopping past the size cap.
+
+    The output of each call is bounded by what is left of the cap, so that a small
+    body cannot expand far past it. Bindings older than Brotli 1.2 cannot bound
+    their output, so they are fed small chunks, with the cap checked after each.
+    """
+    import brotli
+
+    decompressor = brotli.Decompressor()
+    bounded = hasattr(decompressor, "can_accept_more_data")
+    output: List[bytes] = []
+    size = 0
+    for chunk in _chunks(body, CHUNK_BYTES if bounded else UNBOUNDED_CHUNK_BYTES):
+        while True:
+            if max_bytes is None or not bounded:
+                data = decompressor.process(chunk)
+            else:
+                # Never decompress much more than one byte past the cap
+                data = decompressor.process(
+                    chunk, output_buffer_limit=max_bytes - size + 1
+                )
+            output.append(data)
+            size += len(data)
+            if max_bytes is not None and size > max_bytes:
+                raise ValueError(f"decoded body exceeds {max_bytes} bytes")
+            # Output left over from a bounded call is drained with empty input
+            if not bounded or decompressor.can_accept_more_data():
+                break
+            chunk = b""
+    return b"".join(output)
+
+
+def decode_body(
+    body: bytes, content_encoding: Optional[str], max_bytes: Optional[int] = None
+) -> bytes:
+    """Undo the Content-Encoding of a body, e.g. 'gzip' or 'br'.
+
+    Encodings are undone in reverse order, a chunk at a time, so that decoding stops
+    as soon as a body grows past `max_bytes`.
+    """
+    encodings = [e.strip().lower() for e in (content_encoding or "").split(",")]
+    for encoding in reversed(encodings):
+        if encoding in ("", "identity"):
+            continue
+        if encoding in ("gzip", "x-gzip"):
+            body = _inflate(body, 16 + zlib.MAX_WBITS, max_bytes)
+        elif encoding == "deflate":
+            # Deflate is meant to be zlib-wrapped, but some servers send raw streams
+            wbits = zlib.MAX_WBITS if body[:1] == b"\x78" else -zlib.MAX_WBITS
+            body = _inflate(body, wbits, max_bytes)
+        elif encoding == "br":
+            body = _unbrotli(body, max_bytes)
+        else:
+            raise ValueError(f"unsupported content encoding: {encoding}")
+    if max_bytes is not None and len(body) > max_bytes:
+        raise ValueError(f"decoded body exceeds {max_bytes} bytes")
+    return body
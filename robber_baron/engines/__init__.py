@@ -0,0 +1,28 @@
+from typing import Callable, Dict, Union
+
+from robber_baron.engines.campsites import CampsitesEngine
+from robber_baron.engines.nonogram import NonogramEngine
+from robber_baron.engines.sudoku import SudokuEngine
+from robber_baron.engines.wordtwist import Dawg, WordTwistSolver
+
+# Map model file names to the engines that solve them in-process; engines ignore the
+# cells fixed for presolved models
+MODEL_ENGINES: Dict[
+    str, Callable[[], Union[CampsitesEngine, NonogramEngine, SudokuEngine]]
+] = {
+    "campsites.mzn": CampsitesEngine,
+    "campsites_presolved.mzn": CampsitesEngine,
+    "numbergrids.mzn": NonogramEngine,
+    "numbergrids_presolved.mzn": NonogramEngine,
+    "sudoku.mzn": SudokuEngine,
+    "sudoku_sized.mzn": SudokuEngine,
+}
+
+__all__ = [
+    "CampsitesEngine",
+    "Dawg",
+    "NonogramEngine",
+    "SudokuEngine",
+    "WordTwistSolver",
+    "MODEL_ENGINES",
+]
@@ -0,0 +1,319 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class _State:
+    def __init__(self, blocked: int, num_trees: int):
+        """Create a search state with no tents placed."""
+        self.tents = 0
+        self.blocked = blocked
+        # The tent cell matched to each tree, or -1 if the tree is unmatched
+        self.match = [-1] * num_trees
+
+    def copy(self) -> "_State":
+        """Return a copy of the state."""
+        state = _State.__new__(_State)
+        state.tents = self.tents
+        state.blocked = self.blocked
+        state.match = self.match.copy()
+        return state
+
+
+class CampsitesSolver:
+    def __init__(
+        self,
+        num_rows: int,
+        num_cols: int,
+        num_tents_in_row: List[int],
+        num_tents_in_col: List[int],
+        trees: List[Tuple[int, int]],
+    ):
+        """Create a solver for a board with zero-based (row, column) tree positions."""
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.trees = trees
+
+        # Cells are numbered row by row, so every mask below is a flat bitmask
+        self.lines: List[Tuple[List[int], int]] = [
+            ([i * num_cols + j for j in range(num_cols)], num_tents_in_row[i])
+            for i in range(num_rows)
+        ] + [
+            ([i * num_cols + j for i in range(num_rows)], num_tents_in_col[j])
+            for j in range(num_cols)
+        ]
+
+        self.neighbours = [0] * (num_rows * num_cols)
+        for i in range(num_rows):
+            for j in range(num_cols):
+                for di in (-1, 0, 1):
+                    for dj in (-1, 0, 1):
+                        i2, j2 = i + di, j + dj
+                        if (di or dj) and 0 <= i2 < num_rows and 0 <= j2 < num_cols:
+                            self.neighbours[i * num_cols + j] |= 1 << (
+                                i2 * num_cols + j2
+                            )
+
+        tree_mask = sum(1 << (i * num_cols + j) for i, j in trees)
+        self.tree_cells: List[List[int]] = []
+        for i, j in trees:
+            cells = [
+                (i + di) * num_cols + (j + dj)
+                for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= i + di < num_rows and 0 <= j + dj < num_cols
+            ]
+            self.tree_cells.append([c for c in cells if not (tree_mask >> c) & 1])
+        candidates = 0
+        self.cell_trees: List[List[int]] = [[] for _ in range(num_rows * num_cols)]
+        for tree, cells in enumerate(self.tree_cells):
+            for cell in cells:
+                candidates |= 1 << cell
+                self.cell_trees[cell].append(tree)
+        self.full = (1 << (num_rows * num_cols)) - 1
+        self.initial_blocked = self.full & ~candidates
+
+    def _place(self, state: _State, cell: int) -> bool:
+        """Place a tent, blocking its neighbours; return false on a contradiction."""
+        bit = 1 << cell
+        if state.blocked & bit:
+            return False
+        state.tents |= bit
+        if state.tents & self.neighbours[cell]:
+            return False
+        state.blocked |= self.neighbours[cell]
+        return True
+
+    def _propagate_line(self, state: _State, cells: List[int], count: int) -> int:
+        """Apply a row or column count; return 1 on progress, 0 if none, -1 on failure."""
+        needed = count
+        runs: List[List[int]] = [[]]
+        for cell in cells:
+            bit = 1 << cell
+            if state.tents & bit:
+                needed -= 1
+                runs.append([])
+            elif state.blocked & bit:
+                runs.append([])
+            else:
+                runs[-1].append(cell)
+        runs = [run for run in runs if run]
+
+        # Adjacent cells in a line cannot both hold tents
+        capacity = sum((len(run) + 1) // 2 for run in runs)
+        if needed < 0 or needed > capacity:
+            return -1
+        if not runs:
+            return 0
+        if needed == 0:
+            for run in runs:
+                for cell in run:
+                    state.blocked |= 1 << cell
+            return 1
+        if needed == capacity:
+            progress = 0
+            for run in runs:
+                if len(run) % 2:
+                    # An odd run must alternate tent, gap, tent, ...
+                    for k, cell in enumerate(run):
+                        if k % 2:
+                            state.blocked |= 1 << cell
+                        elif not self._place(state, cell):
+                            return -1
+                    progress = 1
+            return progress
+        return 0
+
+    def _augment(
+        self, state: _State, tree: int, owners: Dict[int, int], seen: List[bool]
+    ) -> bool:
+        """Find an augmenting path from an unmatched tree to an available cell."""
+        for cell in self.tree_cells[tree]:
+            if (state.blocked >> cell) & 1 or seen[cell]:
+                continue
+            seen[cell] = True
+            owner = owners.get(cell)
+            if owner is None or self._augment(state, owner, owners, seen):
+                state.match[tree] = cell
+                owners[cell] = tree
+                return True
+        return False
+
+    def _augment_tent(self, cell: int, owners: Dict[int, int], seen: Set[int]) -> bool:
+        """Find an augmenting path from an unmatched tent to a free tree."""
+        for tree in self.cell_trees[cell]:
+            if tree in seen:
+                continue
+            seen.add(tree)
+            owner = owners.get(tree)
+            if owner is None or self._augment_tent(owner, owners, seen):
+                owners[tree] = cell
+                return True
+        return False
+
+    def _propagate_matching(self, state: _State) -> int:
+        """Repair the tree-to-tent matching; return 1 on progress, 0 if none, -1 on failure."""
+        # Only trees whose matched cell has since been blocked need a new match
+        owners: Dict[int, int] = {}
+        for tree, cell in enumerate(state.match):
+            if cell >= 0 and (state.blocked >> cell) & 1:
+                state.match[tree] = -1
+            elif cell >= 0:
+                owners[cell] = tree
+        for tree, cell in enumerate(state.match):
+            if cell < 0:
+                seen = [False] * (self.num_rows * self.num_cols)
+                if not self._augment(state, tree, owners, seen):
+                    return -1
+
+        # Every placed tent also needs its own tree; by the Mendelsohn-Dulmage
+        # theorem, both sides can then be matched at once
+        tent_owners: Dict[int, int] = {}
+        tents = state.tents
+        while tents:
+            bit = tents & -tents
+            tents ^= bit
+            if not self._augment_tent(bit.bit_length() - 1, tent_owners, set()):
+                return -1
+
+        # A tree with a single available cell forces a tent there
+        progress = 0
+        for cells in self.tree_cells:
+            available = [c for c in cells if not (state.blocked >> c) & 1]
+            if len(available) == 1 and not (state.tents >> available[0]) & 1:
+                if not self._place(state, available[0]):
+                    return -1
+                progress = 1
+        return progress
+
+    def propagate(self, state: _State) -> bool:
+        """Propagate line counts and the matching until a fixpoint."""
+        while True:
+            progress = 0
+            for cells, count in self.lines:
+                result = self._propagate_line(state, cells, count)
+                if result < 0:
+                    return False
+                progress |= result
+            result = self._propagate_matching(state)
+            if result < 0:
+                return False
+            if not progress and not result:
+                return True
+
+    def _select_cell(self, state: _State) -> Optional[int]:
+        """Select an undecided cell next to the tree with the fewest options."""
+        best = None
+        best_count = 0
+        for cells in self.tree_cells:
+            open_cells = [
+                c for c in cells if not ((state.blocked | state.tents) >> c) & 1
+            ]
+            if open_cells and (best is None or len(open_cells) < best_count):
+                best = open_cells[0]
+                best_count = len(open_cells)
+        if best is not None:
+            return best
+        undecided = self.full & ~(state.blocked | state.tents)
+        return (undecided & -undecided).bit_length() - 1 if undecided else None
+
+    def _probe(self, state: _State) -> Optional[bool]:
+        """Decide every cell for which one choice leads to a contradiction.
+
+        Returns true if progress was made, false if none was, and none if the state
+        itself is contradictory.
+        """
+        progress = False
+        undecided = self.full & ~(state.blocked | state.tents)
+        while undecided:
+            bit = undecided & -undecided
+            undecided ^= bit
+            if (state.blocked | state.tents) & bit:
+                continue
+            cell = bit.bit_length() - 1
+            with_tent = state.copy()
+            if not (self._place(with_tent, cell) and self.propagate(with_tent)):
+                state.blocked |= bit
+            else:
+                without = state.copy()
+                without.blocked |= bit
+                if self.propagate(without):
+                    continue
+                if not self._place(state, cell):
+                    return None
+            if not self.propagate(state):
+                return None
+            progress = True
+        return progress
+
+    def deduce(self) -> Optional[Tuple[int, int]]:
+        """Propagate and probe without search; return the tent and blocked bitmasks,
+        or none if the board has no solution.
+
+        A board whose cells are all decided this way has a unique solution.
+        """
+        state = _State(self.initial_blocked, len(self.trees))
+        if not self.propagate(state):
+            return None
+        while True:
+            progress = self._probe(state)
+            if progress is None:
+                return None
+            if not progress:
+                return state.tents, state.blocked
+
+    def solve(self) -> Optional[int]:
+        """Solve the board; return the tent bitmask, or none if there is no solution."""
+        state = _State(self.initial_blocked, len(self.trees))
+        if not self.propagate(state):
+            return None
+
+        stack = [state]
+        while stack:
+            state = stack.pop()
+            cell = self._select_cell(state)
+            if cell is None:
+                return state.tents
+
+            without = state.copy()
+            without.blocked |= 1 << cell
+            if self.propagate(without):
+                stack.append(without)
+            with_tent = state.copy()
+            if self._place(with_tent, cell) and self.propagate(with_tent):
+                stack.append(with_tent)
+        return None
+
+
+class CampsitesEngine:
+    def solve(self, model_file: Path, instance_params: Dict[str, Any]) -> Any:
+        """Solve an instance of the Campsites model without MiniZinc.
+
+        The model file is accepted for compatibility with `ConstraintSolver` and ignored.
+        """
+        num_rows = instance_params["num_rows"]
+        num_cols = instance_params["num_cols"]
+        # MiniZinc uses 1-based indexing
+        trees = [
+            (i - 1, j - 1)
+            for i, j in zip(instance_params["tree_rows"], instance_params["tree_cols"])
+        ]
+        solver = CampsitesSolver(
+            num_rows,
+            num_cols,
+            instance_params["num_tents_in_row"],
+            instance_params["num_tents_in_col"],
+            trees,
+        )
+        tents = solver.solve()
+        if tents is None:
+            raise ValueError("failed to find solution")
+
+        tree_set = set(trees)
+        return {
+            "trees": [
+                [(i, j) in tree_set for j in range(num_cols)] for i in range(num_rows)
+            ],
+            "tents": [
+                [bool((tents >> (i * num_cols + j)) & 1) for j in range(num_cols)]
+                for i in range(num_rows)
+            ],
+        }
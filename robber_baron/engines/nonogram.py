@@ -0,0 +1,320 @@
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+LineCache = Dict[Tuple[Tuple[int, ...], int, int, int], Optional[Tuple[int, int]]]
+
+
+def _prefix_fits(
+    clues: Tuple[int, ...], is_filled: List[bool], free: List[int]
+) -> List[List[bool]]:
+    """Return a table where [b][i] is true iff blocks 0..b-1 fit in cells [0, i)."""
+    size = len(free) - 1
+    fits = [[False] * (size + 1) for _ in range(len(clues) + 1)]
+    row = fits[0]
+    row[0] = True
+    for i in range(1, size + 1):
+        row[i] = row[i - 1] and not is_filled[i - 1]
+    for b in range(1, len(clues) + 1):
+        length = clues[b - 1]
+        row, prev = fits[b], fits[b - 1]
+        for i in range(length, size + 1):
+            if row[i - 1] and not is_filled[i - 1]:
+                row[i] = True
+                continue
+            s = i - length
+            if free[s] < length:
+                continue
+            if b == 1:
+                row[i] = prev[s]
+            else:
+                row[i] = s >= 1 and not is_filled[s - 1] and prev[s - 1]
+    return fits
+
+
+def _suffix_fits(
+    clues: Tuple[int, ...], is_filled: List[bool], free: List[int]
+) -> List[List[bool]]:
+    """Return a table where [b][i] is true iff blocks b..k-1 fit in cells [i, n)."""
+    size = len(free) - 1
+    k = len(clues)
+    fits = [[False] * (size + 2) for _ in range(k + 1)]
+    row = fits[k]
+    row[size] = True
+    for i in range(size - 1, -1, -1):
+        row[i] = row[i + 1] and not is_filled[i]
+    for b in range(k - 1, -1, -1):
+        length = clues[b]
+        row, nxt = fits[b], fits[b + 1]
+        for i in range(size - length, -1, -1):
+            if row[i + 1] and not is_filled[i]:
+                row[i] = True
+                continue
+            if free[i] < length:
+                continue
+            e = i + length
+            if b == k - 1:
+                row[i] = nxt[e]
+            else:
+                row[i] = e < size and not is_filled[e] and nxt[e + 1]
+    return fits
+
+
+def _solve_line(
+    clues: Tuple[int, ...], size: int, filled: int, empty: int
+) -> Optional[Tuple[int, int]]:
+    """Return the (filled, empty) masks of every cell forced by a line's clues.
+
+    Bit j of each mask corresponds to cell j of the line. Returns none if the known
+    cells are inconsistent with the clues. The solver is exact: a cell is fixed iff
+    it takes the same value in every placement of the blocks.
+    """
+    k = len(clues)
+    is_filled = [bool((filled >> j) & 1) for j in range(size)] + [False]
+
+    # free[i]: number of consecutive cells from i that are not known to be empty
+    free = [0] * (size + 1)
+    for i in range(size - 1, -1, -1):
+        free[i] = 0 if (empty >> i) & 1 else free[i + 1] + 1
+
+    # In both tables, cells outside the placed blocks are empty
+    prefix = _prefix_fits(clues, is_filled, free)
+    if not prefix[k][size]:
+        return None
+    suffix = _suffix_fits(clues, is_filled, free)
+
+    can_be_empty = 0
+    for b in range(k + 1):
+        pre, suf = prefix[b], suffix[b]
+        for j in range(size):
+            if pre[j] and suf[j + 1] and not is_filled[j]:
+                can_be_empty |= 1 << j
+
+    can_be_filled = 0
+    for b, length in enumerate(clues):
+        block = (1 << length) - 1
+        pre, suf = prefix[b], suffix[min(b + 1, k)]
+        for s in range(size - length + 1):
+            if free[s] < length:
+                continue
+            e = s + length
+            if b == 0:
+                left = pre[s]
+            else:
+                left = s >= 1 and not is_filled[s - 1] and pre[s - 1]
+            if not left:
+                continue
+            if b == k - 1:
+                right = suf[e]
+            else:
+                right = e < size and not is_filled[e] and suf[e + 1]
+            if right:
+                can_be_filled |= block << s
+
+    full = (1 << size) - 1
+    return full & ~can_be_empty, full & ~can_be_filled
+
+
+class _Grid:
+    def __init__(self, size: int):
+        """Create an unsolved grid, stored as filled/empty bitmasks per row and column."""
+        self.size = size
+        self.row_filled = [0] * size
+        self.row_empty = [0] * size
+        self.col_filled = [0] * size
+        self.col_empty = [0] * size
+
+    def copy(self) -> "_Grid":
+        """Return a copy of the grid."""
+        grid = _Grid.__new__(_Grid)
+        grid.size = self.size
+        grid.row_filled = self.row_filled.copy()
+        grid.row_empty = self.row_empty.copy()
+        grid.col_filled = self.col_filled.copy()
+        grid.col_empty = self.col_empty.copy()
+        return grid
+
+    def unknown(self) -> Optional[Tuple[int, int]]:
+        """Return an unknown cell in the most constrained row, or none if solved."""
+        full = (1 << self.size) - 1
+        best = None
+        best_known = -1
+        for i in range(self.size):
+            known = self.row_filled[i] | self.row_empty[i]
+            if known != full:
+                count = bin(known).count("1")
+                if count > best_known:
+                    best = i
+                    best_known = count
+        if best is None:
+            return None
+        known = self.row_filled[best] | self.row_empty[best]
+        free = ~known & full
+        return best, (free & -free).bit_length() - 1
+
+    def set(self, i: int, j: int, value: bool):
+        """Fix the cell at row i, column j."""
+        if value:
+            self.row_filled[i] |= 1 << j
+            self.col_filled[j] |= 1 << i
+        else:
+            self.row_empty[i] |= 1 << j
+            self.col_empty[j] |= 1 << i
+
+
+class NonogramSolver:
+    def __init__(self, row_clues: List[List[int]], col_clues: List[List[int]]):
+        """Create a solver for the given row and column clues; zero clues are ignored."""
+        if len(row_clues) != len(col_clues):
+            raise ValueError("grid must be square")
+        self.size = len(row_clues)
+        self.row_clues = [tuple(c for c in clues if c) for clues in row_clues]
+        self.col_clues = [tuple(c for c in clues if c) for clues in col_clues]
+        self._cache: LineCache = {}
+
+    def _line(
+        self, clues: Tuple[int, ...], filled: int, empty: int
+    ) -> Optional[Tuple[int, int]]:
+        """Solve a line, memoizing the result across propagation and probing."""
+        key = (clues, self.size, filled, empty)
+        if key not in self._cache:
+            self._cache[key] = _solve_line(clues, self.size, filled, empty)
+        return self._cache[key]
+
+    def propagate(self, grid: _Grid, dirty: Optional[List[int]] = None) -> bool:
+        """Solve lines until a fixpoint; return false on a contradiction.
+
+        Lines are numbered 0..n-1 for rows and n..2n-1 for columns. Only lines in
+        `dirty` (every line by default) and lines crossing newly fixed cells are solved.
+        """
+        n = self.size
+        queue: Deque[int] = deque(range(2 * n) if dirty is None else dirty)
+        queued = [False] * (2 * n)
+        for line in queue:
+            queued[line] = True
+
+        while queue:
+            line = queue.popleft()
+            queued[line] = False
+            if line < n:
+                i = line
+                filled, empty = grid.row_filled[i], grid.row_empty[i]
+                solved = self._line(self.row_clues[i], filled, empty)
+                if solved is None:
+                    return False
+                new_filled, new_empty = solved[0] & ~filled, solved[1] & ~empty
+                grid.row_filled[i] |= new_filled
+                grid.row_empty[i] |= new_empty
+                changed = new_filled | new_empty
+                while changed:
+                    bit = changed & -changed
+                    changed ^= bit
+                    j = bit.bit_length() - 1
+                    if new_filled & bit:
+                        grid.col_filled[j] |= 1 << i
+                    else:
+                        grid.col_empty[j] |= 1 << i
+                    if not queued[n + j]:
+                        queued[n + j] = True
+                        queue.append(n + j)
+            else:
+                j = line - n
+                filled, empty = grid.col_filled[j], grid.col_empty[j]
+                solved = self._line(self.col_clues[j], filled, empty)
+                if solved is None:
+                    return False
+                new_filled, new_empty = solved[0] & ~filled, solved[1] & ~empty
+                grid.col_filled[j] |= new_filled
+                grid.col_empty[j] |= new_empty
+                changed = new_filled | new_empty
+                while changed:
+                    bit = changed & -changed
+                    changed ^= bit
+                    i = bit.bit_length() - 1
+                    if new_filled & bit:
+                        grid.row_filled[i] |= 1 << j
+                    else:
+                        grid.row_empty[i] |= 1 << j
+                    if not queued[i]:
+                        queued[i] = True
+                        queue.append(i)
+        return True
+
+    def _assume(self, grid: _Grid, i: int, j: int, value: bool) -> Optional[_Grid]:
+        """Return a propagated copy of the grid with a cell fixed, or none if invalid."""
+        child = grid.copy()
+        child.set(i, j, value)
+        return child if self.propagate(child, [i, self.size + j]) else None
+
+    def _probe(self, grid: _Grid) -> Optional[bool]:
+        """Fix every cell for which one value leads to a contradiction.
+
+        Returns true if progress was made, false if none was, and none if the grid
+        itself is contradictory.
+        """
+        n = self.size
+        progress = False
+        for i in range(n):
+            for j in range(n):
+                if ((grid.row_filled[i] | grid.row_empty[i]) >> j) & 1:
+                    continue
+                for value in (True, False):
+                    if self._assume(grid, i, j, value) is None:
+                        grid.set(i, j, not value)
+                        if not self.propagate(grid, [i, n + j]):
+                            return None
+                        progress = True
+                        break
+        return progress
+
+    def solutions(self) -> Iterator[List[List[bool]]]:
+        """Yield every solution of the puzzle."""
+        grid = _Grid(self.size)
+        if not self.propagate(grid):
+            return
+
+        # Probe when propagation stalls, then fall back to depth-first search
+        stack = [grid]
+        while stack:
+            grid = stack.pop()
+            while True:
+                progress = self._probe(grid)
+                if not progress:
+                    break
+            if progress is None:
+                continue
+
+            cell = grid.unknown()
+            if cell is None:
+                yield [
+                    [bool((grid.row_filled[i] >> j) & 1) for j in range(self.size)]
+                    for i in range(self.size)
+                ]
+                continue
+            i, j = cell
+            for value in (False, True):
+                child = self._assume(grid, i, j, value)
+                if child is not None:
+                    stack.append(child)
+
+    def solve(self) -> Optional[List[List[bool]]]:
+        """Solve the puzzle; return none if it has no solution."""
+        return next(self.solutions(), None)
+
+
+class NonogramEngine:
+    def solve(self, model_file: Path, instance_params: Dict[str, Any]) -> Any:
+        """Solve an instance of the Numbergrids model without MiniZinc.
+
+        The model file is accepted for compatibility with `ConstraintSolver` and ignored.
+        """
+        grid_size = instance_params["grid_size"]
+        row_clues = instance_params["row_clues"]
+        col_clues = instance_params["col_clues"]
+        if len(row_clues) != grid_size or len(col_clues) != grid_size:
+            raise ValueError(f"expected {grid_size} row and column clues")
+
+        solution = NonogramSolver(row_clues, col_clues).solve()
+        if solution is None:
+            raise ValueError("failed to find solution")
+        return {"grid": solution}
@@ -0,0 +1,209 @@
+from functools import lru_cache
+from math import isqrt
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+Layout = Tuple[
+    Tuple[Tuple[int, ...], ...],
+    Tuple[Tuple[int, ...], ...],
+    Tuple[Tuple[int, ...], ...],
+]
+
+
+@lru_cache(maxsize=None)
+def _layout(box_size: int) -> Layout:
+    """Return the units, peers and unit indices of every cell for the given box size."""
+    n = box_size * box_size
+    rows = [tuple(r * n + c for c in range(n)) for r in range(n)]
+    cols = [tuple(r * n + c for r in range(n)) for c in range(n)]
+    boxes = [
+        tuple(
+            (br * box_size + r) * n + (bc * box_size + c)
+            for r in range(box_size)
+            for c in range(box_size)
+        )
+        for br in range(box_size)
+        for bc in range(box_size)
+    ]
+    units = rows + cols + boxes
+
+    peers: List[set] = [set() for _ in range(n * n)]
+    cell_units: List[List[int]] = [[] for _ in range(n * n)]
+    for u, unit in enumerate(units):
+        for cell in unit:
+            peers[cell].update(unit)
+            cell_units[cell].append(u)
+    for cell, cell_peers in enumerate(peers):
+        cell_peers.discard(cell)
+
+    return (
+        tuple(units),
+        tuple(tuple(sorted(p)) for p in peers),
+        tuple(tuple(u) for u in cell_units),
+    )
+
+
+def _propagate(
+    cands: List[int], queue: List[int], dirty: Set[int], layout: Layout, full: int
+) -> bool:
+    """Propagate naked and hidden singles; return false on a contradiction.
+
+    Only the units in `dirty` and those touched by eliminations are rescanned for
+    hidden singles.
+    """
+    units, peers, cell_units = layout
+    while queue or dirty:
+        # Naked singles: remove each fixed digit from the peers of its cell
+        while queue:
+            cell = queue.pop()
+            bit = cands[cell]
+            for peer in peers[cell]:
+                c = cands[peer]
+                if c & bit:
+                    c ^= bit
+                    if not c:
+                        return False
+                    cands[peer] = c
+                    dirty.update(cell_units[peer])
+                    if not c & (c - 1):
+                        queue.append(peer)
+
+        # Hidden singles: a digit with exactly one candidate cell in a unit
+        scan, dirty = dirty, set()
+        for u in scan:
+            unit = units[u]
+            once = more = fixed = 0
+            for cell in unit:
+                c = cands[cell]
+                more |= once & c
+                once |= c
+                if not c & (c - 1):
+                    fixed |= c
+            if once != full:
+                return False
+            hidden = once & ~more & ~fixed
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for cell in unit:
+                    if cands[cell] & bit:
+                        cands[cell] = bit
+                        dirty.update(cell_units[cell])
+                        queue.append(cell)
+                        break
+    return True
+
+
+def _select_branch(cands: List[int], layout: Layout) -> List[Tuple[int, int]]:
+    """Select the (cell, digit) guesses to branch on, or none if solved.
+
+    Branches on the unfixed cell with the fewest candidates, unless some digit has
+    even fewer candidate cells within a unit.
+    """
+    best_cell = None
+    best_count = 0
+    for cell, c in enumerate(cands):
+        if c & (c - 1):
+            count = bin(c).count("1")
+            if best_cell is None or count < best_count:
+                best_cell = cell
+                best_count = count
+                if count == 2:
+                    break
+    if best_cell is None:
+        return []
+
+    branch = []
+    c = cands[best_cell]
+    while c:
+        bit = c & -c
+        c ^= bit
+        branch.append((best_cell, bit))
+    if best_count == 2:
+        return branch
+
+    units = layout[0]
+    for unit in units:
+        once = more = fixed = 0
+        for cell in unit:
+            c = cands[cell]
+            more |= once & c
+            once |= c
+            if not c & (c - 1):
+                fixed |= c
+        shared = more & ~fixed
+        while shared:
+            bit = shared & -shared
+            shared ^= bit
+            places = [(cell, bit) for cell in unit if cands[cell] & bit]
+            if len(places) < len(branch):
+                branch = places
+                if len(branch) == 2:
+                    return branch
+    return branch
+
+
+def grid_solutions(
+    start: List[List[int]], box_size: Optional[int] = None
+) -> Iterator[List[List[int]]]:
+    """Yield every solution of a Sudoku grid where zero denotes an empty cell."""
+    n = len(start)
+    box_size = box_size or isqrt(n)
+    if box_size * box_size != n or any(len(row) != n for row in start):
+        raise ValueError(f"invalid grid dimensions for box size: {box_size}")
+
+    layout = _layout(box_size)
+    full = (1 << n) - 1
+    cands = [full] * (n * n)
+    queue = []
+    for i, row in enumerate(start):
+        for j, value in enumerate(row):
+            if not 0 <= value <= n:
+                raise ValueError(f"invalid value at ({i}, {j}): {value}")
+            if value:
+                cands[i * n + j] = 1 << (value - 1)
+                queue.append(i * n + j)
+
+    if not _propagate(cands, queue, set(range(len(layout[0]))), layout, full):
+        return
+
+    # Depth-first search over (state, cell, digit) guesses, most constrained first
+    stack: List[Tuple[List[int], int, int]] = []
+    state: Optional[List[int]] = cands
+    while True:
+        if state is not None:
+            branch = _select_branch(state, layout)
+            if not branch:
+                yield [
+                    [state[i * n + j].bit_length() for j in range(n)] for i in range(n)
+                ]
+            # Push in reverse so that the first guess is tried first
+            for cell, bit in reversed(branch):
+                stack.append((state, cell, bit))
+
+        if not stack:
+            return
+        parent, cell, bit = stack.pop()
+        state = parent.copy()
+        state[cell] = bit
+        if not _propagate(state, [cell], set(layout[2][cell]), layout, full):
+            state = None
+
+
+def solve_grid(
+    start: List[List[int]], box_size: Optional[int] = None
+) -> Optional[List[List[int]]]:
+    """Solve a Sudoku grid where zero denotes an empty cell; return none if unsolvable."""
+    return next(grid_solutions(start, box_size), None)
+
+
+class SudokuEngine:
+    def solve(self, model_file: Path, instance_params: Dict[str, Any]) -> Any:
+        """Solve an instance of the Sudoku model without MiniZinc.
+
+        The model file is accepted for compatibility with `ConstraintSolver` and ignored.
+        """
+        solution = solve_grid(instance_params["start"], instance_params.get("S"))
+        if solution is None:
+            raise ValueError("failed to find solution")
+        return {"puzzle": solution}
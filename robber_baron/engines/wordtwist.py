@@ -0,0 +1,303 @@
+from argparse import ArgumentParser
+from array import array
+from functools import lru_cache
+from math import isqrt
+import mmap
+from pathlib import Path
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Header of a dictionary file: magic, then the numbers of nodes, edges and words
+MAGIC = b"RBDAWG1\0"
+HEADER = struct.Struct("<8sIII")
+
+# Rarity of words whose source line does not give one
+DEFAULT_RARITY = 1
+
+# Shortest word that WordTwist accepts
+MIN_WORD_LENGTH = 3
+
+# Each byte as a bytes object, to search for it without allocating
+_BYTES = [bytes([b]) for b in range(256)]
+
+
+class _Node:
+    __slots__ = ("terminal", "edges")
+
+    def __init__(self):
+        """Create a node of a DAWG under construction."""
+        self.terminal = False
+        self.edges: Dict[int, "_Node"] = {}
+
+    def key(self) -> Tuple[bool, Tuple[Tuple[int, int], ...]]:
+        """Return a key that equal nodes share, given that their children are unique."""
+        return (
+            self.terminal,
+            tuple((c, id(child)) for c, child in sorted(self.edges.items())),
+        )
+
+
+def read_words(path: Path) -> Dict[str, int]:
+    """Read a word list with a word per line, optionally followed by its rarity.
+
+    Words are lowercased, and words with characters other than a-z are skipped.
+    """
+    words = {}
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or not fields[0].isascii() or not fields[0].isalpha():
+                continue
+            rarity = int(fields[1]) if len(fields) > 1 else DEFAULT_RARITY
+            words[fields[0].lower()] = rarity
+    return words
+
+
+def build_dawg(words: Dict[str, int], path: Path):
+    """Write a dictionary file, mapping each word to its rarity.
+
+    Words are stored in a DAWG, a trie whose equal subtrees are merged, built in one
+    pass over the sorted words. Each edge also stores the number of words that
+    precede the words below it, so that walking a word yields its index in sorted
+    order, and rarities are stored in that order. Every array is stored as is,
+    so that loading the file only maps it into memory.
+    """
+    ordered = sorted(w.encode("ascii") for w in words)
+    root = _Node()
+    register: Dict[Tuple[bool, Tuple[Tuple[int, int], ...]], _Node] = {}
+    # Edges on the path of the previous word that have not been merged yet
+    unchecked: List[Tuple[_Node, int, _Node]] = []
+
+    def merge(depth: int):
+        while len(unchecked) > depth:
+            parent, c, child = unchecked.pop()
+            key = child.key()
+            if key in register:
+                parent.edges[c] = register[key]
+            else:
+                register[key] = child
+
+    previous = b""
+    for word in ordered:
+        common = 0
+        while (
+            common < min(len(word), len(previous)) and word[common] == previous[common]
+        ):
+            common += 1
+        merge(common)
+        node = unchecked[-1][2] if unchecked else root
+        for c in word[common:]:
+            child = _Node()
+            node.edges[c] = child
+            unchecked.append((node, c, child))
+            node = child
+        node.terminal = True
+        previous = word
+    merge(0)
+
+    # Number the nodes depth-first, and count the words below each
+    ids: Dict[int, int] = {}
+    nodes: List[_Node] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in ids:
+            continue
+        ids[id(node)] = len(nodes)
+        nodes.append(node)
+        stack.extend(node.edges.values())
+    counts: Dict[int, int] = {}
+
+    def count(node: _Node) -> int:
+        k = ids[id(node)]
+        if k not in counts:
+            counts[k] = node.terminal + sum(map(count, node.edges.values()))
+        return counts[k]
+
+    count(root)
+
+    node_first = array("I", [0])
+    edge_target = array("I")
+    edge_offset = array("I")
+    edge_label = bytearray()
+    terminal = bytearray()
+    for node in nodes:
+        offset = int(node.terminal)
+        for c, child in sorted(node.edges.items()):
+            edge_label.append(c)
+            edge_target.append(ids[id(child)])
+            edge_offset.append(offset)
+            offset += count(child)
+        node_first.append(len(edge_label))
+        terminal.append(node.terminal)
+    rarities = bytes(min(words[w.decode("ascii")], 255) for w in ordered)
+
+    if sys.byteorder != "little":
+        for a in (node_first, edge_target, edge_offset):
+            a.byteswap()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(nodes), len(edge_label), len(ordered)))
+        for a in (node_first, edge_target, edge_offset):
+            f.write(a.tobytes())
+        f.write(edge_label + terminal + rarities)
+
+
+class Dawg:
+    def __init__(self, path: Path):
+        """Open a dictionary file written by `build_dawg`, mapping it into memory.
+
+        Nothing is read until it is needed, so that opening a dictionary is
+        instant, and processes that open the same file share its pages.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, num_nodes, num_edges, num_words = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"not a dictionary file: {path}")
+        if sys.byteorder != "little":
+            raise ValueError("dictionary files are only supported on little-endian")
+        view = memoryview(self._mmap)
+        start = HEADER.size
+        self._node_first = view[start : start + 4 * (num_nodes + 1)].cast("I")
+        start += 4 * (num_nodes + 1)
+        self._edge_target = view[start : start + 4 * num_edges].cast("I")
+        start += 4 * num_edges
+        self._edge_offset = view[start : start + 4 * num_edges].cast("I")
+        start += 4 * num_edges
+        self._labels_start = start
+        start += num_edges
+        self._terminal = view[start : start + num_nodes]
+        start += num_nodes
+        self._rarities = view[start : start + num_words]
+        self.num_words = num_words
+
+    def child(self, node: int, label: int) -> Optional[Tuple[int, int]]:
+        """Return the child of a node by label and its word offset, if any.
+
+        The node's labels are searched in the mapped file itself, which is as fast
+        as a dictionary lookup without building one per node.
+        """
+        k = self._mmap.find(
+            _BYTES[label],
+            self._labels_start + self._node_first[node],
+            self._labels_start + self._node_first[node + 1],
+        )
+        if k < 0:
+            return None
+        k -= self._labels_start
+        return self._edge_target[k], self._edge_offset[k]
+
+    def is_word(self, node: int) -> bool:
+        """Return true iff the path to a node spells a word."""
+        return bool(self._terminal[node])
+
+    def rarity(self, index: int) -> int:
+        """Return the rarity of a word by its index in sorted order."""
+        return self._rarities[index]
+
+    def walk(self, word: str) -> Optional[Tuple[int, int]]:
+        """Return the node and word index reached by spelling a prefix, if any."""
+        node, index = 0, 0
+        for c in word.encode("ascii"):
+            child = self.child(node, c)
+            if child is None:
+                return None
+            node, index = child[0], index + child[1]
+        return node, index
+
+    def __contains__(self, word: str) -> bool:
+        """Return true iff a word is in the dictionary."""
+        found = self.walk(word)
+        return found is not None and self.is_word(found[0])
+
+    def close(self):
+        """Unmap the dictionary file."""
+        for view in (
+            self._node_first,
+            self._edge_target,
+            self._edge_offset,
+            self._terminal,
+            self._rarities,
+        ):
+            view.release()
+        self._mmap.close()
+
+
+@lru_cache(maxsize=None)
+def _neighbours(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return the cells adjacent to each cell of a square board, diagonals included."""
+    return tuple(
+        tuple(
+            (i + di) * size + (j + dj)
+            for di in (-1, 0, 1)
+            for dj in (-1, 0, 1)
+            if (di or dj) and 0 <= i + di < size and 0 <= j + dj < size
+        )
+        for i in range(size)
+        for j in range(size)
+    )
+
+
+class WordTwistSolver:
+    def __init__(self, dawg: Dawg, min_length: int = MIN_WORD_LENGTH):
+        """Create a solver that finds every dictionary word on a WordTwist board."""
+        self._dawg = dawg
+        self._min_length = min_length
+
+    def words(self, board: Iterable[str]) -> Dict[str, int]:
+        """Return every word on a square board, with its rarity.
+
+        Board cells are given row by row, and may hold several letters, e.g. "Qu".
+        Words are spelled by paths of adjacent cells that use each cell at most once.
+        Paths are searched depth-first, with the cells on the path kept as a bitmask,
+        and abandoned as soon as they spell a prefix of no word.
+        """
+        tiles = [cell.strip().lower().encode("ascii") for cell in board]
+        size = isqrt(len(tiles))
+        if not tiles or size * size != len(tiles):
+            raise ValueError(f"board is not square: {len(tiles)} cells")
+        neighbours = _neighbours(size)
+        dawg = self._dawg
+        found: Dict[str, int] = {}
+
+        def search(cell: int, node: int, index: int, visited: int, word: bytes):
+            for c in tiles[cell]:
+                child = dawg.child(node, c)
+                if child is None:
+                    return
+                node, index = child[0], index + child[1]
+            word += tiles[cell]
+            visited |= 1 << cell
+            if len(word) >= self._min_length and dawg.is_word(node):
+                found[word.decode("ascii")] = dawg.rarity(index)
+            for neighbour in neighbours[cell]:
+                if not visited >> neighbour & 1:
+                    search(neighbour, node, index, visited, word)
+
+        for cell in range(len(tiles)):
+            search(cell, 0, 0, 0, b"")
+        return found
+
+    def solve(self, board: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Return every word on a board, structured like WordTwist's `wordList`."""
+        return {word: {"rarity": rarity} for word, rarity in self.words(board).items()}
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Build a WordTwist dictionary file")
+    parser.add_argument(
+        "words",
+        type=Path,
+        help="Word list, with a word per line, optionally followed by its rarity",
+    )
+    parser.add_argument("output", type=Path, help="Dictionary file to write")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    words = read_words(args.words)
+    build_dawg(words, args.output)
+    print(f"Wrote {len(words)} words to {args.output}")
@@ -0,0 +1,231 @@
+from itertools import islice
+import random
+from typing import Any, Dict, List, Set, Tuple
+
+from robber_baron.engines.campsites import CampsitesSolver
+from robber_baron.engines.nonogram import NonogramSolver
+from robber_baron.engines.sudoku import grid_solutions, solve_grid
+from robber_baron.numbergrids import instance_params, Model
+
+Cell = Tuple[int, int]
+
+# Boards are repaired this many times, then regenerated from scratch
+MAX_REPAIRS = 50
+MAX_ATTEMPTS = 20
+
+# Campsites repairs add a pair for every this many undecided cells
+CELLS_PER_REPAIR = 16
+
+CARDINAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _touches(cell: Cell, tents: Set[Cell]) -> bool:
+    """Return true iff a cell holds or is adjacent to a tent, diagonals included."""
+    i, j = cell
+    return any((i + di, j + dj) in tents for di in (-1, 0, 1) for dj in (-1, 0, 1))
+
+
+def _free_neighbours(
+    cell: Cell, num_rows: int, num_cols: int, taken: Set[Cell]
+) -> List[Cell]:
+    """Return the cells cardinally adjacent to a cell that are on the board and free."""
+    i, j = cell
+    return [
+        (i + di, j + dj)
+        for di, dj in CARDINAL
+        if 0 <= i + di < num_rows
+        and 0 <= j + dj < num_cols
+        and (i + di, j + dj) not in taken
+    ]
+
+
+def _undecided(num_rows: int, num_cols: int, pairs: Dict[Cell, Cell]) -> Set[Cell]:
+    """Return the cells of a board of tents and trees that need search to decide.
+
+    These are the cells that the native solver cannot decide by propagation and
+    probing alone.
+    """
+    tents = set(pairs)
+    solver = CampsitesSolver(
+        num_rows,
+        num_cols,
+        [sum(1 for i, _ in tents if i == r) for r in range(num_rows)],
+        [sum(1 for _, j in tents if j == c) for c in range(num_cols)],
+        sorted(pairs.values()),
+    )
+    deduced = solver.deduce()
+    if deduced is None:
+        raise ValueError("board has no solution")
+    decided = deduced[0] | deduced[1]
+    return {
+        divmod(k, num_cols)
+        for k in range(num_rows * num_cols)
+        if not (decided >> k) & 1
+    }
+
+
+def _pair(
+    cell: Cell,
+    num_rows: int,
+    num_cols: int,
+    pairs: Dict[Cell, Cell],
+    rng: random.Random,
+) -> bool:
+    """Add a tent or tree on a free cell, paired with one next to it, if either fits.
+
+    Returns false if neither fits.
+    """
+    tents = set(pairs)
+    trees = set(pairs.values())
+    if cell in tents or cell in trees:
+        return False
+    spots = _free_neighbours(cell, num_rows, num_cols, tents | trees)
+    if not _touches(cell, tents) and spots:
+        pairs[cell] = rng.choice(spots)
+        return True
+    spots = [spot for spot in spots if not _touches(spot, tents)]
+    if spots:
+        pairs[rng.choice(spots)] = cell
+        return True
+    return False
+
+
+def campsites_params(
+    num_rows: int, num_cols: int, density: float, rng: random.Random
+) -> Dict[str, Any]:
+    """Return the parameters of a random, uniquely solvable Campsites board.
+
+    Tents and trees are placed in pairs until about `density` of the cells hold
+    one. Then, while the native solver cannot decide every cell by propagation and
+    probing alone, a tent or tree is added on undecided cells with its pair, or, if
+    none fit, an undecided tent and its tree are removed. Proving uniqueness by
+    search takes seconds on large boards, whereas probing takes milliseconds.
+    """
+    cells = [(i, j) for i in range(num_rows) for j in range(num_cols)]
+    for _ in range(MAX_ATTEMPTS):
+        # Map each tent to its tree
+        pairs: Dict[Cell, Cell] = {}
+        rng.shuffle(cells)
+        for cell in cells:
+            if 2 * len(pairs) >= density * len(cells):
+                break
+            if not _touches(cell, set(pairs)):
+                _pair(cell, num_rows, num_cols, pairs, rng)
+
+        for _ in range(MAX_REPAIRS):
+            undecided = sorted(_undecided(num_rows, num_cols, pairs))
+            if not undecided:
+                return _campsites_instance(num_rows, num_cols, pairs)
+            rng.shuffle(undecided)
+            # Add more pairs at once to boards with many undecided cells
+            wanted = max(1, len(undecided) // CELLS_PER_REPAIR)
+            added = 0
+            for cell in undecided:
+                if added < wanted and _pair(cell, num_rows, num_cols, pairs, rng):
+                    added += 1
+            if not added:
+                tents = [cell for cell in undecided if cell in pairs]
+                if not tents:
+                    break
+                del pairs[tents[0]]
+    raise RuntimeError("failed to generate a uniquely solvable Campsites board")
+
+
+def _campsites_instance(
+    num_rows: int, num_cols: int, pairs: Dict[Cell, Cell]
+) -> Dict[str, Any]:
+    """Return the parameters of the board given by tents and their trees."""
+    num_tents_in_row = [sum(1 for i, _ in pairs if i == r) for r in range(num_rows)]
+    trees = sorted(pairs.values())
+    return {
+        "num_rows": num_rows,
+        "num_cols": num_cols,
+        "num_tents_in_row": num_tents_in_row,
+        "num_tents_in_col": [
+            sum(1 for _, j in pairs if j == c) for c in range(num_cols)
+        ],
+        "num_trees": len(trees),
+        # MiniZinc uses 1-based indexing
+        "tree_rows": [i + 1 for i, _ in trees],
+        "tree_cols": [j + 1 for _, j in trees],
+    }
+
+
+def line_clues(line: List[bool]) -> List[int]:
+    """Return the lengths of the runs of filled cells in a line, or [0] if none."""
+    clues = []
+    run = 0
+    for cell in line:
+        if cell:
+            run += 1
+        elif run:
+            clues.append(run)
+            run = 0
+    if run:
+        clues.append(run)
+    return clues or [0]
+
+
+def numbergrids_params(
+    grid_size: int, density: float, rng: random.Random
+) -> Dict[str, Any]:
+    """Return the parameters of a random, uniquely solvable Numbergrids board.
+
+    About `density` of the cells are filled. While the clues have another
+    solution, a cell where the two solutions differ is flipped.
+    """
+    for _ in range(MAX_ATTEMPTS):
+        grid = [
+            [rng.random() < density for _ in range(grid_size)] for _ in range(grid_size)
+        ]
+        for _ in range(MAX_REPAIRS):
+            row_clues = [line_clues(row) for row in grid]
+            col_clues = [line_clues(list(col)) for col in zip(*grid)]
+            others = [
+                s
+                for s in islice(NonogramSolver(row_clues, col_clues).solutions(), 2)
+                if s != grid
+            ]
+            if not others:
+                return instance_params(Model.CLUES, grid_size, row_clues, col_clues)
+            i, j = rng.choice(
+                [
+                    (i, j)
+                    for i in range(grid_size)
+                    for j in range(grid_size)
+                    if grid[i][j] != others[0][i][j]
+                ]
+            )
+            grid[i][j] = not grid[i][j]
+    raise RuntimeError("failed to generate a uniquely solvable Numbergrids board")
+
+
+def sudoku_params(box_size: int, density: float, rng: random.Random) -> Dict[str, Any]:
+    """Return the parameters of a random, uniquely solvable Sudoku board.
+
+    Digits are removed from a random solved grid while the board stays uniquely
+    solvable, until only about `density` of the cells hold one. Boards other than
+    9x9 need `sudoku_sized.mzn`.
+    """
+    n = box_size * box_size
+    digits = list(range(1, n + 1))
+    rng.shuffle(digits)
+    seed = [[0] * n for _ in range(n)]
+    seed[0] = digits
+    start = solve_grid(seed, box_size)
+    if start is None:
+        raise RuntimeError("failed to generate a solved Sudoku grid")
+
+    givens = n * n
+    cells = [(i, j) for i in range(n) for j in range(n)]
+    rng.shuffle(cells)
+    for i, j in cells:
+        if givens <= round(density * n * n):
+            break
+        digit = start[i][j]
+        start[i][j] = 0
+        if len(list(islice(grid_solutions(start, box_size), 2))) == 1:
+            givens -= 1
+        else:
+            start[i][j] = digit
+    return {"start": start}
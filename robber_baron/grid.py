@@ -0,0 +1,115 @@
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, List, Optional, Sequence
+
+
+@lru_cache(maxsize=None)
+def _decode_table(alphabet: str, default: int) -> bytes:
+    """Return a table translating each character of an alphabet to its index.
+
+    Other characters are translated to the default.
+    """
+    table = bytearray([default]) * 256
+    for value, char in enumerate(alphabet):
+        table[ord(char)] = value
+    return bytes(table)
+
+
+@lru_cache(maxsize=None)
+def _encode_table(alphabet: str) -> bytes:
+    """Return a table translating each index of an alphabet to its character."""
+    table = bytearray(256)
+    table[: len(alphabet)] = alphabet.encode("ascii")
+    return bytes(table)
+
+
+class Grid:
+    def __init__(self, num_rows: int, num_cols: int, cells: Optional[bytearray] = None):
+        """Create a grid, storing the value of each cell in one byte, row by row.
+
+        Values are small integers, e.g. the index of a cell's character in the
+        alphabet of a game, so that whole grids are parsed and encoded with
+        `bytes.translate` rather than a loop over the cells.
+        """
+        if cells is None:
+            cells = bytearray(num_rows * num_cols)
+        if len(cells) != num_rows * num_cols:
+            raise ValueError(
+                f"expected {num_rows * num_cols} cells, but got {len(cells)}"
+            )
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.cells = cells
+
+    @classmethod
+    def parse(
+        cls, state: str, num_cols: int, alphabet: str, default: int = 0
+    ) -> "Grid":
+        """Parse a page state string, where each character is a cell.
+
+        Each cell's value is the index of its character in the alphabet; characters
+        outside the alphabet take the default value.
+        """
+        cells = bytearray(
+            state.encode("latin-1").translate(_decode_table(alphabet, default))
+        )
+        return cls(len(cells) // num_cols, num_cols, cells)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "Grid":
+        """Create a grid from rows of small integers or booleans, e.g. a MiniZinc array."""
+        cells = bytearray(chain.from_iterable(rows))
+        return cls(len(rows), len(cells) // len(rows) if rows else 0, cells)
+
+    def encode(self, alphabet: str) -> str:
+        """Encode the grid as a string, where each value is replaced by its character."""
+        return self.cells.translate(_encode_table(alphabet)).decode("ascii")
+
+    def rows(self) -> List[List[int]]:
+        """Return the values of the grid as rows, e.g. for MiniZinc parameters."""
+        return [
+            list(self.cells[start : start + self.num_cols])
+            for start in range(0, len(self.cells), self.num_cols)
+        ]
+
+    def indices(self, value: int) -> Iterable[int]:
+        """Yield the row-major index of every cell with a value."""
+        k = self.cells.find(value)
+        while k != -1:
+            yield k
+            k = self.cells.find(value, k + 1)
+
+    def __getitem__(self, key: Sequence[int]) -> int:
+        """Return the value of the cell at (row, column)."""
+        i, j = key
+        return self.cells[i * self.num_cols + j]
+
+    def __setitem__(self, key: Sequence[int], value: int):
+        """Set the value of the cell at (row, column)."""
+        i, j = key
+        self.cells[i * self.num_cols + j] = value
+
+    def __or__(self, other: "Grid") -> "Grid":
+        """Combine two grids of the same shape, cell by cell, with bitwise or."""
+        if (self.num_rows, self.num_cols) != (other.num_rows, other.num_cols):
+            raise ValueError("grids have different shapes")
+        # Or-ing the grids as two big integers is much faster than a loop over cells
+        size = len(self.cells)
+        combined = int.from_bytes(self.cells, "big") | int.from_bytes(
+            other.cells, "big"
+        )
+        return Grid(
+            self.num_rows, self.num_cols, bytearray(combined.to_bytes(size, "big"))
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Return true iff the grids have the same shape and values."""
+        return (
+            isinstance(other, Grid)
+            and (self.num_rows, self.num_cols) == (other.num_rows, other.num_cols)
+            and self.cells == other.cells
+        )
+
+    def __repr__(self) -> str:
+        """Return a representation of the grid."""
+        return f"Grid({self.num_rows}, {self.num_cols}, {self.cells!r})"
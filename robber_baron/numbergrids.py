@@ -1,8 +1,18 @@
 from argparse import ArgumentParser
 from enum import Enum
+from functools import partial
+import logging
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from robber_baron import Bot, ConstraintSolver
+from robber_baron import Bot, Browser, Engine
+from robber_baron.dfa import regular_params
+from robber_baron.engines import NonogramEngine
+from robber_baron.grid import Grid
+from robber_baron.portfolio import FallbackSolver, named_backends, PortfolioSolver
+from robber_baron.waits import Condition
+
+logger = logging.getLogger(__name__)
 
 
 class Size(Enum):
@@ -35,86 +45,139 @@ DIFFICULTY_IDS = {
     Difficulty.FIENDISH: 5,
 }
 
+# Characters of the cells in the solution; a cell's value is its index
+ALPHABET = "_O"
+
+
+class Model(Enum):
+    CLUES = "clues"
+    REGULAR = "regular"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+MODEL_FILES = {
+    Model.CLUES: Path(__file__).parent / "models" / "numbergrids.mzn",
+    Model.REGULAR: Path(__file__).parent / "models" / "numbergrids_regular.mzn",
+}
+
+
+def instance_params(
+    model: Model, grid_size: int, row_clues: List[List[int]], col_clues: List[List[int]]
+) -> Dict[str, Any]:
+    """Return the parameters of a model for the given clues."""
+    if model == Model.REGULAR:
+        return regular_params(grid_size, row_clues, col_clues)
+    max_clues = max(max(len(c) for c in row_clues), max(len(c) for c in col_clues))
+    pad = lambda clues: clues + [0] * (max_clues - len(clues))  # noqa: E731
+    return {
+        "grid_size": grid_size,
+        "num_clues": max_clues,
+        "row_clues": list(map(pad, row_clues)),
+        "col_clues": list(map(pad, col_clues)),
+    }
+
+
+def from_clues_params(model: Model, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the parameters of a model for an instance of the clues model."""
+    return instance_params(
+        model, params["grid_size"], params["row_clues"], params["col_clues"]
+    )
+
+
+def encode_solution(instance_params: Dict[str, Any], solution: Any) -> str:
+    """Encode the filled cells of a solution, as submitted."""
+    return Grid.from_rows(solution["grid"]).encode(ALPHABET)
+
 
 class NumbergridsBot(Bot):
-    def play(self, size: Size, difficulty: Difficulty):
-        """Play a Numbergrids game."""
+    # Chuffed has much better performance than Gecode for this problem
+    solver_tag = "chuffed"
+
+    def play(self, size: Size, difficulty: Difficulty, model: Model = Model.CLUES):
+        """Play a Numbergrids game.
+
+        Both models give solutions of the same shape; the regular model constrains
+        each row and column with a DFA built from its clues.
+        """
         grid_size = int(str(size))
 
-        new_game_url = "https://numbergrids.puzzlebaron.com/init.php"
-        print(f"Loading new game URL: {new_game_url} ...")
-        self.browser.get(new_game_url)
-
-        print(f"Setting puzzle size to: {str(size)} ...")
-        print(f"Setting puzzle difficulty to: {str(difficulty)} ...")
-        _ = self.browser.find_element('form[action="init2.php"]')
-        self.browser.execute_script(
-            """
-            document.getElementById('sg').value = arguments[0];
-            document.getElementById('sd').value = arguments[1];
-            """,
-            str(size),
-            str(DIFFICULTY_IDS[difficulty]),
-        )
+        model_file = MODEL_FILES[model]
+        self.warm_up(model_file)
 
-        print("Starting game ...")
-        self.browser.find_element('input[name="CreatePuzzle"]').click()
-        self.browser.find_element('input[name="submit"]').click()
+        with self.span("load"):
+            new_game_url = "https://numbergrids.puzzlebaron.com/init.php"
+            logger.info("Loading new game URL: %s ...", new_game_url)
+            self.browser.get(new_game_url)
 
-        row_clues = []
-        for i in range(grid_size):
-            cell = self.browser.find_element(f"td#X0Y{i+1}")
-            row_clues.append(
-                [int(c) for c in cell.get_attribute("innerText").strip().split(",")]
+            logger.info("Setting puzzle size to: %s ...", size)
+            logger.info("Setting puzzle difficulty to: %s ...", difficulty)
+            _ = self.browser.find_element(
+                'form[action="init2.php"]', condition=Condition.PRESENT
             )
-        print(f"Extracted row clues: {row_clues}")
+            self.browser.execute_script(
+                """
+                document.getElementById('sg').value = arguments[0];
+                document.getElementById('sd').value = arguments[1];
+                """,
+                str(size),
+                str(DIFFICULTY_IDS[difficulty]),
+            )
+
+            logger.info("Starting game ...")
+            self.browser.find_element('input[name="CreatePuzzle"]').click()
+            self.browser.find_element('input[name="submit"]').click()
 
-        col_clues = []
-        for i in range(grid_size):
-            cell = self.browser.find_element(f"td#X{i+1}Y0")
-            col_clues.append(
-                [int(c) for c in cell.get_attribute("innerText").strip().split("\n")]
+        with self.span("extract"):
+            clue_texts = self.browser.read_many(
+                [f"td#X0Y{i+1}" for i in range(grid_size)]
+                + [f"td#X{i+1}Y0" for i in range(grid_size)]
+            )
+
+            row_clues = [
+                [int(c) for c in text.strip().split(",")]
+                for text in clue_texts[:grid_size]
+            ]
+            logger.debug("Extracted row clues: %s", row_clues)
+
+            col_clues = [
+                [int(c) for c in text.strip().split("\n")]
+                for text in clue_texts[grid_size:]
+            ]
+            logger.debug("Extracted column clues: %s", col_clues)
+
+        with self.span("solve", model=str(model)):
+            logger.info("Solving problem instance ...")
+            result = self.solve(
+                model_file,
+                instance_params(model, grid_size, row_clues, col_clues),
+                labels={"size": str(size), "difficulty": str(difficulty)},
             )
-        print(f"Extracted column clues: {col_clues}")
-
-        max_clues = max(max(len(c) for c in row_clues), max(len(c) for c in col_clues))
-        pad = lambda clues: clues + [0] * (max_clues - len(clues))  # noqa: E731
-        padded_row_clues = list(map(pad, row_clues))
-        padded_col_clues = list(map(pad, col_clues))
-
-        print("Solving problem instance ...")
-        model_file = Path(__file__).parent / "models" / "numbergrids.mzn"
-        instance_params = {
-            "grid_size": grid_size,
-            "num_clues": max_clues,
-            "row_clues": padded_row_clues,
-            "col_clues": padded_col_clues,
-        }
-        result = self.solver.solve(model_file, instance_params)
-
-        final_state = []
-        for i in range(grid_size):
-            for j in range(grid_size):
-                if result["grid"][i][j]:
-                    final_state.append("O")
-                else:
-                    final_state.append("_")
-        solution = "".join(final_state)
-        print(f"Formatted solution: {solution}")
-
-        print("Submitting game ...")
-        self.browser.execute_script(
-            "document.getElementById('ans').setAttribute('value', arguments[0])",
-            solution,
-        )
-        self.browser.find_element("form#gameform").submit()
 
-        print("Verifying submission ...")
-        congrats = self.browser.find_element("div#container_left > h1.header_font")
-        assert congrats.get_attribute("innerText") == "Congratulations!"
+        with self.span("encode"):
+            solution = Grid.from_rows(result["grid"]).encode(ALPHABET)
+            logger.debug("Formatted solution: %s", solution)
+
+        with self.span("submit"):
+            logger.info("Submitting game ...")
+            self.browser.execute_script(
+                "document.getElementById('ans').setAttribute('value', arguments[0])",
+                solution,
+            )
+            self.browser.find_element(
+                "form#gameform", condition=Condition.PRESENT
+            ).submit()
+
+        with self.span("verify"):
+            logger.info("Verifying submission ...")
+            congrats = self.browser.find_element(
+                "div#container_left > h1.header_font", condition=Condition.VISIBLE
+            )
+            assert congrats.get_attribute("innerText") == "Congratulations!"
 
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None):
     """Parse command-line arguments."""
     parser = ArgumentParser(description="Play a Numbergrids game")
     parser.add_argument(
@@ -133,19 +196,102 @@ def parse_args():
         choices=list(Difficulty),
         help="Puzzle difficulty; default 'very_easy'",
     )
+    parser.add_argument(
+        "-m",
+        "--model",
+        type=Model,
+        default=Model.CLUES,
+        choices=list(Model),
+        help="MiniZinc model; default 'clues'",
+    )
+    parser.add_argument(
+        "--native",
+        action="store_true",
+        help="Solve with the native engine instead of MiniZinc",
+    )
+    parser.add_argument(
+        "--portfolio",
+        action="store_true",
+        help="Race every installed solver and the native engine",
+    )
+    parser.add_argument(
+        "--no-presolve",
+        action="store_true",
+        help="Pass the raw clues to MiniZinc without fixing forced cells first",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="SECONDS",
+        help="Give up on a solver after this many seconds",
+    )
+    parser.add_argument(
+        "--fallback",
+        nargs="+",
+        metavar="BACKEND",
+        help="MiniZinc solver tags and/or 'native' to try in turn within the budget",
+    )
     parser.add_argument(
         "--login", action="store_true", help="Login to Puzzle Baron account"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log board data and timings"
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="Quit without waiting for enter after the game",
+    )
+    return parser.parse_args(argv)
 
 
-if __name__ == "__main__":
-    args = parse_args()
-    # Chuffed has much better performance than Gecode for this problem
-    bot = NumbergridsBot(solver=ConstraintSolver("chuffed"))
-    if args.login:
-        bot.login()
-    bot.play(args.size, args.difficulty)
+def main(
+    argv: Optional[List[str]] = None,
+    browser: Optional[Browser] = None,
+    solvers: Optional[Dict[str, Engine]] = None,
+):
+    """Play a Numbergrids game from the command line.
 
-    input("Press enter to quit: ")
-    bot.browser.quit()
+    Warm MiniZinc solvers may be given by tag, e.g. by the daemon.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+    backends = args.fallback or ["native" if args.native else NumbergridsBot.solver_tag]
+    # The native engine takes the parameters of the clues model, so the bot plays with
+    # the clues model if it is a backend, and the other backends convert its parameters
+    model = Model.CLUES if "native" in backends else args.model
+    models = {
+        name: (MODEL_FILES[args.model], partial(from_clues_params, args.model))
+        for name in backends
+        if name != "native" and model != args.model
+    }
+    solver: Optional[Engine] = None
+    if args.fallback or args.budget is not None:
+        solver = FallbackSolver(
+            named_backends(backends, NonogramEngine()), args.budget, models=models
+        )
+    elif args.native:
+        solver = NonogramEngine()
+    elif args.portfolio:
+        solver = PortfolioSolver()
+    else:
+        solver = (solvers or {}).get(NumbergridsBot.solver_tag)
+    bot = NumbergridsBot(
+        browser=browser,
+        solver=solver,
+        # The native engine, which the portfolio also races, ignores the cells fixed
+        # by presolving
+        presolve=not (args.no_presolve or "native" in backends or args.portfolio),
+    )
+    try:
+        if args.login:
+            bot.login()
+        bot.play(args.size, args.difficulty, model)
+    finally:
+        bot.quit(prompt=not args.no_prompt)
+
+
+if __name__ == "__main__":
+    main()
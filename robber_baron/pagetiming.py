@@ -0,0 +1,234 @@
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Return the Navigation Timing entry of the current document, the first time it is
+# read, and the Resource Timing entries since the last read, with times in seconds
+# since the navigation started. Resource entries are cleared once read, and the
+# document is marked once its navigation is read, so that nothing is returned twice
+PAGE_TIMING_SCRIPT = """
+    const seconds = (ms) => (ms > 0 ? ms / 1000 : null);
+    const timings = { navigation: null, resources: [] };
+    const [navigation] = performance.getEntriesByType("navigation");
+    if (navigation && !window.__robberBaronNavigationRead) {
+        window.__robberBaronNavigationRead = true;
+        timings.navigation = {
+            url: navigation.name,
+            type: navigation.type,
+            status: navigation.responseStatus ?? null,
+            ttfb: seconds(navigation.responseStart),
+            dom_content_loaded: seconds(navigation.domContentLoadedEventEnd),
+            load: seconds(navigation.loadEventEnd),
+            bytes: navigation.transferSize,
+        };
+    }
+    for (const resource of performance.getEntriesByType("resource")) {
+        timings.resources.push({
+            url: resource.name,
+            type: resource.initiatorType,
+            start: seconds(resource.startTime),
+            seconds: resource.duration / 1000,
+            bytes: resource.transferSize,
+        });
+    }
+    performance.clearResourceTimings();
+    return timings;
+"""
+
+# Page events in Chrome's performance log, by the names of the timings they give
+_PAGE_EVENTS = {
+    "Page.domContentEventFired": "dom_content_loaded",
+    "Page.loadEventFired": "load",
+}
+
+
+def performance_log_options(options: Any = None) -> Any:
+    """Return Chrome options that enable the performance log, which `Browser` reads.
+
+    The log holds the Chrome DevTools Protocol's network and page events.
+    """
+    if options is None:
+        from selenium.webdriver import ChromeOptions
+
+        options = ChromeOptions()
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def network_requests(log: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the requests in Chrome performance log entries, in the order sent.
+
+    Each request has its URL, resource type, status, whether it was served from a
+    cache, the bytes received, including headers, and its seconds to the first byte
+    and to the end. Documents also have the seconds to their DOMContentLoaded and
+    load events, and failed requests have an error instead.
+    """
+    requests: Dict[str, Dict[str, Any]] = {}
+    starts: Dict[str, float] = {}
+    page_events: List[Tuple[float, str]] = []
+    for entry in log:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method in _PAGE_EVENTS:
+            page_events.append((params["timestamp"], _PAGE_EVENTS[method]))
+            continue
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            # Redirects reuse the request ID; keep the first start and the last URL
+            starts.setdefault(request_id, params["timestamp"])
+            request = requests.setdefault(request_id, {})
+            request.update(
+                url=params["request"]["url"], type=params.get("type", "Other")
+            )
+        elif request_id not in requests:
+            continue
+        elif method == "Network.responseReceived":
+            response = params["response"]
+            timing = response.get("timing") or {}
+            requests[request_id].update(
+                status=response.get("status"),
+                cached=bool(
+                    response.get("fromDiskCache") or response.get("fromServiceWorker")
+                ),
+                ttfb=(
+                    timing["requestTime"]
+                    + timing["receiveHeadersEnd"] / 1000
+                    - starts[request_id]
+                    if "receiveHeadersEnd" in timing
+                    else None
+                ),
+            )
+        elif method == "Network.loadingFinished":
+            requests[request_id].update(
+                bytes=params.get("encodedDataLength", 0),
+                seconds=params["timestamp"] - starts[request_id],
+            )
+        elif method == "Network.loadingFailed":
+            requests[request_id].update(
+                error=params.get("errorText", "failed"),
+                seconds=params["timestamp"] - starts[request_id],
+            )
+
+    # Attribute each page event to the latest document requested before it
+    documents = sorted(
+        ((starts[k], r) for k, r in requests.items() if r["type"] == "Document"),
+        key=lambda document: document[0],
+    )
+    for timestamp, name in sorted(page_events):
+        owner = None
+        for start, document in documents:
+            if start > timestamp:
+                break
+            owner = (start, document)
+        if owner is not None:
+            owner[1].setdefault(name, timestamp - owner[0])
+    return [requests[k] for k in sorted(requests, key=starts.__getitem__)]
+
+
+def _path(url: str) -> str:
+    """Return a URL without its query string and fragment, to group requests."""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def summarize(events: List[Dict[str, Any]], top: int = 10) -> Dict[str, Dict[str, Any]]:
+    """Summarize the page timings of phase events, by game and phase.
+
+    Each phase has its median navigation timings by page, and the resources that
+    took the most time in total, by URL without the query string. Pages and
+    resources come from the performance log where it was read, which covers every
+    navigation in the phase, and from Navigation and Resource Timing otherwise.
+    """
+    phases: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        page = event.get("page")
+        if not page:
+            continue
+        phase = phases.setdefault(
+            f"{event['game']}.{event['phase']}",
+            {"events": 0, "navigations": {}, "resources": {}},
+        )
+        phase["events"] += 1
+        network = page.get("network")
+        if network is not None:
+            navigations = [r for r in network if r["type"] == "Document"]
+        else:
+            navigations = page.get("navigations", [])
+        for navigation in navigations:
+            timings = phase["navigations"].setdefault(_path(navigation["url"]), {})
+            for key in ("ttfb", "dom_content_loaded", "load"):
+                if navigation.get(key) is not None:
+                    timings.setdefault(key, []).append(navigation[key])
+        for request in network if network is not None else page["resources"]:
+            resource = phase["resources"].setdefault(
+                _path(request["url"]),
+                {"type": request.get("type"), "count": 0, "seconds": 0.0, "bytes": 0},
+            )
+            resource["count"] += 1
+            resource["seconds"] += request.get("seconds") or 0.0
+            resource["bytes"] += request.get("bytes") or 0
+
+    for phase in phases.values():
+        phase["navigations"] = {
+            url: {key: statistics.median(values) for key, values in timings.items()}
+            for url, timings in phase["navigations"].items()
+        }
+        ranked = sorted(
+            phase["resources"].items(),
+            key=lambda item: item[1]["seconds"],
+            reverse=True,
+        )
+        phase["resources"] = dict(ranked[:top])
+    return phases
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Summarize the page and network timings of each game phase"
+    )
+    parser.add_argument(
+        "files",
+        type=Path,
+        nargs="+",
+        help="JSON lines files written via PB_TIMING_FILE with PB_PAGE_TIMING set",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Resources per phase; default 10"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write the summary as JSON")
+    return parser.parse_args()
+
+
+def _ms(value: Optional[float]) -> str:
+    """Format seconds as milliseconds, or a dash if unknown."""
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    events: List[Dict[str, Any]] = []
+    for path in args.files:
+        with open(path) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    summary = summarize(events, args.top)
+
+    for key, phase in sorted(summary.items()):
+        print(f"{key} ({phase['events']} events)")
+        for url, timings in phase["navigations"].items():
+            print(
+                f"  page {url}: ttfb {_ms(timings.get('ttfb'))},"
+                f" DOMContentLoaded {_ms(timings.get('dom_content_loaded'))},"
+                f" load {_ms(timings.get('load'))}"
+            )
+        for url, resource in phase["resources"].items():
+            print(
+                f"  {resource['type'] or '?':<12} {resource['count']:>4}x"
+                f" {resource['seconds'] * 1000:9.0f}ms"
+                f" {resource['bytes'] / 1024:9.1f}KB  {url}"
+            )
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2) + "\n")
@@ -0,0 +1,380 @@
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+import os
+from pathlib import Path
+import signal
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from robber_baron import ConstraintSolver, Engine, solution_dict
+from robber_baron.engines import MODEL_ENGINES
+
+logger = logging.getLogger(__name__)
+
+Backend = Union[str, Engine]
+ParamsConverter = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# MiniZinc solver tags to race when no backends are given
+DEFAULT_SOLVER_TAGS = ("gecode", "chuffed", "cp-sat")
+
+# Start workers from a fresh server process, since forking a bot would copy the
+# locks of its threads, e.g. those of the browser's connection pool, mid-use
+_CONTEXT = multiprocessing.get_context("forkserver")
+
+
+def backend_name(backend: Backend) -> str:
+    """Return the name used to record results for a backend."""
+    return backend if isinstance(backend, str) else type(backend).__name__
+
+
+def named_backends(names: List[str], engine: Engine) -> List[Backend]:
+    """Return the backends named on the command line, where 'native' is an engine."""
+    return [engine if name == "native" else name for name in names]
+
+
+def installed_solver_tags(tags: Sequence[str] = DEFAULT_SOLVER_TAGS) -> List[str]:
+    """Return the solver tags that MiniZinc can find."""
+    from minizinc import Solver
+
+    installed = []
+    for tag in tags:
+        try:
+            Solver.lookup(tag)
+        except Exception:
+            continue
+        installed.append(tag)
+    return installed
+
+
+def _serve(backend: Backend, conn: Connection):
+    """Solve the instances sent over a connection with one backend, until it closes.
+
+    Each outcome is sent back as the backend's name, the solution as a dictionary of
+    output variables, and an error.
+    """
+    # Lead a new process group, so that losers can be killed with their MiniZinc process
+    os.setpgrp()
+    name = backend_name(backend)
+    solver: Optional[ConstraintSolver] = None
+    while True:
+        try:
+            model_file, instance_params = conn.recv()
+        except EOFError:
+            return
+        try:
+            if isinstance(backend, str):
+                # Kept for the next instance, so that parsed models are reused
+                solver = solver or ConstraintSolver(backend)
+                solution = solution_dict(solver.solve(model_file, instance_params))
+            else:
+                solution = backend.solve(model_file, instance_params)
+            conn.send((name, solution, None))
+        except Exception as e:
+            conn.send((name, None, repr(e)))
+
+
+def _fallback_errors() -> Tuple[Type[Exception], ...]:
+    """Return the errors after which `FallbackSolver` tries the next backend.
+
+    These include MiniZinc failing to find a solver tag, or to run it.
+    """
+    from minizinc import MiniZincError
+
+    return (LookupError, MiniZincError, TimeoutError, ValueError)
+
+
+def _kill(process: BaseProcess):
+    """Kill a worker process and every process it started."""
+    if process.pid is None or not process.is_alive():
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # The worker has not created its process group yet
+        process.kill()
+
+
+class _Worker:
+    def __init__(self, backend: Backend):
+        """Start a process that solves instances with a backend, until it is stopped."""
+        self.backend = backend
+        self.conn, child = _CONTEXT.Pipe()
+        self.process = _CONTEXT.Process(
+            target=_serve, args=(backend, child), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def stop(self):
+        """Kill the worker, with every process it started."""
+        _kill(self.process)
+        self.process.join()
+        self.conn.close()
+
+
+class PortfolioSolver:
+    def __init__(
+        self,
+        backends: Optional[List[Backend]] = None,
+        include_engines: bool = True,
+        timeout_seconds: Optional[float] = None,
+    ):
+        """Create a solver that races several backends and keeps the first answer.
+
+        Backends are MiniZinc solver tags or in-process engines. By default, every
+        installed solver tag is raced, along with the native engine for the model.
+        Each backend solves in a worker process that is kept for later races, unless
+        it was still solving when another backend won; see `close`.
+        """
+        self._backends = backends if backends is not None else installed_solver_tags()
+        self._include_engines = include_engines
+        self._timeout_seconds = timeout_seconds
+        self._pruned: Dict[str, List[Backend]] = {}
+        # Native engines by model file name, and workers by backend, for reuse
+        self._engines: Dict[str, Engine] = {}
+        self._workers: Dict[int, _Worker] = {}
+        # Map model file names to the number of races and each backend's wins
+        self.races: Dict[str, int] = {}
+        self.wins: Dict[str, Dict[str, int]] = {}
+        self.last_winner: Optional[str] = None
+
+    def backends(self, model_file: Path) -> List[Backend]:
+        """Return the backends raced for a model."""
+        model_name = Path(model_file).name
+        if model_name in self._pruned:
+            return self._pruned[model_name]
+        backends = list(self._backends)
+        if self._include_engines and model_name in MODEL_ENGINES:
+            if model_name not in self._engines:
+                self._engines[model_name] = MODEL_ENGINES[model_name]()
+            backends.append(self._engines[model_name])
+        return backends
+
+    def win_rates(self, model_file: Path) -> Dict[str, float]:
+        """Return the fraction of races for a model that each backend won."""
+        model_name = Path(model_file).name
+        races = self.races.get(model_name, 0)
+        return {
+            name: wins / races for name, wins in self.wins.get(model_name, {}).items()
+        }
+
+    def prune(self, model_file: Path, keep: int = 1):
+        """Restrict future races for a model to the backends that won most often."""
+        model_name = Path(model_file).name
+        wins = self.wins.get(model_name, {})
+        ranked = sorted(
+            self.backends(model_file),
+            key=lambda b: wins.get(backend_name(b), 0),
+            reverse=True,
+        )
+        self._pruned[model_name] = ranked[:keep]
+
+    def solve(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance with every backend in parallel; return the first solution.
+
+        The solution is returned as a dictionary of output variables. A time budget
+        given here overrides the solver's own.
+        """
+        if timeout_seconds is None:
+            timeout_seconds = self._timeout_seconds
+        model_name = Path(model_file).name
+        backends = self.backends(model_file)
+        if not backends:
+            raise ValueError(f"no backends available for model: {model_name}")
+
+        # The budget covers the whole race, however many backends fail before a win
+        deadline = (
+            None if timeout_seconds is None else time.monotonic() + timeout_seconds
+        )
+        pending: Dict[Any, _Worker] = {}
+        for backend in backends:
+            worker = self._worker(backend)
+            worker.conn.send((model_file, instance_params))
+            pending[worker.conn] = worker
+
+        errors: List[str] = []
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                ready = wait(
+                    list(pending),
+                    timeout=None if remaining is None else max(remaining, 0),
+                )
+                if not ready:
+                    raise TimeoutError(
+                        f"no backend solved {model_name} within {timeout_seconds}s"
+                    )
+                for conn in ready:
+                    worker = pending.pop(conn)
+                    try:
+                        name, solution, error = worker.conn.recv()
+                    except EOFError:
+                        # E.g. the worker ran out of memory; it is restarted next race
+                        name = backend_name(worker.backend)
+                        solution, error = None, "worker exited"
+                    if error is None:
+                        self._record(model_name, name)
+                        return solution
+                    errors.append(f"{name}: {error}")
+            raise ValueError(f"every backend failed: {'; '.join(errors)}")
+        finally:
+            # Stop the backends that are still solving; they restart next race
+            for worker in pending.values():
+                worker.stop()
+
+    def _worker(self, backend: Backend) -> _Worker:
+        """Return the worker of a backend, starting it if it is not running."""
+        worker = self._workers.get(id(backend))
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                worker.stop()
+            worker = self._workers[id(backend)] = _Worker(backend)
+        return worker
+
+    def close(self):
+        """Stop every worker process."""
+        for worker in self._workers.values():
+            worker.stop()
+        self._workers.clear()
+
+    def _record(self, model_name: str, winner: str):
+        """Record the winner of a race."""
+        self.last_winner = winner
+        self.races[model_name] = self.races.get(model_name, 0) + 1
+        wins = self.wins.setdefault(model_name, {})
+        wins[winner] = wins.get(winner, 0) + 1
+
+
+class FallbackSolver:
+    def __init__(
+        self,
+        backends: List[Backend],
+        timeout_seconds: Optional[float] = None,
+        model_timeouts: Optional[Dict[str, float]] = None,
+        models: Optional[Mapping[str, Tuple[Path, ParamsConverter]]] = None,
+    ):
+        """Create a solver that tries backends in turn until one solves the instance.
+
+        Each backend gets the time budget given to `solve`, else the one in
+        `model_timeouts` for the model's file name, else `timeout_seconds`. When a
+        backend runs out of time or fails, the next one is tried. Engines with a budget
+        run in a child process, so that they can be stopped when it expires.
+
+        Backends named in `models` solve another model instead, given its file and a
+        function that converts the instance's parameters to it, e.g. so that MiniZinc
+        solves a model that the native engine does not take.
+        """
+        if not backends:
+            raise ValueError("no backends given")
+        self._backends = backends
+        self._timeout_seconds = timeout_seconds
+        self._model_timeouts = model_timeouts or {}
+        self._models = models or {}
+        self._solvers: Dict[str, ConstraintSolver] = {}
+        # Single-engine races by backend, whose workers are reused between solves
+        self._portfolios: Dict[int, PortfolioSolver] = {}
+        self.last_backend: Optional[str] = None
+        self.last_timings: Dict[str, float] = {}
+        self.last_statistics: Dict[str, Any] = {}
+
+    def budget(
+        self, model_file: Path, timeout_seconds: Optional[float] = None
+    ) -> Optional[float]:
+        """Return the time budget for solving a model, in seconds, if there is one."""
+        if timeout_seconds is not None:
+            return timeout_seconds
+        return self._model_timeouts.get(Path(model_file).name, self._timeout_seconds)
+
+    def solve(
+        self,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """Solve an instance with the first backend that finishes within its budget.
+
+        The solution is returned as a dictionary of output variables, whichever
+        backend found it. The statistics of the backend that solved it are kept in `last_statistics`,
+        along with its name and the number of backends tried.
+        """
+        budget = self.budget(model_file, timeout_seconds)
+        fallback_errors = _fallback_errors()
+        errors = []
+        for attempt, backend in enumerate(self._backends, 1):
+            name = backend_name(backend)
+            start = time.perf_counter()
+            try:
+                backend_model, backend_params = model_file, instance_params
+                if name in self._models:
+                    backend_model, convert = self._models[name]
+                    backend_params = convert(instance_params)
+                solution, solver = self._solve(
+                    backend, backend_model, backend_params, budget
+                )
+            except fallback_errors as e:
+                logger.warning("%s failed, falling back: %s", name, e)
+                errors.append(f"{name}: {e}")
+                continue
+            self.last_backend = name
+            self.last_timings = getattr(
+                solver, "last_timings", {"total": time.perf_counter() - start}
+            )
+            self.last_statistics = {
+                "backend": name,
+                "attempts": attempt,
+                **getattr(solver, "last_statistics", {}),
+            }
+            return solution
+
+        message = f"every backend failed: {'; '.join(errors)}"
+        if budget is not None:
+            raise TimeoutError(message)
+        raise ValueError(message)
+
+    def close(self):
+        """Stop the worker processes of engines raced against their budget."""
+        for portfolio in self._portfolios.values():
+            portfolio.close()
+        self._portfolios.clear()
+
+    def _solve(
+        self,
+        backend: Backend,
+        model_file: Path,
+        instance_params: Dict[str, Any],
+        budget: Optional[float],
+    ) -> Tuple[Any, Any]:
+        """Solve an instance with one backend; return the solution and its solver."""
+        if isinstance(backend, str):
+            if backend not in self._solvers:
+                self._solvers[backend] = ConstraintSolver(backend)
+            solver = self._solvers[backend]
+            result = solver.solve(model_file, instance_params, budget)
+            return solution_dict(result), solver
+        if budget is None:
+            return backend.solve(model_file, instance_params), backend
+        # Race the engine alone, so that it is killed when the budget expires
+        if id(backend) not in self._portfolios:
+            self._portfolios[id(backend)] = PortfolioSolver(
+                [backend], include_engines=False
+            )
+        portfolio = self._portfolios[id(backend)]
+        return portfolio.solve(model_file, instance_params, budget), portfolio
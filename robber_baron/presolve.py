@@ -0,0 +1,169 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Values of the cells of a fixed grid, as passed to presolved models
+UNKNOWN = -1
+EMPTY = 0
+FILLED = 1
+
+Fixed = List[List[int]]
+Deduction = Callable[[Dict[str, Any], Fixed], None]
+
+
+class Presolved(NamedTuple):
+    model_file: Path
+    instance_params: Dict[str, Any]
+    # Fraction of the grid's cells that the non-trivial deductions fixed
+    fixed: float
+
+
+def fix(fixed: Fixed, i: int, j: int, value: int):
+    """Fix a cell, with zero-based indices; raise `ValueError` on a contradiction."""
+    if fixed[i][j] not in (UNKNOWN, value):
+        raise ValueError(f"cell ({i}, {j}) cannot be both {fixed[i][j]} and {value}")
+    fixed[i][j] = value
+
+
+class Presolver:
+    def __init__(
+        self,
+        model_file: Path,
+        param: str,
+        shape: Callable[[Dict[str, Any]], Tuple[int, int]],
+        deductions: Sequence[Deduction],
+        trivial: Sequence[Deduction] = (),
+    ):
+        """Create a presolve stage for instances of a model.
+
+        Each deduction fixes cells of a grid of the given shape from the instance
+        parameters, and may build on the cells fixed by the deductions before it.
+        The fixed grid is passed to `model_file` as `param`, with unknown cells as
+        -1, so that MiniZinc flattens a smaller problem. The `trivial` deductions,
+        which the model makes as cheaply itself, run first, and the cells they fix
+        are not counted as fixed.
+        """
+        self.model_file = model_file
+        self.param = param
+        self.shape = shape
+        self.deductions = list(deductions)
+        self.trivial = list(trivial)
+
+    def presolve(self, instance_params: Dict[str, Any]) -> Presolved:
+        """Run every deduction, returning the presolved model and parameters."""
+        num_rows, num_cols = self.shape(instance_params)
+        fixed = [[UNKNOWN] * num_cols for _ in range(num_rows)]
+        for deduce in self.trivial:
+            deduce(instance_params, fixed)
+        trivial = _known(fixed)
+        for deduce in self.deductions:
+            deduce(instance_params, fixed)
+        return Presolved(
+            self.model_file,
+            {**instance_params, self.param: fixed},
+            (
+                (_known(fixed) - trivial) / (num_rows * num_cols)
+                if num_rows * num_cols
+                else 0.0
+            ),
+        )
+
+
+def _known(fixed: Fixed) -> int:
+    """Return the number of fixed cells of a grid."""
+    return sum(value != UNKNOWN for row in fixed for value in row)
+
+
+def campsites_shape(instance_params: Dict[str, Any]) -> Tuple[int, int]:
+    """Return the number of rows and columns of a Campsites instance."""
+    return instance_params["num_rows"], instance_params["num_cols"]
+
+
+def campsites_empty_lines(instance_params: Dict[str, Any], fixed: Fixed):
+    """Fix every cell of the rows and columns without tents as empty."""
+    for i, count in enumerate(instance_params["num_tents_in_row"]):
+        if count == 0:
+            for j in range(len(fixed[i])):
+                fix(fixed, i, j, EMPTY)
+    for j, count in enumerate(instance_params["num_tents_in_col"]):
+        if count == 0:
+            for i in range(len(fixed)):
+                fix(fixed, i, j, EMPTY)
+
+
+def campsites_away_from_trees(instance_params: Dict[str, Any], fixed: Fixed):
+    """Fix every cell that holds a tree, or is not cardinally adjacent to one, as empty."""
+    num_rows, num_cols = len(fixed), len(fixed[0]) if fixed else 0
+    # MiniZinc uses 1-based indexing
+    trees = {
+        (i - 1, j - 1)
+        for i, j in zip(instance_params["tree_rows"], instance_params["tree_cols"])
+    }
+    candidates = {
+        (i + di, j + dj)
+        for i, j in trees
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+    }
+    for i in range(num_rows):
+        for j in range(num_cols):
+            if (i, j) in trees or (i, j) not in candidates:
+                fix(fixed, i, j, EMPTY)
+
+
+def numbergrids_shape(instance_params: Dict[str, Any]) -> Tuple[int, int]:
+    """Return the number of rows and columns of a Numbergrids instance."""
+    return instance_params["grid_size"], instance_params["grid_size"]
+
+
+def _line_overlaps(clues: List[int], size: int) -> List[int]:
+    """Return the cells of a line that every placement of its clues agrees on.
+
+    A cell is filled if a block covers it in both its leftmost and its rightmost
+    placement, and empty if no block can reach it. A line whose blocks and gaps
+    fill it is fixed entirely, as is a line without blocks.
+    """
+    blocks = [c for c in clues if c]
+    line = [EMPTY] * size
+    slack = size - (sum(blocks) + len(blocks) - 1) if blocks else size
+    if slack < 0:
+        raise ValueError(f"clues {clues} do not fit in {size} cells")
+    start = 0
+    for length in blocks:
+        # The block starts between `start` and `start + slack`
+        for k in range(start, start + length + slack):
+            line[k] = FILLED if start + slack <= k < start + length else UNKNOWN
+        start += length + 1
+    return line
+
+
+def numbergrids_overlaps(instance_params: Dict[str, Any], fixed: Fixed):
+    """Fix the cells that the clues of their row or column force, line by line."""
+    size = instance_params["grid_size"]
+    for i, clues in enumerate(instance_params["row_clues"]):
+        for j, value in enumerate(_line_overlaps(clues, size)):
+            if value != UNKNOWN:
+                fix(fixed, i, j, value)
+    for j, clues in enumerate(instance_params["col_clues"]):
+        for i, value in enumerate(_line_overlaps(clues, size)):
+            if value != UNKNOWN:
+                fix(fixed, i, j, value)
+
+
+# Map model file names to the presolve stages of their instances
+PRESOLVERS = {
+    "campsites.mzn": Presolver(
+        MODELS_DIR / "campsites_presolved.mzn",
+        "fixed_tents",
+        campsites_shape,
+        [campsites_empty_lines],
+        # The model itself only places tents next to trees
+        trivial=[campsites_away_from_trees],
+    ),
+    "numbergrids.mzn": Presolver(
+        MODELS_DIR / "numbergrids_presolved.mzn",
+        "fixed_grid",
+        numbergrids_shape,
+        [numbergrids_overlaps],
+    ),
+}
@@ -0,0 +1,547 @@
+import base64
+import json
+import logging
+import os
+from pathlib import Path
+from requests.structures import CaseInsensitiveDict
+from selenium.common import exceptions
+from selenium.webdriver.remote.webelement import WebElement
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from robber_baron import Browser
+from robber_baron.transport import Page, Transport
+
+logger = logging.getLogger(__name__)
+
+# WebDriver methods and attributes that are recorded; the rest are passed through
+DRIVER_CALLS = {
+    "execute_async_script",
+    "execute_script",
+    "get",
+    "get_cookies",
+    "get_log",
+    "quit",
+    "set_script_timeout",
+}
+DRIVER_ATTRIBUTES = {"requests"}
+
+# Interactions whose first argument, e.g. a URL or script, must match when replayed
+CHECKED_CALLS = {"execute_async_script", "execute_script", "get", "get_json", "submit"}
+
+
+class RecordedResponse:
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes):
+        """Create a response captured by the selenium-wire proxy, as replayed."""
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+
+
+class RecordedRequest:
+    def __init__(
+        self, url: str, method: str, response: Optional[RecordedResponse] = None
+    ):
+        """Create a request captured by the selenium-wire proxy, as replayed."""
+        self.url = url
+        self.method = method
+        self.response = response
+
+
+class Recorder:
+    def __init__(self, path: Path, argv: Optional[List[str]] = None):
+        """Create a recorder that writes browser and HTTP interactions to a file.
+
+        The file is written as JSON lines: a header with the command-line arguments,
+        then one line per interaction with its arguments, result or error, the
+        number of WebDriver round trips it took and how long it took.
+        """
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+        # Map WebDriver element IDs to the references used in the recording
+        self._refs: Dict[str, str] = {}
+        self._round_trips = 0
+        self._write({"argv": sys.argv[1:] if argv is None else argv})
+
+    def browser(self, make: Callable[[], Browser]) -> Browser:
+        """Start a browser and record its interactions."""
+        browser = make()
+        browser.record(self)
+        return browser
+
+    def transport(self) -> Transport:
+        """Create an HTTP transport that records its requests."""
+        return RecordingTransport(self)
+
+    def driver(self, driver: Any) -> "RecordingDriver":
+        """Wrap a WebDriver, so that its interactions are recorded."""
+        execute = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self._round_trips += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counted_execute
+        return RecordingDriver(driver, self)
+
+    def call(
+        self,
+        target: str,
+        name: str,
+        function: Callable[..., Any],
+        args: Optional[Tuple[Any, ...]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Call a method and record it, or read an attribute if there are no args."""
+        entry: Dict[str, Any] = {
+            "target": target,
+            "name": name,
+            "args": None if args is None else self._encode(args),
+        }
+        if kwargs:
+            entry["kwargs"] = self._encode(kwargs)
+        round_trips = self._round_trips
+        start = time.perf_counter()
+        try:
+            if args is None:
+                value = function()
+            else:
+                value = function(*self._unwrap(args), **self._unwrap(kwargs or {}))
+        except Exception as e:
+            entry["error"] = {
+                "type": type(e).__name__,
+                "message": getattr(e, "msg", str(e)),
+            }
+            raise
+        else:
+            entry["result"] = self._encode(value)
+            return self._wrap(value)
+        finally:
+            entry["round_trips"] = self._round_trips - round_trips
+            entry["seconds"] = time.perf_counter() - start
+            self._write(entry)
+
+    def intercept(
+        self, interceptor: Optional[Callable[[Any, Any], None]]
+    ) -> Optional[Callable[[Any, Any], None]]:
+        """Wrap a selenium-wire response interceptor, so that responses are recorded."""
+        if interceptor is None:
+            return None
+
+        def recorded_interceptor(request: Any, response: Any):
+            self._write(
+                {
+                    "target": "proxy",
+                    "name": "response",
+                    "result": self._encode_request(request, response),
+                }
+            )
+            interceptor(request, response)
+
+        return recorded_interceptor
+
+    def close(self):
+        """Close the recording."""
+        with self._lock:
+            self._file.close()
+
+    def _write(self, entry: Dict[str, Any]):
+        """Append an entry to the recording; called by the proxy's thread too."""
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+
+    def _encode(self, value: Any) -> Any:
+        """Convert a value into JSON, replacing elements with references."""
+        if isinstance(value, RecordingElement):
+            value = value._element
+        if isinstance(value, WebElement):
+            return {"$element": self._refs.setdefault(value.id, f"e{len(self._refs)}")}
+        if isinstance(value, Page):
+            return {"$page": {"url": value.url, "text": value.text}}
+        if isinstance(value, bytes):
+            return {"$bytes": base64.b64encode(value).decode("ascii")}
+        if isinstance(value, dict):
+            return {str(k): self._encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        if hasattr(value, "url") and hasattr(value, "response"):
+            # A request captured by selenium-wire
+            return self._encode_request(value, value.response)
+        return str(value)
+
+    def _encode_request(self, request: Any, response: Any) -> Dict[str, Any]:
+        """Convert a request captured by selenium-wire and its response into JSON."""
+        return {
+            "$request": {
+                "url": request.url,
+                "method": request.method,
+                "response": (
+                    None
+                    if response is None
+                    else {
+                        "status_code": response.status_code,
+                        "headers": dict(response.headers.items()),
+                        "body": self._encode(response.body),
+                    }
+                ),
+            }
+        }
+
+    def _wrap(self, value: Any) -> Any:
+        """Wrap the elements in a result, so that their interactions are recorded."""
+        if isinstance(value, WebElement):
+            return RecordingElement(value, self._refs[value.id], self)
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._wrap(v) for k, v in value.items()}
+        return value
+
+    def _unwrap(self, value: Any) -> Any:
+        """Replace wrapped elements in arguments with the elements they wrap."""
+        if isinstance(value, RecordingElement):
+            return value._element
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._unwrap(v) for v in value)
+        if isinstance(value, dict):
+            return {k: self._unwrap(v) for k, v in value.items()}
+        return value
+
+
+class RecordingDriver:
+    def __init__(self, driver: Any, recorder: Recorder):
+        """Wrap a WebDriver, recording the interactions that `Browser` makes."""
+        object.__setattr__(self, "_driver", driver)
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __getattr__(self, name: str) -> Any:
+        """Record a call or an attribute read, or pass it through to the driver."""
+        if name in DRIVER_ATTRIBUTES:
+            return self._recorder.call(
+                "driver", name, lambda: getattr(self._driver, name)
+            )
+        if name in DRIVER_CALLS:
+            method = getattr(self._driver, name)
+            return lambda *args, **kwargs: self._recorder.call(
+                "driver", name, method, args, kwargs
+            )
+        return getattr(self._driver, name)
+
+    def __setattr__(self, name: str, value: Any):
+        """Set an attribute of the driver, recording responses that it intercepts."""
+        if name == "response_interceptor":
+            value = self._recorder.intercept(value)
+        setattr(self._driver, name, value)
+
+    def __delattr__(self, name: str):
+        """Delete an attribute of the driver, e.g. its request history."""
+        delattr(self._driver, name)
+
+
+class RecordingElement:
+    def __init__(self, element: WebElement, ref: str, recorder: Recorder):
+        """Wrap an element, recording every call and attribute read."""
+        self._element = element
+        self._ref = ref
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        """Record a call or an attribute read, e.g. `tag_name`."""
+        if name.startswith("_") or name in ("id", "parent"):
+            return getattr(self._element, name)
+        if callable(getattr(type(self._element), name, None)):
+            method = getattr(self._element, name)
+            return lambda *args, **kwargs: self._recorder.call(
+                self._ref, name, method, args, kwargs
+            )
+        return self._recorder.call(
+            self._ref, name, lambda: getattr(self._element, name)
+        )
+
+
+class RecordingTransport(Transport):
+    def __init__(self, recorder: Recorder, **kwargs):
+        """Create an HTTP transport that records its requests and responses."""
+        super().__init__(**kwargs)
+        self._recorder = recorder
+
+    def get(self, url: str) -> Page:
+        """Get a page by URL."""
+        return self._recorder.call("transport", "get", super().get, (url,))
+
+    def get_json(self, url: str) -> Any:
+        """Get a JSON document by URL."""
+        return self._recorder.call("transport", "get_json", super().get_json, (url,))
+
+    def submit(self, url: str, fields: Dict[str, str]) -> Page:
+        """Submit form fields to a URL, returning the resulting page."""
+        return self._recorder.call("transport", "submit", super().submit, (url, fields))
+
+
+class Replayer:
+    def __init__(
+        self,
+        entries: List[Dict[str, Any]],
+        latency_seconds: float = 0.0,
+        realtime: bool = False,
+    ):
+        """Create a replayer that serves recorded interactions in order.
+
+        Each WebDriver round trip and HTTP request takes `latency_seconds`. In real
+        time, each interaction also takes as long as it did when it was recorded.
+        An interaction that does not match the next recorded one raises `ValueError`.
+        """
+        self.argv: List[str] = entries[0]["argv"] if entries else []
+        self._entries = entries[1:]
+        self._next = 0
+        self._latency_seconds = latency_seconds
+        self._realtime = realtime
+        self._driver: Optional[ReplayDriver] = None
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "Replayer":
+        """Load a recording written by a `Recorder`."""
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()], **kwargs)
+
+    def browser(self, make: Optional[Callable[[], Browser]] = None) -> Browser:
+        """Create a browser whose driver replays the recording; `make` is ignored."""
+        self._driver = ReplayDriver(self, self._latency_seconds)
+        return Browser(self._driver)
+
+    def transport(self) -> Transport:
+        """Create an HTTP transport that replays the recording."""
+        return ReplayTransport(self)
+
+    def remaining(self) -> int:
+        """Return the number of interactions that have not been replayed."""
+        return len(self._entries) - self._next
+
+    def close(self):
+        """Warn if the recording was not replayed to the end."""
+        if self.remaining():
+            logger.warning(
+                "%d recorded interactions were not replayed", self.remaining()
+            )
+
+    def is_read(self, target: str, name: str) -> bool:
+        """Return true iff the next interaction reads an attribute of a target."""
+        self._deliver_responses()
+        if self._next >= len(self._entries):
+            return False
+        entry = self._entries[self._next]
+        return (entry["target"], entry["name"]) == (target, name) and entry[
+            "args"
+        ] is None
+
+    def serve(
+        self,
+        target: str,
+        name: str,
+        args: Optional[Tuple[Any, ...]] = None,
+    ) -> Any:
+        """Replay the next interaction, which must be with a target by name."""
+        self._deliver_responses()
+        if self._next >= len(self._entries):
+            raise ValueError(f"recording ended before {target}.{name}")
+        entry = self._entries[self._next]
+        expected = (entry["target"], entry["name"])
+        first = list(args or ())[:1]
+        if name in CHECKED_CALLS:
+            expected += tuple(entry["args"][:1])
+        if expected != (target, name, *first)[: len(expected)]:
+            raise ValueError(
+                f"expected {_describe(*expected)} at interaction {self._next + 1},"
+                f" but got {_describe(target, name, *first)}"
+            )
+        self._next += 1
+
+        if self._realtime:
+            time.sleep(entry["seconds"])
+        if target == "transport":
+            time.sleep(self._latency_seconds)
+        if self._driver is not None:
+            for _ in range(entry["round_trips"]):
+                self._driver.execute("replay")
+        self._deliver_responses()
+        if "error" in entry:
+            raise _exception(entry["error"])
+        return self._decode(entry["result"])
+
+    def _deliver_responses(self):
+        """Pass recorded responses that are due to the driver's interceptor."""
+        while (
+            self._next < len(self._entries)
+            and self._entries[self._next]["target"] == "proxy"
+        ):
+            request = self._decode(self._entries[self._next]["result"])
+            self._next += 1
+            interceptor = getattr(self._driver, "response_interceptor", None)
+            if interceptor is not None:
+                interceptor(request, request.response)
+
+    def _decode(self, value: Any) -> Any:
+        """Convert a recorded value back, replacing references with elements."""
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if "$element" in value:
+            return ReplayElement(value["$element"], self)
+        if "$page" in value:
+            return Page(value["$page"]["url"], value["$page"]["text"])
+        if "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        if "$request" in value:
+            request = value["$request"]
+            response = request["response"]
+            return RecordedRequest(
+                request["url"],
+                request["method"],
+                (
+                    None
+                    if response is None
+                    else RecordedResponse(
+                        response["status_code"],
+                        response["headers"],
+                        self._decode(response["body"]),
+                    )
+                ),
+            )
+        return {k: self._decode(v) for k, v in value.items()}
+
+
+def _describe(target: str, name: str, *args: Any) -> str:
+    """Describe an interaction in an error message, shortening long arguments."""
+    shown = [
+        repr(arg if len(str(arg)) <= 60 else f"{str(arg)[:57]}...") for arg in args
+    ]
+    return f"{target}.{name}({', '.join(shown)})"
+
+
+def _exception(error: Dict[str, str]) -> Exception:
+    """Recreate a recorded exception, as a WebDriverException if it is unknown."""
+    cls = getattr(exceptions, error["type"], None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        return cls(error["message"])
+    return exceptions.WebDriverException(f"{error['type']}: {error['message']}")
+
+
+class ReplayDriver:
+    def __init__(self, replayer: Replayer, latency_seconds: float = 0.0):
+        """Create a stand-in for the subset of the WebDriver API that `Browser` uses.
+
+        Every command is served from a recording instead of a browser, and each
+        round trip to the driver takes `latency_seconds`.
+        """
+        self._replayer = replayer
+        self._latency_seconds = latency_seconds
+        self.session_id = "replay"
+        self.w3c = True
+        self.scopes: List[str] = []
+        self.response_interceptor: Optional[Callable[[Any, Any], None]] = None
+
+    def execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Simulate a round trip to the driver."""
+        time.sleep(self._latency_seconds)
+        return {"value": None}
+
+    def get(self, url: str):
+        """Load a page."""
+        self._replayer.serve("driver", "get", (url,))
+
+    def execute_script(self, script: str, *args) -> Any:
+        """Execute JavaScript in the page."""
+        return self._replayer.serve("driver", "execute_script", (script, *args))
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        """Execute asynchronous JavaScript in the page."""
+        return self._replayer.serve("driver", "execute_async_script", (script, *args))
+
+    def set_script_timeout(self, time_to_wait: float):
+        """Set how long asynchronous scripts may run."""
+        self._replayer.serve("driver", "set_script_timeout", (time_to_wait,))
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        """Return the cookies of the session."""
+        return self._replayer.serve("driver", "get_cookies", ())
+
+    def get_log(self, log_type: str) -> List[Dict[str, Any]]:
+        """Return and clear the entries of a browser log, e.g. the performance log."""
+        return self._replayer.serve("driver", "get_log", (log_type,))
+
+    @property
+    def requests(self) -> List[RecordedRequest]:
+        """Return the requests captured by the selenium-wire proxy."""
+        return self._replayer.serve("driver", "requests")
+
+    @requests.deleter
+    def requests(self):
+        """Clear the captured requests; the recording already reflects this."""
+
+    def quit(self):
+        """Quit the browser."""
+        self._replayer.serve("driver", "quit", ())
+
+
+class ReplayElement:
+    def __init__(self, ref: str, replayer: Replayer):
+        """Create a stand-in for an element, serving its interactions from a recording."""
+        self.id = ref
+        self._replayer = replayer
+
+    def __getattr__(self, name: str) -> Any:
+        """Replay a call or an attribute read, e.g. `tag_name`."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._replayer.is_read(self.id, name):
+            return self._replayer.serve(self.id, name)
+        return lambda *args, **kwargs: self._replayer.serve(self.id, name, args)
+
+    def __eq__(self, other: object) -> bool:
+        """Return true iff both stand for the same element."""
+        return isinstance(other, ReplayElement) and other.id == self.id
+
+    def __hash__(self) -> int:
+        """Hash the element by its reference."""
+        return hash(self.id)
+
+
+class ReplayTransport(Transport):
+    def __init__(self, replayer: Replayer, **kwargs):
+        """Create an HTTP transport that serves requests from a recording."""
+        super().__init__(**kwargs)
+        self._replayer = replayer
+
+    def get(self, url: str) -> Page:
+        """Get a page by URL."""
+        return self._replayer.serve("transport", "get", (url,))
+
+    def get_json(self, url: str) -> Any:
+        """Get a JSON document by URL."""
+        return self._replayer.serve("transport", "get_json", (url,))
+
+    def submit(self, url: str, fields: Dict[str, str]) -> Page:
+        """Submit form fields to a URL, returning the resulting page."""
+        return self._replayer.serve("transport", "submit", (url, fields))
+
+
+def recording_from_env() -> Optional[Union[Recorder, Replayer]]:
+    """Return a recorder if PB_RECORD_FILE is set, or a replayer if PB_REPLAY_FILE is.
+
+    Replayed round trips take PB_REPLAY_LATENCY_MS milliseconds, by default none.
+    """
+    record_file = os.getenv("PB_RECORD_FILE")
+    if record_file:
+        return Recorder(Path(record_file))
+    replay_file = os.getenv("PB_REPLAY_FILE")
+    if replay_file:
+        return Replayer.load(
+            Path(replay_file),
+            latency_seconds=float(os.getenv("PB_REPLAY_LATENCY_MS", "0")) / 1000,
+        )
+    return None
@@ -0,0 +1,296 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import os
+from pathlib import Path
+import queue
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from robber_baron import campsites, ConstraintSolver, Engine, numbergrids, sudoku
+from robber_baron import solution_dict
+from robber_baron.engines import MODEL_ENGINES
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Map model file names to the functions that encode their solutions as the bots
+# submit them, and the MiniZinc solver tags that the bots use
+MODELS: Dict[str, Dict[str, Any]] = {
+    "campsites.mzn": {
+        "encode": campsites.encode_solution,
+        "solver_tag": campsites.CampsitesBot.solver_tag,
+    },
+    "numbergrids.mzn": {
+        "encode": numbergrids.encode_solution,
+        "solver_tag": numbergrids.NumbergridsBot.solver_tag,
+    },
+    "numbergrids_regular.mzn": {
+        "encode": numbergrids.encode_solution,
+        "solver_tag": numbergrids.NumbergridsBot.solver_tag,
+    },
+    "sudoku.mzn": {
+        "encode": sudoku.encode_solution,
+        "solver_tag": sudoku.SudokuBot.solver_tag,
+    },
+}
+
+# Engines created in this worker process, by backend and model
+_engines: Dict[str, Engine] = {}
+
+
+def _engine(backend: Optional[str], model: str) -> Engine:
+    """Return this process's engine for a model, creating it on first use."""
+    key = f"{backend}:{model}"
+    if key not in _engines:
+        if backend == "native":
+            if model not in MODEL_ENGINES:
+                raise ValueError(f"no native engine for model: {model}")
+            _engines[key] = MODEL_ENGINES[model]()
+        else:
+            _engines[key] = ConstraintSolver(backend or MODELS[model]["solver_tag"])
+    return _engines[key]
+
+
+def solve_batch(
+    backend: Optional[str], batch: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Solve and encode a batch of instances; run in a worker process.
+
+    Each instance has its line number, model and parameters. Each result has the
+    line number and model, with the encoded solution and solve time, or an error.
+    """
+    results = []
+    for item in batch:
+        result = {"line": item["line"], "model": item["model"]}
+        start = time.perf_counter()
+        try:
+            model = item["model"]
+            solution = _engine(backend, model).solve(
+                MODELS_DIR / model, item["instance_params"]
+            )
+            if not isinstance(solution, dict):
+                solution = solution_dict(solution)
+            result["solution"] = MODELS[model]["encode"](
+                item["instance_params"], solution
+            )
+        except Exception as e:
+            result["error"] = repr(e)
+        result["seconds"] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def read_instances(
+    lines: Iterable[str], default_model: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Parse JSON lines of instances, numbering them from 1.
+
+    Lines are records like those of PB_CAPTURE_FILE and the benchmark corpus, with a
+    model and instance parameters, or bare instance parameters of the default model.
+    Lines that cannot be parsed are yielded with an error instead.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if "instance_params" in record:
+                model = record.get("model", default_model)
+                params = record["instance_params"]
+            else:
+                model, params = default_model, record
+            if model not in MODELS:
+                raise ValueError(f"unsupported model: {model}")
+        except (ValueError, TypeError) as e:
+            yield {"line": number, "error": repr(e)}
+            continue
+        yield {"line": number, "model": model, "instance_params": params}
+
+
+def batches(
+    instances: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group instances into batches of up to a size."""
+    batch: List[Dict[str, Any]] = []
+    for instance in instances:
+        batch.append(instance)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def solve_stream(
+    instances: Iterable[Dict[str, Any]],
+    emit: Callable[[Dict[str, Any]], None],
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 8,
+    max_in_flight: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Solve instances across a process pool, emitting each result as it finishes.
+
+    Instances are sent to workers in batches, to amortize the cost of sending them
+    between processes. At most `max_in_flight` batches, by default twice the number
+    of workers, are read ahead of the results, so that memory stays flat however
+    many instances there are. Instances are read on a thread, so that results are
+    emitted as they finish even while the input is slow, e.g. on stdin. Returns a
+    summary of the throughput.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    summary: Dict[str, Any] = {"solved": 0, "failed": 0, "solve_seconds": 0.0}
+    # Finished batches, lines that could not be parsed, and the end of the input,
+    # in the order they happen; results are only emitted from this thread
+    events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    slots = threading.BoundedSemaphore(max_in_flight)
+
+    def read(pool: ProcessPoolExecutor):
+        submitted = 0
+        try:
+            for batch in batches(instances, batch_size):
+                # Report lines that could not be parsed without sending them to a
+                # worker
+                errors = [item for item in batch if "error" in item]
+                if errors:
+                    events.put(("errors", errors))
+                batch = [item for item in batch if "error" not in item]
+                if not batch:
+                    continue
+                slots.acquire()
+                future = pool.submit(solve_batch, backend, batch)
+                future.add_done_callback(lambda f: events.put(("done", f)))
+                submitted += 1
+        except BaseException as e:
+            events.put(("failed", e))
+        finally:
+            events.put(("end", submitted))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        reader = threading.Thread(target=read, args=(pool,), daemon=True)
+        reader.start()
+        finished = 0
+        submitted: Optional[int] = None
+        while submitted is None or finished < submitted:
+            kind, value = events.get()
+            if kind == "done":
+                finished += 1
+                slots.release()
+                for result in value.result():
+                    summary["failed" if "error" in result else "solved"] += 1
+                    summary["solve_seconds"] += result["seconds"]
+                    emit(result)
+            elif kind == "errors":
+                for item in value:
+                    summary["failed"] += 1
+                    emit(item)
+            elif kind == "failed":
+                raise value
+            else:
+                submitted = value
+        reader.join()
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["per_second"] = (
+        summary["solved"] / summary["seconds"] if summary["seconds"] else 0.0
+    )
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command-line arguments."""
+    parser = ArgumentParser(
+        description="Solve instances from JSON lines, printing encoded solutions"
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="JSON lines file of instances, or '-' for stdin; default '-'",
+    )
+    parser.add_argument(
+        "-m",
+        "--model",
+        choices=list(MODELS),
+        help="Model of lines that hold bare instance parameters",
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        help="'native' or a MiniZinc solver tag; default the bot's solver tag",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="Worker processes; default the number of CPUs",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Instances sent to a worker at a time; default 8",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        help="Batches read ahead of the results; default twice the workers",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Solve instances from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    out: TextIO = sys.stdout
+
+    def emit(result: Dict[str, Any]):
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+    f = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        summary = solve_stream(
+            read_instances(f, args.model),
+            emit,
+            backend=args.backend,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+        )
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    total = summary["solved"] + summary["failed"]
+    logger.info(
+        "Solved %d of %d instances in %.2fs: %.1f per second,"
+        " %.1fms of solver time each",
+        summary["solved"],
+        total,
+        summary["seconds"],
+        summary["per_second"],
+        1000 * summary["solve_seconds"] / total if total else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    main()
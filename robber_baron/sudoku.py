@@ -1,9 +1,16 @@
 from argparse import ArgumentParser
 from enum import Enum
-from more_itertools import sliced
+import logging
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from robber_baron import Bot
+from robber_baron import Bot, Browser, Engine
+from robber_baron.engines import SudokuEngine
+from robber_baron.grid import Grid
+from robber_baron.portfolio import FallbackSolver, named_backends
+from robber_baron.waits import Condition
+
+logger = logging.getLogger(__name__)
 
 
 class Difficulty(Enum):
@@ -23,50 +30,68 @@ DIFFICULTY_TO_ID = {
     Difficulty.INSANE: "i",
 }
 
+# Characters of the cells in the page state and solution; 0 is an empty cell
+ALPHABET = "0123456789"
+
+
+def encode_solution(instance_params: Dict[str, Any], solution: Any) -> str:
+    """Encode the digits of a solution row by row, as they are filled in."""
+    if len(solution["puzzle"]) >= len(ALPHABET):
+        raise ValueError("only boards of up to 9x9 can be encoded")
+    return Grid.from_rows(solution["puzzle"]).encode(ALPHABET)
+
 
 class SudokuBot(Bot):
     def play(self, difficulty: Difficulty):
         """Play a Sudoku game."""
         difficulty_id = DIFFICULTY_TO_ID[difficulty]
-        new_game_url = f"https://sudoku.puzzlebaron.com/init.php?d={difficulty_id}"
-        print(f"Loading new game URL: {new_game_url} ...")
-        self.browser.get(new_game_url)
 
-        print("Starting game ...")
-        self.browser.find_element("td > a.button_orange").click()
-
-        boxes = [
-            self.browser.find_element(f"div#box{i+1}").get_attribute("innerText")
-            for i in range(81)
-        ]
-        initial_state = list(sliced([int(b) if len(b) > 0 else 0 for b in boxes], 9))
-        print(f"Extracted initial game state: {initial_state}")
-
-        print("Solving instance with MiniZinc ...")
         model_file = Path(__file__).parent / "models" / "sudoku.mzn"
-        result = self.solver.solve(model_file, {"start": initial_state})
-        solution = result["puzzle"]
-        print(f"Found solution: {solution}")
-
-        # TODO: reverse engineer encoding logic instead of filling in grid manually
-        print("Filling in grid ...")
-        for j in range(9):
-            for i in range(9):
-                if initial_state[j][i] == 0:
-                    self.browser.execute_script(
-                        "document.getElementById('box' + arguments[0]).innerText = arguments[1]",
-                        str((j * 9) + i + 1),
-                        solution[j][i],
-                    )
-
-        print("Submitting game ...")
-        self.browser.execute_script("window.xmlhttpPost2('check.php')")
-
-        print("Verifying submission ...")
-        _ = self.browser.find_element('div#widgetresponse a[href="init.php"]')
-
-
-def parse_args():
+        self.warm_up(model_file)
+
+        with self.span("load"):
+            new_game_url = f"https://sudoku.puzzlebaron.com/init.php?d={difficulty_id}"
+            logger.info("Loading new game URL: %s ...", new_game_url)
+            self.browser.get(new_game_url)
+
+            logger.info("Starting game ...")
+            self.browser.find_element("td > a.button_orange").click()
+
+        with self.span("extract"):
+            boxes = self.browser.read_many([f"div#box{i+1}" for i in range(81)])
+            # Empty boxes have no text, and every other box holds one digit
+            start = Grid.parse("".join(b.strip() or "0" for b in boxes), 9, ALPHABET)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted initial game state: %s", start.encode(ALPHABET))
+
+        with self.span("solve"):
+            logger.info("Solving problem instance ...")
+            result = self.solve(
+                model_file,
+                {"start": start.rows()},
+                labels={"difficulty": str(difficulty)},
+            )
+            solution = Grid.from_rows(result["puzzle"]).encode(ALPHABET)
+            logger.debug("Found solution: %s", solution)
+
+        with self.span("submit"):
+            # TODO: reverse engineer encoding logic instead of filling in grid manually
+            logger.info("Filling in grid ...")
+            self.browser.write_many(
+                {f"div#box{k + 1}": solution[k] for k in start.indices(0)}
+            )
+
+            logger.info("Submitting game ...")
+            self.browser.execute_script("window.xmlhttpPost2('check.php')")
+
+        with self.span("verify"):
+            logger.info("Verifying submission ...")
+            _ = self.browser.find_element(
+                'div#widgetresponse a[href="init.php"]', condition=Condition.PRESENT
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None):
     """Parse command-line arguments."""
     parser = ArgumentParser(description="Play a Sudoku game")
     parser.add_argument(
@@ -77,18 +102,66 @@ def parse_args():
         choices=list(Difficulty),
         help="Puzzle difficulty; default 'easy'",
     )
+    parser.add_argument(
+        "--native",
+        action="store_true",
+        help="Solve with the native engine instead of MiniZinc",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="SECONDS",
+        help="Give up on a solver after this many seconds",
+    )
+    parser.add_argument(
+        "--fallback",
+        nargs="+",
+        metavar="BACKEND",
+        help="MiniZinc solver tags and/or 'native' to try in turn within the budget",
+    )
     parser.add_argument(
         "--login", action="store_true", help="Login to Puzzle Baron account"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log board data and timings"
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="Quit without waiting for enter after the game",
+    )
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: Optional[List[str]] = None,
+    browser: Optional[Browser] = None,
+    solvers: Optional[Dict[str, Engine]] = None,
+):
+    """Play a Sudoku game from the command line.
+
+    Warm MiniZinc solvers may be given by tag, e.g. by the daemon.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+    backends = args.fallback or ["native" if args.native else SudokuBot.solver_tag]
+    solver: Optional[Engine] = None
+    if args.fallback or args.budget is not None:
+        solver = FallbackSolver(named_backends(backends, SudokuEngine()), args.budget)
+    elif args.native:
+        solver = SudokuEngine()
+    else:
+        solver = (solvers or {}).get(SudokuBot.solver_tag)
+    bot = SudokuBot(browser=browser, solver=solver)
+    try:
+        if args.login:
+            bot.login()
+        bot.play(args.difficulty)
+    finally:
+        bot.quit(prompt=not args.no_prompt)
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    bot = SudokuBot()
-    if args.login:
-        bot.login()
-    bot.play(args.difficulty)
-
-    input("Press enter to quit: ")
-    bot.browser.quit()
+    main()
@@ -0,0 +1,135 @@
+from argparse import ArgumentParser
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, cast, Dict, Iterator, List, TypeVar
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKET_EDGES = [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert solver statistics and other values into JSON-serializable values."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class PhaseTimer:
+    def __init__(self, game: str, round_trips: Callable[[], int] = lambda: 0):
+        """Create a timer for the phases of a game.
+
+        Events are kept in memory, logged at debug level and, if PB_TIMING_FILE is
+        set, appended to that file as JSON lines.
+        """
+        self.game = game
+        self.run_id = uuid.uuid4().hex
+        self.events: List[Dict[str, Any]] = []
+        self._round_trips = round_trips
+        self._open: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, phase: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time a phase, yielding its event so that callers can attach fields."""
+        event: Dict[str, Any] = {
+            "game": self.game,
+            "run": self.run_id,
+            "phase": phase,
+            **fields,
+        }
+        round_trips = self._round_trips()
+        start = time.perf_counter()
+        self._open.append(event)
+        try:
+            yield event
+        finally:
+            self._open.pop()
+            event["seconds"] = time.perf_counter() - start
+            event["round_trips"] = self._round_trips() - round_trips
+            self._emit(event)
+
+    def timed(self, phase: str, **fields: Any) -> Callable[[F], F]:
+        """Return a decorator that times every call of a function as a phase."""
+
+        def decorator(function: F) -> F:
+            @wraps(function)
+            def timed_function(*args: Any, **kwargs: Any) -> Any:
+                with self.span(phase, **fields):
+                    return function(*args, **kwargs)
+
+            return cast(F, timed_function)
+
+        return decorator
+
+    def annotate(self, **fields: Any):
+        """Attach fields to the innermost open span, if any."""
+        if self._open:
+            self._open[-1].update(fields)
+
+    def _emit(self, event: Dict[str, Any]):
+        """Record a finished span."""
+        event = _jsonable(event)
+        self.events.append(event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Timing event: %s", json.dumps(event))
+        timing_file = os.getenv("PB_TIMING_FILE")
+        if timing_file:
+            with open(timing_file, "a") as f:
+                f.write(json.dumps(event) + "\n")
+
+
+def histograms(
+    events: List[Dict[str, Any]], edges: List[float] = BUCKET_EDGES
+) -> Dict[str, List[int]]:
+    """Count the durations of each (game, phase) pair into buckets.
+
+    Bucket i counts durations up to edges[i]; the last bucket counts the rest.
+    """
+    counts: Dict[str, List[int]] = {}
+    for event in events:
+        key = f"{event['game']}.{event['phase']}"
+        buckets = counts.setdefault(key, [0] * (len(edges) + 1))
+        buckets[bisect_left(edges, event["seconds"])] += 1
+    return counts
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = ArgumentParser(description="Summarize phase timing events")
+    parser.add_argument(
+        "files",
+        type=Path,
+        nargs="+",
+        help="JSON lines files written via PB_TIMING_FILE",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    events: List[Dict[str, Any]] = []
+    for path in args.files:
+        with open(path) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+
+    labels = [f"<={edge}s" for edge in BUCKET_EDGES] + [f">{BUCKET_EDGES[-1]}s"]
+    print(f"{'phase':<32}" + "".join(f"{label:>8}" for label in labels))
+    for key, buckets in sorted(histograms(events).items()):
+        print(f"{key:<32}" + "".join(f"{count:>8}" for count in buckets))
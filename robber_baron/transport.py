@@ -0,0 +1,126 @@
+from html.parser import HTMLParser
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        """Create a parser that collects the links, forms and tables of a page."""
+        super().__init__()
+        self.links: List[str] = []
+        self.forms: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self.tables: Dict[str, List[str]] = {}
+        self._form: Optional[str] = None
+        self._table: Optional[str] = None
+        self._cell: Optional[List[str]] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        """Record links, forms, form inputs and table cells."""
+        attributes = {k: v or "" for k, v in attrs}
+        if tag == "a" and "href" in attributes:
+            self.links.append(attributes["href"])
+        elif tag == "form":
+            self._form = attributes.get("id", "")
+            self.forms[self._form] = (attributes.get("action", ""), {})
+        elif tag == "input" and self._form is not None and "name" in attributes:
+            self.forms[self._form][1][attributes["name"]] = attributes.get("value", "")
+        elif tag == "table":
+            self._table = attributes.get("id", "")
+            self.tables[self._table] = []
+        elif tag == "td" and self._table is not None:
+            self._cell = []
+
+    def handle_data(self, data: str):
+        """Record the text of the current table cell."""
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def handle_endtag(self, tag: str):
+        """Close the current form, table or table cell."""
+        if tag == "form":
+            self._form = None
+        elif tag == "table":
+            self._table = None
+        elif tag == "td" and self._table is not None and self._cell is not None:
+            self.tables[self._table].append("".join(self._cell).strip())
+            self._cell = None
+
+
+class Page:
+    def __init__(self, url: str, text: str):
+        """Parse a page fetched over HTTP."""
+        self.url = url
+        self.text = text
+        parser = _PageParser()
+        parser.feed(text)
+        self._links = parser.links
+        self._forms = parser.forms
+        self._tables = parser.tables
+
+    def links(self) -> List[str]:
+        """Return the absolute URLs of the links on the page, in document order."""
+        return [urljoin(self.url, href) for href in self._links]
+
+    def form(self, form_id: str) -> Tuple[str, Dict[str, str]]:
+        """Return the absolute action URL and the input values of a form by ID."""
+        if form_id not in self._forms:
+            raise ValueError(f"failed to find form: {form_id}")
+        action, fields = self._forms[form_id]
+        return urljoin(self.url, action), dict(fields)
+
+    def table_cells(self, table_id: str) -> List[str]:
+        """Return the text of the cells of a table by ID, row by row."""
+        if table_id not in self._tables:
+            raise ValueError(f"failed to find table: {table_id}")
+        return list(self._tables[table_id])
+
+
+class Transport:
+    def __init__(self, pool_size: int = 4, timeout_seconds: float = 10):
+        """Create an HTTP transport that keeps connections alive between requests."""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._timeout_seconds = timeout_seconds
+
+    def import_cookies(self, browser: Any):
+        """Copy the cookies and user agent of a browser's current session."""
+        for cookie in browser.cookies():
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+        self.session.headers["User-Agent"] = browser.execute_script(
+            "return navigator.userAgent"
+        )
+
+    def get(self, url: str) -> Page:
+        """Get a page by URL."""
+        response = self.session.get(url, timeout=self._timeout_seconds)
+        response.raise_for_status()
+        return Page(response.url, response.text)
+
+    def get_json(self, url: str) -> Any:
+        """Get a JSON document by URL."""
+        response = self.session.get(url, timeout=self._timeout_seconds)
+        response.raise_for_status()
+        return response.json()
+
+    def submit(self, url: str, fields: Dict[str, str]) -> Page:
+        """Submit form fields to a URL, returning the resulting page."""
+        logger.debug("Submitting %d fields to: %s", len(fields), url)
+        response = self.session.post(url, data=fields, timeout=self._timeout_seconds)
+        response.raise_for_status()
+        return Page(response.url, response.text)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
@@ -0,0 +1,121 @@
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict
+
+# Bounds of the delay between attempts when polling, in seconds
+MIN_POLL_SECONDS = 0.002
+MAX_POLL_SECONDS = 0.25
+
+# Waits that take longer than this are logged, in seconds
+SLOW_WAIT_SECONDS = 1.0
+
+
+class Condition(Enum):
+    PRESENT = "present"
+    VISIBLE = "visible"
+    CLICKABLE = "clickable"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+# Bodies of JavaScript functions that return the element matching arguments[0] once it
+# meets the condition, and null until then; visibility approximates `is_displayed`
+_FIND = "const element = document.querySelector(arguments[0]);"
+_VISIBLE = """
+    if (element === null || element.getClientRects().length === 0) {
+        return null;
+    }
+    const style = window.getComputedStyle(element);
+    if (style.visibility === "hidden" || style.opacity === "0") {
+        return null;
+    }
+"""
+CONDITION_SCRIPTS = {
+    Condition.PRESENT: _FIND + "return element;",
+    Condition.VISIBLE: _FIND + _VISIBLE + "return element;",
+    Condition.CLICKABLE: _FIND + _VISIBLE + "return element.disabled ? null : element;",
+}
+
+# Run a condition once; `%s` is the body of the condition
+POLL_SCRIPT = "return (() => { %s })();"
+
+# Resolve a condition in the page, checking it whenever the DOM changes. The last two
+# arguments are the timeout in milliseconds and the callback that ends the script
+OBSERVE_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    const timeoutMs = arguments[arguments.length - 2];
+    const check = () => { %s };
+    const ready = (value) => value !== null && value !== undefined && value !== false;
+
+    const first = check();
+    if (ready(first)) {
+        done(first);
+        return;
+    }
+
+    let observer = null;
+    let interval = null;
+    let timer = null;
+    const finish = (value) => {
+        observer.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(value);
+    };
+    const recheck = () => {
+        const value = check();
+        if (ready(value)) {
+            finish(value);
+        }
+    };
+    observer = new MutationObserver(recheck);
+    observer.observe(document, {
+        attributes: true,
+        characterData: true,
+        childList: true,
+        subtree: true,
+    });
+    // Style and layout can change without mutating the DOM, e.g. when a stylesheet loads
+    interval = setInterval(recheck, 50);
+    timer = setTimeout(() => finish(null), timeoutMs);
+"""
+
+
+def is_ready(value: Any) -> bool:
+    """Return whether a condition's result means that the wait is over."""
+    return value is not None and value is not False
+
+
+class WaitStats:
+    def __init__(self, max_samples: int = 256):
+        """Create latency statistics for waits, keyed by selector or label.
+
+        Only the most recent samples of each key are kept.
+        """
+        self._max_samples = max_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._timeouts: Dict[str, int] = {}
+
+    def record(self, key: str, seconds: float, timed_out: bool = False):
+        """Record the latency of a wait."""
+        samples = self._samples.setdefault(key, deque(maxlen=self._max_samples))
+        samples.append(seconds)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        if timed_out:
+            self._timeouts[key] = self._timeouts.get(key, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the count, timeouts and latencies of the waits for each key."""
+        import statistics
+
+        return {
+            key: {
+                "count": self._counts[key],
+                "timeouts": self._timeouts.get(key, 0),
+                "median_seconds": statistics.median(samples),
+                "max_seconds": max(samples),
+            }
+            for key, samples in self._samples.items()
+        }
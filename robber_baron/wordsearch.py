@@ -1,87 +1,127 @@
 from argparse import ArgumentParser
-import brotli
+import logging
 import re
-from seleniumwire import webdriver
+from typing import List, Optional
 
 from robber_baron import Bot, Browser
+from robber_baron.pagetiming import performance_log_options
+from robber_baron.waits import Condition
+
+logger = logging.getLogger(__name__)
+
+# We need to be able to intercept requests for this game; captured requests are kept
+# in memory, up to a bounded number
+SELENIUMWIRE_OPTIONS = {"request_storage": "memory", "request_storage_max_size": 16}
 
 
 class WordSearchBot(Bot):
+    def _make_browser(self) -> Browser:
+        """Start a browser for the bot."""
+        from seleniumwire import webdriver
+
+        return Browser(
+            driver=webdriver.Chrome(
+                options=performance_log_options() if self._page_timing else None,
+                seleniumwire_options=SELENIUMWIRE_OPTIONS,
+            )
+        )
+
     def play(self):
         """Play a Word Search game."""
-        new_game_url = "https://wordsearch.puzzlebaron.com/init.php"
-        print(f"Loading new game URL: {new_game_url} ...")
-        self.browser.get(new_game_url)
-
-        time_allotted = self.browser.find_element(
-            "table.tinytext > tbody > tr:nth-child(2) > td:nth-child(2)"
-        ).get_attribute("innerText")
-        minutes = re.search(r"(\d+) minute", time_allotted).group(1)
-        seconds = re.search(r"(\d+) second", time_allotted).group(1)
-        timestamp = f"{minutes.zfill(2)}:{seconds.zfill(2)}"
-        print(f"Extracted timestamp: {timestamp}")
-
-        print("Loading board URL ...")
-        self.browser.find_element('input[name="submit"]').click()
-
-        # Word Search prevents you from loading the same board data URL twice,
-        # so we need to intercept and parse the original request
-        print("Extracting board data from request history ...")
-        _ = self.browser.find_element("a#start")
-        prefix = "https://wordsearch.puzzlebaron.com/boarddata2.php?uid="
-        board_data = None
-        for request in self.browser.request_history():
-            if request.url.startswith(prefix):
-                # TODO: make this less brittle
-                board_data = brotli.decompress(request.response.body).decode("utf-8")
-                break
-        else:
-            raise ValueError("failed to find board data request")
-        print(f"Parsed board data: {board_data}")
-
-        words = re.search(r"wordList=(.*?)&", board_data).group(1).split(",")
-        solution = ",".join(f"{timestamp}={word}" for word in words)
-        print(f"Encoded solution: {solution}")
-
-        print("Starting game ...")
-        self.browser.find_element("a#start").click()
-
-        print("Submitting game ...")
-        self.browser.execute_script(
-            """
-            document.getElementById('form_timer').value = arguments[0];
-            document.getElementById('form_type').value = arguments[1];
-            document.getElementById('form_words').value = arguments[2];
-            document.getElementById('form_hints').value = arguments[3];
-            """,
-            timestamp,
-            "SHOTGUN",  # or "UNLIMITED"
-            solution,
-            "0",
-        )
-        self.browser.find_element("form#gameover").submit()
+        with self.span("load"):
+            # Only capture the board data request, which Word Search prevents us from
+            # loading twice, so that images and scripts pass through the proxy
+            board_data_url = re.escape(
+                "https://wordsearch.puzzlebaron.com/boarddata2.php?uid="
+            )
+            self.browser.capture([board_data_url])
+
+            new_game_url = "https://wordsearch.puzzlebaron.com/init.php"
+            logger.info("Loading new game URL: %s ...", new_game_url)
+            self.browser.get(new_game_url)
+
+        with self.span("extract"):
+            time_allotted = self.browser.find_element(
+                "table.tinytext > tbody > tr:nth-child(2) > td:nth-child(2)",
+                condition=Condition.VISIBLE,
+            ).get_attribute("innerText")
+            minutes = re.search(r"(\d+) minute", time_allotted).group(1)
+            seconds = re.search(r"(\d+) second", time_allotted).group(1)
+            timestamp = f"{minutes.zfill(2)}:{seconds.zfill(2)}"
+            logger.debug("Extracted timestamp: %s", timestamp)
+
+            logger.info("Loading board URL ...")
+            self.browser.find_element('input[name="submit"]').click()
+
+            logger.info("Waiting for board data request ...")
+            board_data = self.browser.wait_for_response(board_data_url).decode("utf-8")
+            logger.debug("Parsed board data: %s", board_data)
 
-        print("Verifying submission ...")
-        congrats = self.browser.find_element("div#container_wide h1.header_font")
-        assert congrats.get_attribute("innerText") == "Congratulations!"
+        with self.span("solve"):
+            words = re.search(r"wordList=(.*?)&", board_data).group(1).split(",")
+            solution = ",".join(f"{timestamp}={word}" for word in words)
+            logger.debug("Encoded solution: %s", solution)
 
+        with self.span("submit"):
+            logger.info("Starting game ...")
+            self.browser.find_element("a#start").click()
 
-def parse_args():
+            logger.info("Submitting game ...")
+            self.browser.execute_script(
+                """
+                document.getElementById('form_timer').value = arguments[0];
+                document.getElementById('form_type').value = arguments[1];
+                document.getElementById('form_words').value = arguments[2];
+                document.getElementById('form_hints').value = arguments[3];
+                """,
+                timestamp,
+                "SHOTGUN",  # or "UNLIMITED"
+                solution,
+                "0",
+            )
+            self.browser.find_element(
+                "form#gameover", condition=Condition.PRESENT
+            ).submit()
+
+        with self.span("verify"):
+            logger.info("Verifying submission ...")
+            congrats = self.browser.find_element(
+                "div#container_wide h1.header_font", condition=Condition.VISIBLE
+            )
+            assert congrats.get_attribute("innerText") == "Congratulations!"
+
+
+def parse_args(argv: Optional[List[str]] = None):
     """Parse command-line arguments."""
     parser = ArgumentParser(description="Play a Word Search game")
     parser.add_argument(
         "--login", action="store_true", help="Login to Puzzle Baron account"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log board data and timings"
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="Quit without waiting for enter after the game",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None, browser: Optional[Browser] = None):
+    """Play a Word Search game from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+    bot = WordSearchBot(browser=browser)
+    try:
+        if args.login:
+            bot.login()
+        bot.play()
+    finally:
+        bot.quit(prompt=not args.no_prompt)
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    # We need to be able to intercept requests for this game
-    bot = WordSearchBot(browser=Browser(driver=webdriver.Chrome()))
-    if args.login:
-        bot.login()
-    bot.play()
-
-    input("Press enter to quit: ")
-    bot.browser.quit()
+    main()
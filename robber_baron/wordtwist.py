@@ -1,10 +1,34 @@
 from argparse import ArgumentParser
 from enum import Enum
-import json
-import requests
+import logging
+from math import isqrt
+from pathlib import Path
+from selenium.common.exceptions import TimeoutException
 import time
+from typing import Any, Dict, List, Optional
 
-from robber_baron import Bot
+from robber_baron import Bot, Browser
+from robber_baron.engines import Dawg, WordTwistSolver
+from robber_baron.waits import Condition
+
+logger = logging.getLogger(__name__)
+
+# Table of the board on the play page, whose cells hold the letters row by row. This
+# follows the stand-in page in benchmarks/pages, and has not been checked against
+# the live site; `check_board` fails loudly if the live markup differs
+BOARD_TABLE = "board"
+BOARD_CELLS = f"table#{BOARD_TABLE} td"
+
+
+def check_board(board: List[str]) -> List[str]:
+    """Return board cells, raising `ValueError` unless they make a square board."""
+    size = isqrt(len(board))
+    if not board or size * size != len(board):
+        raise ValueError(
+            f"failed to parse board: expected a square number of cells"
+            f" matching {BOARD_CELLS!r}, found {len(board)}"
+        )
+    return board
 
 
 class Size(Enum):
@@ -16,50 +40,131 @@ class Size(Enum):
 
 
 class WordTwistBot(Bot):
-    def play(self, size: Size):
-        """Play a WordTwist game."""
-        new_game_url = f"https://wordtwist.puzzlebaron.com/init{str(size)}.php"
-        print(f"Loading new game URL: {new_game_url} ...")
-        self.browser.get(new_game_url)
-        board_url = self.browser.find_element("div#newgameboard a").get_attribute(
-            "href"
-        )
-        board_uid = board_url.split("u=")[-1]
-        print(f"Extracted board UID: {board_uid}")
-
-        # We need load the board URL _before_ requesting the board data,
-        # otherwise WordTwist will complain that the game has already been completed
-        print(f"Loading board URL: {board_url} ...")
-        self.browser.get(board_url)
-        data_url = f"https://wordtwist.puzzlebaron.com/boarddata.php?uid={board_uid}"
-        print(f"Requesting board data from: {data_url} ...")
-        board_data = json.loads(requests.get(data_url).text)
-        print(f"Parsed board data containing {len(board_data['wordList'])} words")
-
-        encoded_words = []
-        timestamp = str(int(time.time()))
-        for word, data in board_data["wordList"].items():
-            encoded_words.append(
-                "||" + "|".join((word, str(data["rarity"]), timestamp))
+    # Origin of the game's pages, e.g. a local stand-in server in tests
+    base_url = "https://wordtwist.puzzlebaron.com"
+
+    def play(self, size: Size, http: bool = False, dictionary: Optional[Path] = None):
+        """Play a WordTwist game.
+
+        In HTTP mode, pages are fetched and the solution is submitted without
+        rendering them in the browser, using the browser's cookies. HTTP mode is
+        experimental and off by default: it skips the browser's start step, and has
+        only been checked against the stand-in pages in benchmarks. Given a
+        dictionary file, the words are found on the board instead of being requested
+        from the server; see `robber_baron.engines.wordtwist`.
+        """
+        mode = "http" if http else "browser"
+        if http:
+            # The start link runs the live site's scripts, which HTTP mode cannot,
+            # so the server may reject the submission
+            logger.warning(
+                "HTTP mode is experimental and has not been checked against the live"
+                " site"
             )
-        solution = "".join(encoded_words)
-        print(f"Encoded solution: {solution}")
-
-        print("Starting game ...")
-        self.browser.find_element("a#start").click()
-
-        print("Submitting game ...")
-        self.browser.execute_script(
-            "document.getElementById('form_words').setAttribute('value', arguments[0])",
-            solution,
-        )
-        self.browser.find_element("form#gameover").submit()
-
-        print("Verifying submission ...")
-        _ = self.browser.find_element("div.solcontainer")
-
-
-def parse_args():
+        # In HTTP mode, share the browser's session if it was started, e.g. to log in
+        if http and self._browser is not None:
+            self.transport.import_cookies(self.browser)
+
+        with self.span("load", transport=mode):
+            new_game_url = f"{self.base_url}/init{str(size)}.php"
+            logger.info("Loading new game URL: %s ...", new_game_url)
+            if http:
+                links = self.transport.get(new_game_url).links()
+                board_urls = [link for link in links if "u=" in link]
+                if not board_urls:
+                    raise ValueError("failed to find board URL")
+                board_url = board_urls[0]
+            else:
+                self.browser.get(new_game_url)
+                board_url = self.browser.find_element(
+                    "div#newgameboard a", condition=Condition.PRESENT
+                ).get_attribute("href")
+            board_uid = board_url.split("u=")[-1]
+            logger.debug("Extracted board UID: %s", board_uid)
+
+            # We need load the board URL _before_ requesting the board data,
+            # otherwise WordTwist will complain that the game has already been completed
+            logger.info("Loading board URL: %s ...", board_url)
+            if http:
+                board_page = self.transport.get(board_url)
+            else:
+                self.browser.get(board_url)
+                if dictionary is None:
+                    # The board data is requested over HTTP, and needs the session
+                    # that the new game and board pages set up in the browser
+                    self.transport.import_cookies(self.browser)
+
+        with self.span("extract", transport="http" if dictionary is None else mode):
+            if dictionary is not None:
+                if http:
+                    board = board_page.table_cells(BOARD_TABLE)
+                else:
+                    try:
+                        board = self.browser.wait_until(
+                            "const cells = document.querySelectorAll(arguments[0]);"
+                            " return cells.length ? Array.from(cells, c => c.innerText)"
+                            " : null;",
+                            BOARD_CELLS,
+                            label=BOARD_CELLS,
+                        )
+                    except TimeoutException:
+                        board = []
+                board = check_board(board)
+                logger.debug("Extracted board: %s", board)
+            else:
+                data_url = f"{self.base_url}/boarddata.php?uid={board_uid}"
+                logger.info("Requesting board data from: %s ...", data_url)
+                board_data = self.transport.get_json(data_url)
+                logger.info(
+                    "Parsed board data containing %d words",
+                    len(board_data["wordList"]),
+                )
+
+        with self.span("solve"):
+            word_list: Dict[str, Any]
+            if dictionary is not None:
+                word_list = WordTwistSolver(Dawg(dictionary)).solve(board)
+                logger.info("Found %d words on the board", len(word_list))
+            else:
+                word_list = board_data["wordList"]
+            encoded_words = []
+            timestamp = str(int(time.time()))
+            for word, data in word_list.items():
+                encoded_words.append(
+                    "||" + "|".join((word, str(data["rarity"]), timestamp))
+                )
+            solution = "".join(encoded_words)
+            logger.debug("Encoded solution: %s", solution)
+
+        with self.span("submit", transport=mode):
+            logger.info("Submitting game ...")
+            if http:
+                action, fields = board_page.form("gameover")
+                fields["form_words"] = solution
+                result_page = self.transport.submit(action, fields)
+            else:
+                logger.info("Starting game ...")
+                self.browser.find_element("a#start").click()
+                self.browser.execute_script(
+                    "document.getElementById('form_words').setAttribute('value', arguments[0])",
+                    solution,
+                )
+                self.browser.find_element(
+                    "form#gameover", condition=Condition.PRESENT
+                ).submit()
+
+        with self.span("verify", transport=mode):
+            logger.info("Verifying submission ...")
+            if http:
+                if "solcontainer" not in result_page.text:
+                    raise ValueError("failed to verify submission")
+            else:
+                _ = self.browser.find_element(
+                    "div.solcontainer", condition=Condition.PRESENT
+                )
+
+
+def parse_args(argv: Optional[List[str]] = None):
     """Parse command-line arguments."""
     parser = ArgumentParser(description="Play a Wordtwist game")
     parser.add_argument(
@@ -70,18 +175,45 @@ def parse_args():
         choices=list(Size),
         help="Board size; default '4'",
     )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Experimental: fetch pages and submit over HTTP instead of rendering"
+        " them; unverified against the live site",
+    )
+    parser.add_argument(
+        "--dictionary",
+        type=Path,
+        help="Find words with a dictionary file instead of requesting them",
+    )
     parser.add_argument(
         "--login", action="store_true", help="Login to Puzzle Baron account"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log board data and timings"
+    )
+    parser.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="Quit without waiting for enter after the game",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None, browser: Optional[Browser] = None):
+    """Play a WordTwist game from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+    bot = WordTwistBot(browser=browser)
+    try:
+        if args.login:
+            bot.login()
+        bot.play(args.board_size, http=args.http, dictionary=args.dictionary)
+    finally:
+        bot.quit(prompt=not args.no_prompt)
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    bot = WordTwistBot()
-    if args.login:
-        bot.login()
-    bot.play(args.board_size)
-
-    input("Press enter to quit: ")
-    bot.browser.quit()
+    main()
@@ -0,0 +1,29 @@
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).parent.parent / "benchmarks"
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from transport import StandInHandler  # noqa: E402
+
+
+class SessionHandler(StandInHandler):
+    # Refuse the board data without the new game's session, like the real server
+    require_session = True
+
+
+@pytest.fixture
+def stand_in():
+    """Serve the hand-written WordTwist pages locally, yielding their base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SessionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, JavascriptException
+
+from robber_baron import Browser
+
+
+class StandInDriver:
+    def __init__(self, *outcomes):
+        """Return or raise each outcome in turn from `execute_script`."""
+        self.outcomes = list(outcomes)
+
+    def execute(self, command, params=None):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def execute_script(self, script, *args):
+        return self.execute("executeScript", {"script": script, "args": args})
+
+
+def test_wait_until_retries_after_page_unloads():
+    browser = Browser(StandInDriver(JavascriptException("unloaded"), 42), False)
+    assert browser.wait_until("return 42;", timeout_seconds=5) == 42
+
+
+def test_wait_until_raises_other_driver_errors():
+    browser = Browser(StandInDriver(InvalidSelectorException("bad")), False)
+    start = time.perf_counter()
+    with pytest.raises(InvalidSelectorException):
+        browser.wait_until("return null;", timeout_seconds=5)
+    assert time.perf_counter() - start < 1
+
+
+class StandInWireDriver(StandInDriver):
+    def __init__(self):
+        """Stand in for a selenium-wire driver, which keeps requests and scopes."""
+        super().__init__()
+        self.scopes = []
+        self.requests = ["earlier"]
+
+    def __delattr__(self, name):
+        if name == "requests":
+            self.requests = []
+        else:
+            super().__delattr__(name)
+
+
+def test_stop_capture_resets_the_driver():
+    driver = StandInWireDriver()
+    browser = Browser(driver, False)
+    browser.stop_capture()
+    browser.capture([".*boarddata.*"])
+    assert driver.scopes == [".*boarddata.*"]
+    assert driver.response_interceptor is not None
+    browser.stop_capture()
+    assert driver.scopes == [] and driver.requests == []
+    assert not hasattr(driver, "response_interceptor")
+
+
+class StandInResponse:
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+
+
+class StandInRequest:
+    def __init__(self, url):
+        self.url = url
+
+
+def test_capture_drops_oversized_responses():
+    browser = Browser(StandInWireDriver(), False)
+    browser.capture([".*boarddata.*"], max_body_bytes=8)
+    browser._on_response(
+        StandInRequest("/boarddata/1"),
+        StandInResponse(b"", {"Content-Length": "1000000"}),
+    )
+    browser._on_response(StandInRequest("/boarddata/2"), StandInResponse(b"x" * 9))
+    browser._on_response(StandInRequest("/boarddata/3"), StandInResponse(b"board"))
+    for url in ("/boarddata/1", "/boarddata/2"):
+        with pytest.raises(ValueError):
+            browser.wait_for_response(url, timeout_seconds=5)
+    assert browser.wait_for_response("/boarddata/3", timeout_seconds=5) == b"board"
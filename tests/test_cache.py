@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from robber_baron.cache import SolutionCache, SudokuSymmetry
+from robber_baron.engines import SudokuEngine
+from robber_baron.solve import MODELS_DIR
+from run import DEFAULT_CORPUS, load_corpus
+
+SUDOKU_MODEL = MODELS_DIR / "sudoku.mzn"
+
+
+class CountingSolve:
+    """Solve Sudoku instances natively, counting the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, params):
+        self.calls += 1
+        return SudokuEngine().solve(SUDOKU_MODEL, params)
+
+
+def sudoku_starts(count: int):
+    """Return the starting grids of the first Sudoku instances of the corpus."""
+    records = load_corpus(DEFAULT_CORPUS, ["sudoku"])[:count]
+    return [record["instance_params"]["start"] for record in records]
+
+
+def test_get_or_solve_solves_each_instance_once():
+    cache = SolutionCache()
+    solve = CountingSolve()
+    first, second = ({"start": start} for start in sudoku_starts(2))
+    solution = cache.get_or_solve(SUDOKU_MODEL, "gecode", first, solve)
+    assert cache.get_or_solve(SUDOKU_MODEL, "gecode", first, solve) == solution
+    cache.get_or_solve(SUDOKU_MODEL, "chuffed", first, solve)
+    cache.get_or_solve(SUDOKU_MODEL, "gecode", second, solve)
+    assert solve.calls == 3
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 3
+
+
+def test_cache_persists_to_disk(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    params = {"start": sudoku_starts(1)[0]}
+    cache = SolutionCache(path)
+    solution = cache.get_or_solve(SUDOKU_MODEL, "gecode", params, CountingSolve())
+    cache.close()
+
+    cache = SolutionCache(path)
+    solve = CountingSolve()
+    assert cache.get_or_solve(SUDOKU_MODEL, "gecode", params, solve) == solution
+    assert solve.calls == 0 and cache.stats["disk_hits"] == 1
+    cache.close()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SolutionCache(max_entries=2)
+    solve = CountingSolve()
+    a, b, c = ({"start": start} for start in sudoku_starts(3))
+    for params in (a, b, a, c, a, b):
+        cache.get_or_solve(SUDOKU_MODEL, "gecode", params, solve)
+    # b was evicted by c, and solved again
+    assert solve.calls == 4 and cache.stats["evictions"] == 2
+
+
+def test_cache_misses_when_model_changes(tmp_path):
+    model = tmp_path / "sudoku.mzn"
+    model.write_text(SUDOKU_MODEL.read_text())
+    cache = SolutionCache()
+    solve = CountingSolve()
+    params = {"start": sudoku_starts(1)[0]}
+    cache.get_or_solve(model, "gecode", params, solve)
+    model.write_text(SUDOKU_MODEL.read_text() + "% changed\n")
+    mtime = model.stat().st_mtime + 10
+    os.utime(model, (mtime, mtime))
+    cache.get_or_solve(model, "gecode", params, solve)
+    assert solve.calls == 2
+
+
+def test_sudoku_symmetry_restores_solutions():
+    for start in sudoku_starts(5):
+        symmetry = SudokuSymmetry(start)
+        canonical = SudokuEngine().solve(SUDOKU_MODEL, {"start": symmetry.start})
+        solution = SudokuEngine().solve(SUDOKU_MODEL, {"start": start})
+        assert symmetry.restore(canonical["puzzle"]) == solution["puzzle"]
+
+
+def test_cache_matches_equivalent_sudoku_grids():
+    start = sudoku_starts(1)[0]
+    # Transpose the grid and swap two digits
+    swap = {1: 2, 2: 1}
+    equivalent = [[swap.get(value, value) for value in col] for col in zip(*start)]
+    cache = SolutionCache(canonicalize_sudoku=True)
+    solve = CountingSolve()
+    cache.get_or_solve(SUDOKU_MODEL, "gecode", {"start": start}, solve)
+    solution = cache.get_or_solve(SUDOKU_MODEL, "gecode", {"start": equivalent}, solve)
+    assert solve.calls == 1
+    assert solution == SudokuEngine().solve(SUDOKU_MODEL, {"start": equivalent})
+
+
+def test_cache_is_shared_between_threads(tmp_path):
+    cache = SolutionCache(tmp_path / "cache.sqlite")
+    starts = sudoku_starts(4)
+    expected = [SudokuEngine().solve(SUDOKU_MODEL, {"start": s}) for s in starts]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(
+            pool.map(
+                lambda k: cache.get_or_solve(
+                    SUDOKU_MODEL, "gecode", {"start": starts[k % 4]}, CountingSolve()
+                ),
+                range(64),
+            )
+        )
+    assert results == [expected[k % 4] for k in range(64)]
+    cache.close()
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+import threading
+
+from robber_baron import _branch
+
+
+class StandInInstance(dict):
+    """Stand in for a parsed MiniZinc instance, locked while branched like it."""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def branch(self):
+        with self.lock:
+            yield StandInInstance()
+
+
+def test_branch_releases_base_lock_before_solving():
+    base = StandInInstance()
+    instance = _branch(base, {"grid_size": 5, "row_clues": [[1]]})
+    assert instance == {"grid_size": 5, "row_clues": [[1]]}
+    assert not base.lock.locked()
@@ -0,0 +1,91 @@
+import socket
+
+import pytest
+
+from robber_baron import daemon, sudoku, wordtwist
+
+
+class StandInBrowser:
+    def __init__(self):
+        """Stand in for the warm browser, counting the captures it stops."""
+        self.stopped_captures = 0
+
+    def stop_capture(self):
+        """Count a stopped capture."""
+        self.stopped_captures += 1
+
+
+class StandInDriver:
+    def __init__(self):
+        self._browser = StandInBrowser()
+
+    def browser(self):
+        """Return a stand-in for the warm browser."""
+        return self._browser
+
+    def quit(self):
+        """Quit nothing."""
+
+
+def test_play_passes_warm_solvers_to_solving_games(tmp_path, monkeypatch):
+    calls = []
+    for module in (sudoku, wordtwist):
+        monkeypatch.setattr(
+            module, "main", lambda argv, **kwargs: calls.append((argv, kwargs))
+        )
+    solvers = {"gecode": object()}
+    driver = StandInDriver()
+    server = daemon.Daemon(tmp_path / "daemon.sock", driver, solvers)
+    try:
+        server.answer({"op": "play", "game": "sudoku", "args": ["-d", "easy"]})
+        server.answer({"op": "play", "game": "wordtwist"})
+    finally:
+        server.server_close()
+    browser = driver.browser()
+    assert calls == [
+        (["-d", "easy", "--no-prompt"], {"browser": browser, "solvers": solvers}),
+        (["--no-prompt"], {"browser": browser}),
+    ]
+    # Each game's captured requests are reset before the next game
+    assert browser.stopped_captures == 2
+
+
+def test_daemon_refuses_a_socket_in_use(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    server = daemon.Daemon(socket_path, StandInDriver())
+    try:
+        with pytest.raises(RuntimeError):
+            daemon.Daemon(socket_path, StandInDriver())
+    finally:
+        server.server_close()
+
+
+def test_daemon_replaces_a_stale_socket(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(socket_path))
+    server = daemon.Daemon(socket_path, StandInDriver())
+    server.server_close()
+
+
+def test_sudoku_main_uses_the_warm_solver(monkeypatch):
+    bots = []
+    monkeypatch.setattr(sudoku.SudokuBot, "play", lambda self, _: bots.append(self))
+    solver = object()
+    sudoku.main(["--no-prompt"], browser="browser", solvers={"gecode": solver})
+    assert bots[0].solver is solver
+
+
+def test_quit_stops_the_warm_up_thread(monkeypatch):
+    bots = []
+
+    def play(bot, _):
+        # Start the bot's warm-up thread, as solving does
+        bot._executor.submit(lambda: None).result()
+        bots.append(bot)
+
+    monkeypatch.setattr(sudoku.SudokuBot, "play", play)
+    sudoku.main(["--no-prompt"], browser="browser", solvers={"gecode": object()})
+    (thread,) = bots[0]._executor._threads
+    thread.join(timeout=5)
+    assert not thread.is_alive()
@@ -0,0 +1,114 @@
+import random
+from typing import Dict, List
+
+import pytest
+
+from robber_baron.engines.wordtwist import (
+    build_dawg,
+    Dawg,
+    MIN_WORD_LENGTH,
+    read_words,
+    WordTwistSolver,
+)
+
+
+def random_words(rng: random.Random, count: int) -> Dict[str, int]:
+    """Return random words over a small alphabet, so that many share prefixes."""
+    return {
+        "".join(rng.choice("aenrst") for _ in range(rng.randint(1, 7))): rng.randint(
+            1, 5
+        )
+        for _ in range(count)
+    }
+
+
+def spelled(word: str, board: List[str]) -> bool:
+    """Return true iff a word is spelled by a path of adjacent, distinct cells."""
+    tiles = [cell.lower() for cell in board]
+    size = int(len(tiles) ** 0.5)
+
+    def search(cell: int, rest: str, visited: set) -> bool:
+        if not rest.startswith(tiles[cell]):
+            return False
+        rest = rest[len(tiles[cell]) :]
+        if not rest:
+            return True
+        i, j = divmod(cell, size)
+        return any(
+            search(k * size + m, rest, visited | {cell})
+            for k in range(i - 1, i + 2)
+            for m in range(j - 1, j + 2)
+            if 0 <= k < size
+            and 0 <= m < size
+            and k * size + m not in visited
+            and k * size + m != cell
+        )
+
+    return any(search(cell, word, set()) for cell in range(len(tiles)))
+
+
+@pytest.fixture
+def words():
+    return random_words(random.Random(1), 2000)
+
+
+def test_dawg_matches_set(tmp_path, words):
+    path = tmp_path / "words.dawg"
+    build_dawg(words, path)
+    dawg = Dawg(path)
+    try:
+        assert dawg.num_words == len(words)
+        rng = random.Random(2)
+        probes = list(words) + list(random_words(rng, 2000)) + ["", "zzz"]
+        for word in probes:
+            assert (word in dawg) == (word in words)
+        for word, rarity in words.items():
+            found = dawg.walk(word)
+            assert found is not None and dawg.rarity(found[1]) == rarity
+    finally:
+        dawg.close()
+
+
+def test_solver_matches_brute_force(tmp_path, words):
+    path = tmp_path / "words.dawg"
+    build_dawg(words, path)
+    dawg = Dawg(path)
+    try:
+        solver = WordTwistSolver(dawg)
+        rng = random.Random(3)
+        for size in (4, 5):
+            board = [rng.choice("aenrst").upper() for _ in range(size * size)]
+            expected = {
+                word: rarity
+                for word, rarity in words.items()
+                if len(word) >= MIN_WORD_LENGTH and spelled(word, board)
+            }
+            assert expected
+            assert solver.words(board) == expected
+    finally:
+        dawg.close()
+
+
+def test_solver_spells_multi_letter_cells(tmp_path):
+    path = tmp_path / "words.dawg"
+    build_dawg({"quit": 1, "quest": 2, "suit": 3, "qit": 4}, path)
+    dawg = Dawg(path)
+    try:
+        board = ["Qu", "I", "T", "E", "S", "A", "R", "N", "O"]
+        assert WordTwistSolver(dawg).words(board) == {"quit": 1, "quest": 2}
+        assert spelled("quit", board) and not spelled("qit", board)
+    finally:
+        dawg.close()
+
+
+def test_read_words_skips_invalid_lines(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("Stone 4\nrats\n\nnaïve 2\ndon't\n")
+    assert read_words(path) == {"stone": 4, "rats": 1}
+
+
+def test_dawg_rejects_other_files(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        Dawg(path)
@@ -0,0 +1,39 @@
+from itertools import product
+
+import pytest
+
+from robber_baron.dfa import EMPTY, FILLED, line_dfa, regular_params
+from robber_baron.generators import line_clues
+
+
+def accepts(clues, line) -> bool:
+    """Run the DFA of clues over a line of cells."""
+    transitions, accepting = line_dfa(clues)
+    state = 1
+    for cell in line:
+        state = transitions[state - 1][(FILLED if cell else EMPTY) - 1]
+        if state == 0:
+            return False
+    return state in accepting
+
+
+@pytest.mark.parametrize("size", range(1, 8))
+def test_line_dfa_matches_brute_force(size):
+    lines = list(product((False, True), repeat=size))
+    for clues in {tuple(line_clues(line)) for line in lines}:
+        # Padding zeros are ignored
+        padded = list(clues) + [0]
+        for line in lines:
+            expected = line_clues(line) == list(clues)
+            assert accepts(list(clues), line) == expected
+            assert accepts(padded, line) == expected
+
+
+def test_regular_params_pad_dfas():
+    params = regular_params(3, [[1, 1], [0, 0], [3, 0]], [[1], [2], [0]])
+    assert params["grid_size"] == 3
+    assert len(params["transitions"]) == len(params["accepting"]) == 6
+    assert all(len(t) == params["num_states"] for t in params["transitions"])
+    assert all(len(a) == 2 for a in params["accepting"])
+    # The empty line accepts only in its start state
+    assert params["accepting"][1] == [1, 0]
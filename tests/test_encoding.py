@@ -0,0 +1,52 @@
+import gzip
+import os
+import zlib
+
+import brotli
+import pytest
+
+from robber_baron.encoding import decode_body
+
+BODY = os.urandom(100_000) + b"board data " * 50_000
+
+
+def deflate(body: bytes, wbits: int) -> bytes:
+    """Compress a body as a zlib or raw deflate stream."""
+    compressor = zlib.compressobj(wbits=wbits)
+    return compressor.compress(body) + compressor.flush()
+
+
+@pytest.mark.parametrize(
+    "encoding, encode",
+    [
+        ("gzip", gzip.compress),
+        ("x-gzip", gzip.compress),
+        ("deflate", lambda body: deflate(body, zlib.MAX_WBITS)),
+        ("deflate", lambda body: deflate(body, -zlib.MAX_WBITS)),
+        ("br", brotli.compress),
+        ("identity", lambda body: body),
+        (None, lambda body: body),
+    ],
+)
+def test_decode_body_round_trips(encoding, encode):
+    assert decode_body(encode(BODY), encoding) == BODY
+    assert decode_body(encode(BODY), encoding, len(BODY)) == BODY
+
+
+def test_decode_body_undoes_encodings_in_reverse_order():
+    body = brotli.compress(gzip.compress(BODY))
+    assert decode_body(body, "gzip, br") == BODY
+
+
+@pytest.mark.parametrize(
+    "encoding, encode", [("gzip", gzip.compress), ("br", brotli.compress)]
+)
+def test_decode_body_stops_past_the_cap(encoding, encode):
+    bomb = encode(b"\0" * 50_000_000)
+    with pytest.raises(ValueError, match="exceeds 1000 bytes"):
+        decode_body(bomb, encoding, 1000)
+
+
+def test_decode_body_rejects_unknown_encodings():
+    with pytest.raises(ValueError, match="unsupported content encoding"):
+        decode_body(BODY, "zstd")
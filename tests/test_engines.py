@@ -0,0 +1,137 @@
+from itertools import islice
+from typing import Any, Dict, List
+
+import pytest
+
+from robber_baron.engines import CampsitesEngine, NonogramEngine, SudokuEngine
+from robber_baron.engines.sudoku import grid_solutions
+from robber_baron.generators import line_clues
+from robber_baron.solve import MODELS_DIR
+from run import DEFAULT_CORPUS, load_corpus
+
+
+def check_campsites(params: Dict[str, Any], solution: Dict[str, Any]):
+    """Assert that a Campsites solution follows every rule of the game."""
+    num_rows, num_cols = params["num_rows"], params["num_cols"]
+    trees = {(i - 1, j - 1) for i, j in zip(params["tree_rows"], params["tree_cols"])}
+    tents = {
+        (i, j)
+        for i in range(num_rows)
+        for j in range(num_cols)
+        if solution["tents"][i][j]
+    }
+    assert solution["trees"] == [
+        [(i, j) in trees for j in range(num_cols)] for i in range(num_rows)
+    ]
+    assert not tents & trees
+    assert [sum(i == r for i, _ in tents) for r in range(num_rows)] == params[
+        "num_tents_in_row"
+    ]
+    assert [sum(j == c for _, j in tents) for c in range(num_cols)] == params[
+        "num_tents_in_col"
+    ]
+    for i, j in tents:
+        touching = {(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)}
+        assert tents & touching == {(i, j)}
+
+    # Every tent is paired with its own cardinally adjacent tree
+    pairs: Dict[Any, Any] = {}
+
+    def pair(tent, seen) -> bool:
+        i, j = tent
+        for tree in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if tree in trees and tree not in seen:
+                seen.add(tree)
+                if tree not in pairs or pair(pairs[tree], seen):
+                    pairs[tree] = tent
+                    return True
+        return False
+
+    assert len(tents) == len(trees)
+    assert all(pair(tent, set()) for tent in tents)
+
+
+def check_numbergrids(params: Dict[str, Any], solution: Dict[str, Any]):
+    """Assert that a Numbergrids grid matches the clues of every row and column."""
+    grid: List[List[bool]] = solution["grid"]
+    strip = lambda clues: [c for c in clues if c] or [0]  # noqa: E731
+    assert [line_clues(row) for row in grid] == list(map(strip, params["row_clues"]))
+    assert [line_clues(list(col)) for col in zip(*grid)] == list(
+        map(strip, params["col_clues"])
+    )
+
+
+def check_sudoku(params: Dict[str, Any], solution: Dict[str, Any]):
+    """Assert that a Sudoku grid keeps the givens and has no repeated digit."""
+    start, puzzle = params["start"], solution["puzzle"]
+    n = len(start)
+    box = int(n**0.5)
+    digits = list(range(1, n + 1))
+    assert all(
+        puzzle[i][j] == v for i, row in enumerate(start) for j, v in enumerate(row) if v
+    )
+    assert all(sorted(row) == digits for row in puzzle)
+    assert all(sorted(col) == digits for col in zip(*puzzle))
+    for bi in range(0, n, box):
+        for bj in range(0, n, box):
+            cells = [
+                puzzle[i][j] for i in range(bi, bi + box) for j in range(bj, bj + box)
+            ]
+            assert sorted(cells) == digits
+
+
+GAMES = {
+    "campsites": (CampsitesEngine, check_campsites),
+    "numbergrids": (NonogramEngine, check_numbergrids),
+    "sudoku": (SudokuEngine, check_sudoku),
+}
+
+
+@pytest.mark.parametrize("game", list(GAMES))
+def test_engine_solves_corpus(game):
+    engine_class, check = GAMES[game]
+    engine = engine_class()
+    for record in load_corpus(DEFAULT_CORPUS, [game]):
+        params = record["instance_params"]
+        check(params, engine.solve(MODELS_DIR / record["model"], params))
+
+
+def test_sudoku_engine_finds_the_unique_solution():
+    for record in load_corpus(DEFAULT_CORPUS, ["sudoku"]):
+        start = record["instance_params"]["start"]
+        solutions = list(islice(grid_solutions(start), 2))
+        assert len(solutions) == 1
+        solution = SudokuEngine().solve(MODELS_DIR / "sudoku.mzn", {"start": start})
+        assert solution["puzzle"] == solutions[0]
+
+
+def test_engines_reject_unsolvable_instances():
+    start = [[0] * 9 for _ in range(9)]
+    start[0][0] = start[0][8] = 5
+    with pytest.raises(ValueError):
+        SudokuEngine().solve(MODELS_DIR / "sudoku.mzn", {"start": start})
+
+    with pytest.raises(ValueError):
+        NonogramEngine().solve(
+            MODELS_DIR / "numbergrids.mzn",
+            {
+                "grid_size": 2,
+                "num_clues": 1,
+                "row_clues": [[2], [0]],
+                "col_clues": [[0], [0]],
+            },
+        )
+
+    with pytest.raises(ValueError):
+        CampsitesEngine().solve(
+            MODELS_DIR / "campsites.mzn",
+            {
+                "num_rows": 2,
+                "num_cols": 2,
+                "num_tents_in_row": [1, 1],
+                "num_tents_in_col": [1, 1],
+                "num_trees": 1,
+                "tree_rows": [1],
+                "tree_cols": [1],
+            },
+        )
@@ -0,0 +1,87 @@
+from itertools import combinations, islice
+import random
+
+import pytest
+
+from robber_baron.engines import CampsitesEngine, NonogramEngine, SudokuEngine
+from robber_baron.engines.nonogram import NonogramSolver
+from robber_baron.engines.sudoku import grid_solutions
+from robber_baron.generators import (
+    campsites_params,
+    line_clues,
+    numbergrids_params,
+    sudoku_params,
+)
+from robber_baron.solve import MODELS_DIR
+from test_engines import check_campsites, check_numbergrids, check_sudoku
+
+
+def campsites_solutions(params):
+    """Return every placement of tents that solves a small board, by brute force."""
+    num_rows, num_cols = params["num_rows"], params["num_cols"]
+    trees = {(i - 1, j - 1) for i, j in zip(params["tree_rows"], params["tree_cols"])}
+    candidates = sorted(
+        {
+            (i + di, j + dj)
+            for i, j in trees
+            for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= i + di < num_rows and 0 <= j + dj < num_cols
+        }
+        - trees
+    )
+    solutions = []
+    for tents in combinations(candidates, len(trees)):
+        grid = [[(i, j) in tents for j in range(num_cols)] for i in range(num_rows)]
+        trees_grid = [
+            [(i, j) in trees for j in range(num_cols)] for i in range(num_rows)
+        ]
+        try:
+            check_campsites(params, {"trees": trees_grid, "tents": grid})
+        except AssertionError:
+            continue
+        solutions.append(grid)
+    return solutions
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_campsites_boards_are_uniquely_solvable(seed):
+    params = campsites_params(5, 5, 0.3, random.Random(seed))
+    solution = CampsitesEngine().solve(MODELS_DIR / "campsites.mzn", params)
+    assert campsites_solutions(params) == [solution["tents"]]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numbergrids_boards_are_uniquely_solvable(seed):
+    params = numbergrids_params(10, 0.5, random.Random(seed))
+    assert all(len(c) == params["num_clues"] for c in params["row_clues"])
+    check_numbergrids(
+        params, NonogramEngine().solve(MODELS_DIR / "numbergrids.mzn", params)
+    )
+    strip = lambda clues: [c for c in clues if c] or [0]  # noqa: E731
+    solver = NonogramSolver(
+        list(map(strip, params["row_clues"])), list(map(strip, params["col_clues"]))
+    )
+    assert len(list(islice(solver.solutions(), 2))) == 1
+
+
+@pytest.mark.parametrize("box_size", [2, 3, 4])
+def test_sudoku_boards_are_uniquely_solvable(box_size):
+    params = sudoku_params(box_size, 0.4, random.Random(box_size))
+    assert len(list(islice(grid_solutions(params["start"], box_size), 2))) == 1
+    solution = SudokuEngine().solve(MODELS_DIR / "sudoku_sized.mzn", params)
+    check_sudoku(params, solution)
+
+
+def test_generators_are_deterministic():
+    for generate, args in [
+        (campsites_params, (8, 8, 0.3)),
+        (numbergrids_params, (10, 0.5)),
+        (sudoku_params, (3, 0.3)),
+    ]:
+        assert generate(*args, random.Random(7)) == generate(*args, random.Random(7))
+
+
+def test_line_clues():
+    assert line_clues([]) == [0]
+    assert line_clues([False, False]) == [0]
+    assert line_clues([True, True, False, True]) == [2, 1]
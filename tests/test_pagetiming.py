@@ -0,0 +1,66 @@
+import json
+
+from robber_baron.pagetiming import network_requests, summarize
+
+
+def entry(method: str, **params) -> dict:
+    """Return a Chrome performance log entry for a DevTools event."""
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+LOG = [
+    entry(
+        "Network.requestWillBeSent",
+        requestId="1",
+        timestamp=10.0,
+        type="Document",
+        request={"url": "https://example.com/play.php?u=1"},
+    ),
+    entry(
+        "Network.responseReceived",
+        requestId="1",
+        response={
+            "status": 200,
+            "timing": {"requestTime": 10.0, "receiveHeadersEnd": 50.0},
+        },
+    ),
+    entry(
+        "Network.requestWillBeSent",
+        requestId="2",
+        timestamp=10.1,
+        type="Script",
+        request={"url": "https://example.com/app.js"},
+    ),
+    entry(
+        "Network.loadingFinished", requestId="1", timestamp=10.2, encodedDataLength=900
+    ),
+    entry("Network.loadingFailed", requestId="2", timestamp=10.6, errorText="net::ERR"),
+    entry("Page.domContentEventFired", timestamp=10.4),
+    entry("Page.loadEventFired", timestamp=10.5),
+]
+
+
+def test_network_requests_times_documents_and_failures():
+    document, script = network_requests(LOG)
+    assert document["url"] == "https://example.com/play.php?u=1"
+    assert document["status"] == 200
+    assert abs(document["ttfb"] - 0.05) < 1e-9
+    assert abs(document["seconds"] - 0.2) < 1e-9
+    assert document["bytes"] == 900
+    assert abs(document["load"] - 0.5) < 1e-9
+    assert script["error"] == "net::ERR"
+
+
+def test_summarize_groups_pages_by_phase():
+    page = {"network": network_requests(LOG)}
+    events = [
+        {"game": "g", "phase": "load", "page": page},
+        {"game": "g", "phase": "load", "page": page},
+        {"game": "g", "phase": "solve"},
+    ]
+    summary = summarize(events, top=1)
+    assert list(summary) == ["g.load"]
+    load = summary["g.load"]
+    assert load["events"] == 2
+    assert abs(load["navigations"]["example.com/play.php"]["ttfb"] - 0.05) < 1e-9
+    assert list(load["resources"]) == ["example.com/app.js"]
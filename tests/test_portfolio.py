@@ -0,0 +1,130 @@
+from functools import partial
+import json
+from pathlib import Path
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from robber_baron import campsites, portfolio
+from robber_baron.engines import CampsitesEngine, SudokuEngine
+from robber_baron.portfolio import FallbackSolver, PortfolioSolver
+from run import DEFAULT_CORPUS
+
+MODELS_DIR = Path(__file__).parent.parent / "robber_baron" / "models"
+
+
+class FailingEngine:
+    def __init__(self, delay_seconds: float = 0.0):
+        """Create an engine that fails after a delay."""
+        self.delay_seconds = delay_seconds
+
+    def solve(self, model_file, instance_params):
+        """Fail to solve an instance."""
+        time.sleep(self.delay_seconds)
+        raise ValueError("no solution")
+
+
+@pytest.fixture
+def sudoku():
+    """Return the parameters of a Sudoku instance from the corpus."""
+    with open(DEFAULT_CORPUS / "sudoku.jsonl") as f:
+        return json.loads(f.readline())["instance_params"]
+
+
+def test_portfolio_returns_the_winning_solution(sudoku):
+    portfolio = PortfolioSolver([FailingEngine(), SudokuEngine()], timeout_seconds=30)
+    solution = portfolio.solve(MODELS_DIR / "sudoku.mzn", sudoku)
+    assert solution == SudokuEngine().solve(MODELS_DIR / "sudoku.mzn", sudoku)
+    assert portfolio.last_winner == "SudokuEngine"
+    assert portfolio.win_rates(MODELS_DIR / "sudoku.mzn") == {"SudokuEngine": 1.0}
+
+
+def test_portfolio_budget_covers_the_whole_race():
+    # Each failure arrives within the budget, but the race as a whole does not
+    engines = [FailingEngine(delay_seconds=0.6 * i) for i in range(1, 4)]
+    portfolio = PortfolioSolver(engines, include_engines=False)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        portfolio.solve(MODELS_DIR / "sudoku.mzn", {}, timeout_seconds=1.5)
+    assert time.monotonic() - start < 2.5
+
+
+class SlowEngine:
+    def solve(self, model_file, instance_params):
+        """Take longer to solve an instance than any test runs."""
+        time.sleep(60)
+
+
+def test_portfolio_reuses_workers_between_races(sudoku):
+    sudoku_engine, slow = SudokuEngine(), SlowEngine()
+    race = PortfolioSolver([sudoku_engine, slow], include_engines=False)
+    try:
+        pids = []
+        for _ in range(2):
+            race.solve(MODELS_DIR / "sudoku.mzn", sudoku)
+            pids.append({b: race._worker(b).process.pid for b in (sudoku_engine, slow)})
+        # The winner is kept, and the loser, stopped mid-solve, is restarted
+        assert pids[0][sudoku_engine] == pids[1][sudoku_engine]
+        assert pids[0][slow] != pids[1][slow]
+    finally:
+        race.close()
+
+
+def test_fallback_falls_through_failing_backends(sudoku):
+    fallback = FallbackSolver([FailingEngine(), SudokuEngine()])
+    fallback.solve(MODELS_DIR / "sudoku.mzn", sudoku)
+    assert fallback.last_statistics["backend"] == "SudokuEngine"
+    assert fallback.last_statistics["attempts"] == 2
+
+
+class MissingSolver:
+    def __init__(self):
+        """Create a backend that records what it is asked to solve."""
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def solve(self, model_file, instance_params):
+        """Fail like MiniZinc does when a solver tag is not installed."""
+        self.calls.append((Path(model_file).name, instance_params))
+        raise LookupError("no solver with tag: missing")
+
+
+def test_fallback_converts_parameters_for_other_models():
+    with open(DEFAULT_CORPUS / "campsites.jsonl") as f:
+        params = json.loads(f.readline())["instance_params"]
+    missing = MissingSolver()
+    pairs = campsites.MODEL_FILES[campsites.Model.PAIRS]
+    fallback = FallbackSolver(
+        [missing, CampsitesEngine()],
+        models={
+            "MissingSolver": (
+                pairs,
+                partial(campsites.from_grid_params, campsites.Model.PAIRS),
+            )
+        },
+    )
+    solution = fallback.solve(MODELS_DIR / "campsites.mzn", params)
+    assert solution == CampsitesEngine().solve(MODELS_DIR / "campsites.mzn", params)
+    assert fallback.last_statistics["attempts"] == 2
+    [(model_name, pairs_params)] = missing.calls
+    assert model_name == "campsites_pairs.mzn"
+    assert pairs_params["num_trees"] == params["num_trees"]
+    assert "tree_candidates" in pairs_params
+
+
+class StandInConstraintSolver:
+    def __init__(self, solver_tag):
+        """Stand in for a MiniZinc solver, which returns a result object."""
+
+    def solve(self, model_file, instance_params, timeout_seconds=None):
+        """Return the native solution wrapped like a MiniZinc result."""
+        solution = SudokuEngine().solve(model_file, instance_params)
+        return SimpleNamespace(solution=SimpleNamespace(**solution))
+
+
+def test_fallback_returns_dictionaries_for_every_backend(sudoku, monkeypatch):
+    monkeypatch.setattr(portfolio, "ConstraintSolver", StandInConstraintSolver)
+    fallback = FallbackSolver(["gecode"])
+    solution = fallback.solve(MODELS_DIR / "sudoku.mzn", sudoku)
+    assert solution == SudokuEngine().solve(MODELS_DIR / "sudoku.mzn", sudoku)
@@ -0,0 +1,125 @@
+from itertools import product
+
+import pytest
+
+from robber_baron import campsites, numbergrids
+from robber_baron.engines import CampsitesEngine, NonogramEngine
+from robber_baron.generators import line_clues
+from robber_baron.presolve import (
+    _line_overlaps,
+    EMPTY,
+    FILLED,
+    fix,
+    PRESOLVERS,
+    UNKNOWN,
+)
+from robber_baron.solve import MODELS_DIR
+from run import DEFAULT_CORPUS, load_corpus
+
+
+def placements(clues, size):
+    """Return every line of a size that matches clues, by brute force."""
+    blocks = [c for c in clues if c] or [0]
+    return [
+        line
+        for line in product((False, True), repeat=size)
+        if line_clues(line) == blocks
+    ]
+
+
+@pytest.mark.parametrize("size", range(1, 8))
+def test_line_overlaps_agree_with_every_placement(size):
+    for clues in {tuple(line_clues(line)) for line in product((0, 1), repeat=size)}:
+        lines = placements(clues, size)
+        for k, value in enumerate(_line_overlaps(list(clues), size)):
+            if value != UNKNOWN:
+                assert all(line[k] == (value == FILLED) for line in lines)
+
+
+def test_line_overlaps():
+    U, E, F = UNKNOWN, EMPTY, FILLED
+    assert _line_overlaps([3], 5) == [U, U, F, U, U]
+    assert _line_overlaps([2, 2], 5) == [F, F, E, F, F]
+    assert _line_overlaps([0, 0], 4) == [E, E, E, E]
+    assert _line_overlaps([1, 4], 8) == [U, U, U, U, F, F, U, U]
+    with pytest.raises(ValueError):
+        _line_overlaps([3, 2], 5)
+
+
+def test_fix_rejects_contradictions():
+    fixed = [[UNKNOWN]]
+    fix(fixed, 0, 0, EMPTY)
+    fix(fixed, 0, 0, EMPTY)
+    with pytest.raises(ValueError):
+        fix(fixed, 0, 0, FILLED)
+
+
+@pytest.mark.parametrize(
+    "game, model, engine_class, key",
+    [
+        ("campsites", "campsites.mzn", CampsitesEngine, "tents"),
+        ("numbergrids", "numbergrids.mzn", NonogramEngine, "grid"),
+    ],
+)
+def test_presolved_cells_agree_with_solutions(game, model, engine_class, key):
+    presolver = PRESOLVERS[model]
+    engine = engine_class()
+    for record in load_corpus(DEFAULT_CORPUS, [game]):
+        params = record["instance_params"]
+        presolved = presolver.presolve(params)
+        assert presolved.model_file.exists()
+        fixed = presolved.instance_params[presolver.param]
+        trivial = [[UNKNOWN] * len(fixed[0]) for _ in fixed]
+        for deduce in presolver.trivial:
+            deduce(params, trivial)
+        assert presolved.fixed == pytest.approx(
+            sum(
+                v != t for row, t_row in zip(fixed, trivial) for v, t in zip(row, t_row)
+            )
+            / (len(fixed) * len(fixed[0]))
+        )
+        solution = engine.solve(MODELS_DIR / model, params)[key]
+        for fixed_row, row in zip(fixed, solution):
+            for value, cell in zip(fixed_row, row):
+                assert value == UNKNOWN or (value == FILLED) == cell
+
+
+def played_bot(monkeypatch, module, bot_class, argv):
+    """Run a bot's main without playing, returning the bot it created."""
+    bots = []
+    monkeypatch.setattr(bot_class, "play", lambda self, *args: bots.append(self))
+    module.main([*argv, "--no-prompt"], browser="browser")
+    return bots[0]
+
+
+@pytest.mark.parametrize(
+    "module, bot_class, model, argv",
+    [
+        (campsites, campsites.CampsitesBot, "campsites.mzn", ["--native"]),
+        (
+            campsites,
+            campsites.CampsitesBot,
+            "campsites.mzn",
+            ["--fallback", "gecode", "native"],
+        ),
+        (numbergrids, numbergrids.NumbergridsBot, "numbergrids.mzn", ["--portfolio"]),
+        (
+            numbergrids,
+            numbergrids.NumbergridsBot,
+            "numbergrids.mzn",
+            ["--fallback", "native", "chuffed"],
+        ),
+    ],
+)
+def test_bots_skip_presolve_with_native_backends(
+    monkeypatch, module, bot_class, model, argv
+):
+    bot = played_bot(monkeypatch, module, bot_class, argv)
+    assert bot._presolver(MODELS_DIR / model) is None
+
+
+def test_bots_presolve_with_minizinc_backends(monkeypatch):
+    bot = played_bot(
+        monkeypatch, campsites, campsites.CampsitesBot, ["--fallback", "gecode"]
+    )
+    assert bot._presolver(MODELS_DIR / "campsites.mzn") is not None
@@ -0,0 +1,157 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+import requests
+from selenium.webdriver.remote.webelement import WebElement
+
+from robber_baron import Browser, cli
+from robber_baron.engines.wordtwist import build_dawg
+from robber_baron.replay import Recorder, Replayer
+from robber_baron.transport import Page
+from robber_baron.wordtwist import BOARD_CELLS, Size, WordTwistBot
+
+RECORDING = Path(__file__).parent / "recordings" / "wordtwist.jsonl"
+ARGV = ["wordtwist", "--no-prompt"]
+WORDS = {"star": 1, "stone": 2, "tone": 1, "rats": 2, "slate": 3}
+
+
+class StandInElement(WebElement):
+    def __init__(self, driver: "StandInDriver", selector: str):
+        """Create an element of the driver's current page."""
+        super().__init__(driver, f"element-{selector}", w3c=True)
+
+    def get_attribute(self, name: str) -> str:
+        """Return the board link of the new game page."""
+        self._parent.execute("getElementAttribute")
+        return self._parent.page.links()[0]
+
+    def click(self):
+        """Start the game."""
+        self._parent.execute("clickElement")
+
+    def submit(self):
+        """Submit the game over form, with the words that were set on it."""
+        self._parent.execute("submitElement")
+        self._parent.submit()
+
+
+class StandInDriver:
+    def __init__(self, base_url: str):
+        """Create a WebDriver that serves the live site's URLs from a stand-in server."""
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.page: Optional[Page] = None
+        self.form_words = ""
+
+    def execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Answer a round trip to the driver, which every command makes."""
+        return {"value": None}
+
+    def get(self, url: str):
+        """Load a page."""
+        self.execute("get")
+        response = self.session.get(url.replace(WordTwistBot.base_url, self.base_url))
+        response.raise_for_status()
+        # Resolve links against the live site's URL, as the browser would
+        self.page = Page(url, response.text)
+
+    def set_script_timeout(self, time_to_wait: float):
+        """Set how long asynchronous scripts may run."""
+        self.execute("setTimeouts")
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        """Resolve an in-page wait for the board cells or an element."""
+        self.execute("executeAsyncScript")
+        assert self.page is not None
+        if args[0] == BOARD_CELLS:
+            return self.page.table_cells("board")
+        return StandInElement(self, args[0])
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Set the words on the game over form."""
+        self.execute("executeScript")
+        self.form_words = args[0]
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        """Return the cookies of the session."""
+        self.execute("getCookies")
+        return [{"name": c.name, "value": c.value} for c in self.session.cookies]
+
+    def submit(self):
+        """Submit the game over form."""
+        assert self.page is not None
+        action, fields = self.page.form("gameover")
+        fields["form_words"] = self.form_words
+        response = self.session.post(
+            action.replace(WordTwistBot.base_url, self.base_url), data=fields
+        )
+        response.raise_for_status()
+        self.page = Page(action, response.text)
+
+    def quit(self):
+        """Quit the browser."""
+        self.execute("quit")
+
+
+def record(path: Path, base_url: str, dictionary: Path):
+    """Record a WordTwist game in the browser against the stand-in server.
+
+    This wrote the committed recording, with the stand-in's words as the dictionary.
+    """
+    recorder = Recorder(path, ARGV)
+    browser = Browser(StandInDriver(base_url))
+    browser.record(recorder)
+    bot = WordTwistBot(browser=browser)
+    bot.play(Size.FOUR_BY_FOUR, dictionary=dictionary)
+    browser.quit()
+    recorder.close()
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    """Build a dictionary file of the stand-in board's words."""
+    path = tmp_path / "words.dawg"
+    build_dawg(WORDS, path)
+    return path
+
+
+def interactions(path: Path) -> List[Any]:
+    """Return the targets and names of the interactions in a recording."""
+    with open(path) as f:
+        return [(e["target"], e["name"]) for e in map(json.loads, list(f)[1:])]
+
+
+def test_recording_matches_the_bot(stand_in, tmp_path, dictionary):
+    path = tmp_path / "wordtwist.jsonl"
+    record(path, stand_in, dictionary)
+    assert interactions(path) == interactions(RECORDING)
+
+
+def test_replay_plays_a_recorded_game(monkeypatch, tmp_path, caplog, dictionary):
+    timing_file = tmp_path / "timing.jsonl"
+    monkeypatch.setenv("PB_REPLAY_FILE", str(RECORDING))
+    monkeypatch.setenv("PB_TIMING_FILE", str(timing_file))
+    caplog.set_level(logging.WARNING)
+    cli.main(Replayer.load(RECORDING).argv + ["--dictionary", str(dictionary)])
+
+    assert "not replayed" not in caplog.text
+    events = [json.loads(line) for line in timing_file.read_text().splitlines()]
+    assert [e["phase"] for e in events] == [
+        "load",
+        "extract",
+        "solve",
+        "submit",
+        "verify",
+    ]
+    assert all(e["round_trips"] > 0 for e in events if e["phase"] != "solve")
+
+
+def test_replay_rejects_a_different_game(monkeypatch, dictionary):
+    monkeypatch.setenv("PB_REPLAY_FILE", str(RECORDING))
+    with pytest.raises(ValueError, match="expected driver.get"):
+        cli.main(
+            ["wordtwist", "--no-prompt", "-s", "5", "--dictionary", str(dictionary)]
+        )
@@ -0,0 +1,57 @@
+import json
+import threading
+
+from robber_baron import sudoku
+from robber_baron.engines import SudokuEngine
+from robber_baron.solve import MODELS_DIR, read_instances, solve_stream
+from run import DEFAULT_CORPUS
+
+
+def corpus_lines(game: str, count: int):
+    """Return the first lines of a game's corpus file."""
+    with open(DEFAULT_CORPUS / f"{game}.jsonl") as f:
+        return [next(f) for _ in range(count)]
+
+
+def test_read_instances_reports_bad_lines():
+    lines = [*corpus_lines("sudoku", 1), "not json\n", "\n", '{"model": "x.mzn"}\n']
+    instances = list(read_instances(lines))
+    assert instances[0]["model"] == "sudoku.mzn"
+    assert [i["line"] for i in instances] == [1, 2, 4]
+    assert "error" in instances[1] and "error" in instances[2]
+
+
+def test_solve_stream_encodes_solutions():
+    lines = corpus_lines("sudoku", 3)
+    results = []
+    summary = solve_stream(
+        read_instances(lines), results.append, backend="native", workers=2
+    )
+    assert summary["solved"] == 3 and summary["failed"] == 0
+    for result in sorted(results, key=lambda r: r["line"]):
+        params = json.loads(lines[result["line"] - 1])["instance_params"]
+        solution = SudokuEngine().solve(MODELS_DIR / "sudoku.mzn", params)
+        assert result["solution"] == sudoku.encode_solution(params, solution)
+
+
+def test_solve_stream_emits_results_while_input_is_stalled():
+    lines = corpus_lines("sudoku", 9)
+    results = []
+    first_emitted = threading.Event()
+    emitted_while_stalled = []
+
+    def emit(result):
+        results.append(result)
+        first_emitted.set()
+
+    def stalled_input():
+        instances = list(read_instances(lines))
+        # Send a full batch, then hold back the next line until a result is emitted
+        yield from instances[:8]
+        emitted_while_stalled.append(first_emitted.wait(timeout=30))
+        yield from instances[8:]
+
+    summary = solve_stream(stalled_input(), emit, backend="native", workers=1)
+    assert emitted_while_stalled == [True]
+    assert summary["solved"] == 9
+    assert sorted(r["line"] for r in results) == list(range(1, 10))
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from robber_baron.timing import histograms, PhaseTimer
+
+
+def test_span_records_phase_and_round_trips(monkeypatch, tmp_path):
+    timing_file = tmp_path / "timing.jsonl"
+    monkeypatch.setenv("PB_TIMING_FILE", str(timing_file))
+    round_trips = iter([0, 3])
+    timer = PhaseTimer("game", lambda: next(round_trips))
+    with timer.span("load", transport="http") as event:
+        event["page"] = "init"
+        timer.annotate(statistics={"nodes": 1})
+    [event] = timer.events
+    assert event["phase"] == "load"
+    assert event["transport"] == "http"
+    assert event["page"] == "init"
+    assert event["statistics"] == {"nodes": 1}
+    assert event["round_trips"] == 3
+    assert json.loads(timing_file.read_text()) == event
+
+
+def test_timed_decorator_times_every_call():
+    timer = PhaseTimer("game")
+
+    @timer.timed("solve", model="grid")
+    def solve(x: int) -> int:
+        """Return twice a number."""
+        return 2 * x
+
+    assert solve(2) == 4
+    assert solve.__doc__ == "Return twice a number."
+    with pytest.raises(TypeError):
+        solve(None)
+    assert [(e["phase"], e["model"]) for e in timer.events] == [("solve", "grid")] * 2
+
+
+def test_histograms_bucket_durations():
+    events = [
+        {"game": "g", "phase": "p", "seconds": seconds}
+        for seconds in (0.005, 0.01, 0.5, 100)
+    ]
+    assert histograms(events, [0.01, 1.0]) == {"g.p": [2, 1, 1]}
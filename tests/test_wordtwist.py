@@ -0,0 +1,151 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import pytest
+import requests
+
+from robber_baron.engines.wordtwist import build_dawg
+from robber_baron.transport import Page, Transport
+from robber_baron.wordtwist import (
+    BOARD_TABLE,
+    check_board,
+    parse_args,
+    Size,
+    WordTwistBot,
+)
+from conftest import BENCHMARKS_DIR
+
+BOARD = list("STAREONELATSDIRE")
+WORDS = json.loads(
+    (BENCHMARKS_DIR / "pages" / "wordtwist" / "boarddata.json").read_text()
+)["wordList"]
+
+
+class StandInElement:
+    def __init__(self, browser: "StandInBrowser", selector: str):
+        """Create an element of the browser's current page."""
+        self._browser = browser
+        self._selector = selector
+
+    def get_attribute(self, name: str) -> str:
+        """Return the board link of the new game page."""
+        assert (self._selector, name) == ("div#newgameboard a", "href")
+        return self._browser.page.links()[0]
+
+    def click(self):
+        """Start the game."""
+
+    def submit(self):
+        """Submit the game over form, with the words that were set on it."""
+        action, fields = self._browser.page.form("gameover")
+        fields["form_words"] = self._browser.form_words
+        response = self._browser.session.post(action, data=fields)
+        self._browser.page = Page(response.url, response.text)
+
+
+class StandInBrowser:
+    def __init__(self):
+        """Create a browser that fetches pages without rendering them."""
+        self.session = requests.Session()
+        self.page: Optional[Page] = None
+        self.form_words = ""
+        self.round_trips = 0
+
+    def get(self, url: str):
+        """Load a page."""
+        response = self.session.get(url)
+        response.raise_for_status()
+        self.page = Page(response.url, response.text)
+
+    def find_element(self, selector: str, condition: Any = None) -> StandInElement:
+        """Find an element of the current page."""
+        return StandInElement(self, selector)
+
+    def wait_until(self, script: str, *args: Any, label: str = "") -> List[str]:
+        """Return the board cells of the current page."""
+        assert self.page is not None
+        return self.page.table_cells(BOARD_TABLE)
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Return the user agent, or set the words on the game over form."""
+        if "userAgent" in script:
+            return "stand-in"
+        self.form_words = args[0]
+
+    def cookies(self) -> List[Dict[str, Any]]:
+        """Return the cookies of the session."""
+        return [
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+            for c in self.session.cookies
+        ]
+
+
+class SubmittingTransport(Transport):
+    def submit(self, url: str, fields: Dict[str, str]) -> Page:
+        """Submit form fields, keeping the submitted words."""
+        self.form_words = fields["form_words"]
+        return super().submit(url, fields)
+
+
+def play(base_url: str, http: bool, dictionary: Optional[Path] = None) -> Set[str]:
+    """Play a game against the stand-in server, returning the submitted words."""
+    browser = None if http else StandInBrowser()
+    transport = SubmittingTransport()
+    bot = WordTwistBot(browser=browser, transport=transport)
+    bot.base_url = base_url
+    try:
+        bot.play(Size.FOUR_BY_FOUR, http=http, dictionary=dictionary)
+    finally:
+        bot.quit()
+    assert [e["phase"] for e in bot.timer.events] == [
+        "load",
+        "extract",
+        "solve",
+        "submit",
+        "verify",
+    ]
+    form_words = transport.form_words if browser is None else browser.form_words
+    return {word.split("|")[0] for word in form_words.split("||")[1:]}
+
+
+def test_page_parses_board_and_form(stand_in):
+    transport = Transport()
+    new_game = transport.get(f"{stand_in}/init4.php")
+    board_page = transport.get(new_game.links()[0])
+    assert board_page.table_cells(BOARD_TABLE) == BOARD
+    action, fields = board_page.form("gameover")
+    assert action == f"{stand_in}/results.php"
+    assert "form_words" in fields
+    assert transport.get_json(f"{stand_in}/boarddata.php")["wordList"] == WORDS
+    transport.close()
+
+
+def test_board_data_requires_session(stand_in):
+    with pytest.raises(requests.HTTPError):
+        Transport().get_json(f"{stand_in}/boarddata.php")
+
+
+@pytest.mark.parametrize("http", [True, False])
+def test_play_submits_board_data(stand_in, http):
+    assert play(stand_in, http) == set(WORDS)
+
+
+def test_http_mode_is_off_by_default_and_warns(stand_in, caplog):
+    assert not parse_args([]).http
+    play(stand_in, http=True)
+    assert "HTTP mode is experimental" in caplog.text
+
+
+@pytest.mark.parametrize("http", [True, False])
+def test_play_finds_words_with_dictionary(stand_in, tmp_path, http):
+    dictionary = tmp_path / "words.dawg"
+    build_dawg({"star": 1, "stone": 2, "tone": 1, "rats": 2, "slate": 3}, dictionary)
+    # "slate" is not on the board
+    assert play(stand_in, http, dictionary) == {"star", "stone", "tone", "rats"}
+
+
+@pytest.mark.parametrize("cells", [[], list("STAREONELATSDIR")])
+def test_check_board_rejects_missing_or_ragged_cells(cells):
+    with pytest.raises(ValueError, match="failed to parse board"):
+        check_board(cells)